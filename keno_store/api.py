@@ -3,29 +3,45 @@ import hashlib
 from http import HTTPStatus
 import json
 import uuid
-from bs4 import BeautifulSoup
 import frappe
 from frappe import _
 from frappe.auth import CookieManager, validate_auth_via_api_keys
 from frappe.contacts.doctype.contact.contact import get_contact_name
 from frappe.email.doctype.email_template.email_template import get_email_template
 from frappe.utils import cint, get_datetime, getdate, nowdate
-from frappe.utils import flt
 import frappe.utils
 from webshop.webshop.doctype.item_review.item_review import add_item_review
-from webshop.webshop.product_data_engine.filters import ProductFiltersBuilder
-from webshop.webshop.product_data_engine.query import ProductQuery
-from webshop.webshop.doctype.override_doctype.item_group import (
-    get_child_groups_for_website,
-)
 from webshop.webshop.utils.product import get_non_stock_item_status
-from webshop.webshop.shopping_cart.product_info import get_product_info_for_website
 from frappe.email.doctype.newsletter.newsletter import subscribe
 from babel.dates import format_date
+from keno_store.utils import encode_cursor, is_not_modified
+from keno_store.keno_store.catalog import enrich_items, get_price_map
+from keno_store.keno_store.doctype.delivery_zone.delivery_zone import get_zone_for_zip
+from keno_store.keno_store.doctype.delivery_zone_schedule.delivery_zone_schedule import (
+    get_weekly_schedules,
+)
+from keno_store.keno_store.item_detail import (
+    clear_item_details,
+    get_item_details,
+    get_items_details,
+)
+from keno_store.keno_store.item_group_tree import (
+    get_dashboard_category_sections,
+    get_website_item_groups,
+)
+from keno_store.keno_store.neighborhoods import get_neighborhood_dataset, get_zip_areas
+from keno_store.keno_store.pricing_rule_index import get_offer_website_items
+from keno_store.keno_store.product_filters import get_product_listing
+from keno_store.keno_store.product_search import search_items
+from keno_store.keno_store.response_cache import cached_response
+from keno_store.keno_store.sales_rollup import get_top_selling_items
 
 frappe.utils.logger.set_log_level("DEBUG")
 logger = frappe.logger("api", allow_site=True, file_count=50)
 
+# Largest number of items get_website_items_details returns in one call
+MAX_DETAIL_BATCH_SIZE = 50
+
 
 @frappe.whitelist(allow_guest=True)
 def get_zone_by_zip(zip_code):
@@ -33,19 +49,8 @@ def get_zone_by_zip(zip_code):
         if not zip_code:
             frappe.throw(_("Zip code is required"), frappe.exceptions.ValidationError)
 
-        # Fetch the Zone Name where the zip code is found in the comma-separated list
-        zone = frappe.db.sql(
-            """
-            SELECT 
-                `zone_name` 
-            FROM 
-                `tabDelivery Zone` 
-            WHERE 
-                FIND_IN_SET(%s, `zip_codes`) > 0
-            """,
-            (zip_code),
-            as_dict=True,
-        )
+        # Resolve the zone from the zip -> zone index
+        zone = get_zone_for_zip(zip_code)
 
         if not zone:
             frappe.throw(
@@ -55,7 +60,7 @@ def get_zone_by_zip(zip_code):
                 frappe.exceptions.DoesNotExistError,
             )
 
-        return {"zone": zone[0].zone_name}
+        return {"zone": zone}
 
     except frappe.exceptions.ValidationError as e:
         frappe.log_error(message=str(e), title="Validation Error in get_zone_by_zip")
@@ -261,12 +266,8 @@ def get_weekly_schedule(zip_code=None):
 
         # If a zip code is provided, find the specific zone
         if zip_code:
-            zones = frappe.get_all(
-                "Delivery Zone",
-                filters={"zip_codes": ["like", f"%{zip_code}%"]},
-                fields=["zone_name"],
-                limit_page_length=1,  # Ensure only one zone is fetched
-            )
+            zone = get_zone_for_zip(zip_code)
+            zones = [frappe._dict(zone_name=zone)] if zone else []
 
             if not zones:
                 frappe.throw(
@@ -275,7 +276,7 @@ def get_weekly_schedule(zip_code=None):
                 )
         else:
             # If no zip code is provided, get all zones
-            zones = frappe.get_all("Delivery Zone", fields=["zone_name"])
+            zones = frappe.get_all("Delivery Zone", fields=["name as zone_name"])
 
             if not zones:
                 frappe.throw(
@@ -283,54 +284,15 @@ def get_weekly_schedule(zip_code=None):
                     frappe.exceptions.DoesNotExistError,
                 )
 
-        # Weekdays and corresponding field names for child tables
-        weekdays = {
-            "Monday": "monday_slots",
-            "Tuesday": "tuesday_slots",
-            "Wednesday": "wednesday_slots",
-            "Thursday": "thursday_slots",
-            "Friday": "friday_slots",
-            "Saturday": "saturday_slots",
-            "Sunday": "sunday_slots",
-        }
+        # Compiled schedules of all zones, served from cache
+        weekly_schedules = get_weekly_schedules()
 
-        # Iterate over each zone and fetch the weekly schedule
+        # Pick the schedules of the requested zones
         for zone in zones:
-            zone_name = zone.zone_name
-
-            # Fetch the Delivery Zone Schedule for the current zone
-            try:
-                schedule_doc = frappe.get_doc(
-                    "Delivery Zone Schedule", {"delivery_zone": zone_name}
-                )
-
-                # Initialize a dictionary to hold the weekly schedule for the current zone
-                weekly_schedule = {}
-
-                # Iterate through each weekday and fetch the delivery slots
-                for day, field_name in weekdays.items():
-                    delivery_slots = [
-                        {
-                            "start_time": str(slot.start_time),
-                            "end_time": str(slot.end_time),
-                        }
-                        for slot in getattr(schedule_doc, field_name, [])
-                    ]
-
-                    # Only add the day to the schedule if there are slots available
-                    if delivery_slots:
-                        weekly_schedule[day] = delivery_slots
-
-                # Add the zone's weekly schedule to the overall schedules dictionary
-                if weekly_schedule:
-                    all_zone_schedules[zone_name] = {"weekly_schedule": weekly_schedule}
-
-            except frappe.DoesNotExistError:
-                frappe.log_error(
-                    message=f"Schedule not found for zone: {zone_name}",
-                    title="Schedule Not Found",
-                )
-                continue
+            if weekly_schedules.get(zone.zone_name):
+                all_zone_schedules[zone.zone_name] = weekly_schedules[zone.zone_name]
+            else:
+                logger.debug(f"No delivery schedule for zone: {zone.zone_name}")
 
         # Return the appropriate result
         if zip_code:
@@ -396,198 +358,25 @@ def get_product_filter_data(query_args=None):
     if from_filters:
         start = 0
 
-    sub_categories = []
-    if item_group:
-        sub_categories = get_child_groups_for_website(item_group, immediate=True)
-
-    engine = ProductQuery()
-
     try:
-        result = engine.query(
-            attribute_filters,
-            field_filters,
-            search_term=search,
-            start=start,
+        # Cached per canonical query, facets are counted over every matching item
+        return get_product_listing(
+            search=search,
+            field_filters=field_filters,
+            attribute_filters=attribute_filters,
             item_group=item_group,
+            start=start,
         )
     except Exception:
         frappe.log_error("Product query with filter failed")
         return {"exc": "Something went wrong!"}
 
-    # discount filter data
-    filters = {}
-    discounts = result["discounts"]
-
-    if discounts:
-        filter_engine = ProductFiltersBuilder()
-        filters["discount_filters"] = filter_engine.get_discount_filters(discounts)
-        logger.debug(filters["discount_filters"])
-
-    # Adding ratings to each product
-    for item in result["items"]:
-        item_code = item.get("item_code")
-        if item_code:
-            qty_limits = get_cart_qty_limits(item_code)
-            item["minimum_qty"] = qty_limits["minimum_qty"]
-            item["maximum_qty"] = qty_limits["maximum_qty"]
-            ratings = frappe.db.get_all(
-                "Item Review", filters={"item": item_code}, fields=["rating"]
-            )
-            if ratings:
-                total_rating = sum([r["rating"] for r in ratings])
-                average_rating = total_rating / len(ratings)
-                item["rating"] = round(average_rating, 1)  # Round to 2 decimal places
-            else:
-                item["rating"] = 0  # Default if no ratings available
-
-    return {
-        "items": result["items"] or [],
-        "filters": filters,
-        "settings": engine.settings,
-        "sub_categories": sub_categories,
-        "items_count": result["items_count"],
-    }
-
-
-def get_cart_qty_limits(item_code):
-    # Fetch both custom_minimum_cart_qty and custom_maximum_cart_qty
-    min_qty, max_qty = frappe.db.get_value(
-        "Item", item_code, ["custom_minimum_cart_qty", "custom_maximum_cart_qty"]
-    ) or (
-        None,
-        None,
-    )  # Default to None if no record found
-
-    # Return 0 if values are None
-    return {"minimum_qty": min_qty or 0, "maximum_qty": max_qty or 0}
-
 
 @frappe.whitelist(allow_guest=True)
 def get_website_item_details(item_code):
     try:
-        # Fetch the website item document
-        website_item = frappe.get_doc("Website Item", {"item_code": item_code})
-        logger.debug(website_item)
-
-        if not website_item:
-            frappe.throw(_("Website Item not found"))
-
-        # Basic website item details
-        item_details = {
-            "item_code": website_item.item_code,
-            "item_name": website_item.item_name,
-            "description": website_item.short_description,
-            # "image": website_item.website_image,
-            "item_group": website_item.item_group,
-            "web_long_description": website_item.web_long_description,
-            "is_in_stock": (
-                frappe.db.get_value("Bin", {"item_code": item_code}, "actual_qty") or 0
-            )
-            > 0,
-            "uom": website_item.stock_uom,
-            "brand": website_item.brand,
-        }
-        # get_stock_availability(item_details, website_item.get("website_warehouse"));
-
-        # Get stock quantity
-        stock_qty = frappe.db.get_value(
-            "Bin", {"item_code": item_code}, "projected_qty "
-        )
-        item_details["stock_qty"] = stock_qty if stock_qty else 0
-        qty_limits = get_cart_qty_limits(item_code)
-        item_details["minimum_qty"] = qty_limits["minimum_qty"]
-        item_details["maximum_qty"] = qty_limits["maximum_qty"]
-
-        try:
-            # Fetch product information including pricing details
-            product_info = get_product_info_for_website(
-                item_code, skip_quotation_creation=True
-            ).get("product_info")
-            if product_info and product_info["price"]:
-                item_details.update(
-                    {
-                        "currency": product_info["price"].get("currency"),
-                        "formatted_mrp": product_info["price"].get("formatted_mrp"),
-                        "formatted_price": product_info["price"].get("formatted_price"),
-                        "price_list_rate": product_info["price"].get("price_list_rate"),
-                    }
-                )
-            if product_info["price"].get("discount_percent"):
-                item_details.update(
-                    {"discount_percent": flt(product_info["price"].discount_percent)}
-                )
-            if product_info["price"].get("formatted_mrp"):
-                item_details.update(
-                    {
-                        "discount": product_info["price"].get(
-                            "formatted_discount_percent"
-                        )
-                        or product_info["price"].get("formatted_discount_rate")
-                    }
-                )
-        except Exception as e:
-            frappe.log_error(
-                message=f"Error fetching product info for item {item_code}: {str(e)}",
-                title="Get New Website Items Error",
-            )
-            # You may also choose to skip this item or return a default value instead
-
-        # Get item price from Item Price doctype
-        # item_price = frappe.db.get_value("Item Price", {"item_code": item_code, "selling": 1}, ["price_list_rate", "currency"], as_dict=True)
-        # if item_price:
-        #     item_details.update({
-        #         "price": item_price.price_list_rate,
-        #         "currency": item_price.currency
-        #     })
-
-        # Get item reviews from the custom Website Item Review doctype
-        reviews = frappe.get_all(
-            "Item Review",
-            filters={"item": item_code},
-            fields=["customer", "rating", "review_title", "comment", "published_on"],
-            order_by="published_on desc",
-        )
-
-        item_details.update(
-            {
-                "reviews": reviews,
-                "average_rating": (
-                    round(sum([r["rating"] for r in reviews]) / len(reviews), 1)
-                    if reviews
-                    else 0
-                ),
-            }
-        )
-
-        # Get multiple images from Website Slideshow Item
-        logger.debug(website_item.slideshow)
-        image_list = []
-        slideshow_name = website_item.slideshow
-
-        if slideshow_name:
-            images = frappe.get_all(
-                "Website Slideshow Item",
-                filters={"parent": slideshow_name},
-                fields=["image"],
-                order_by="idx asc",
-            )
-            image_list = [{"image": img.image} for img in images]
-        else:
-            image_list = [{"image": website_item.website_image}]
-        item_details["image_list"] = image_list
-
-        # Fetch website specifications
-        specifications = frappe.get_all(
-            "Item Website Specification",
-            filters={"parent": website_item.name},
-            fields=["label", "description"],
-            order_by="idx asc",
-        )
-        item_details["specifications"] = [
-            {"label": spec.label, "value": extract_value(spec.description)}
-            for spec in specifications
-        ]
-
+        # Static details come from the item detail cache, stock and price are added live
+        item_details = get_item_details(item_code)
         logger.debug(item_details)
 
         return item_details
@@ -610,17 +399,54 @@ def get_website_item_details(item_code):
         return {"error": "An unexpected error occurred. Please try again later."}, 500
 
 
-def extract_value(content):
-    # Check if content contains HTML tags
-    if "<" in content and ">" in content:
-        # Parse as HTML
-        soup = BeautifulSoup(content, "html.parser")
-        # Get value from the <p> tag, or return None if no <p> tag is found
-        p_tag = soup.find("p")
-        return p_tag.text if p_tag else None
-    else:
-        # Return the content as is if it's not HTML
-        return content
+@frappe.whitelist(allow_guest=True)
+def get_website_items_details(item_codes, fields=None):
+    """
+    Product details of several items in one call, for carts, wishlists and
+    recently viewed items.
+
+    Args:
+        item_codes (list | str): Item codes, as a list or a JSON encoded list.
+        fields (list | str, optional): Detail fields to return, all of them by default.
+
+    Returns:
+        dict: The details of the found items, in the requested order, and the
+        item codes without a Website Item.
+    """
+    try:
+        item_codes = frappe.parse_json(item_codes) or []
+        fields = frappe.parse_json(fields) if fields else None
+
+        if not isinstance(item_codes, list) or not item_codes:
+            frappe.throw(_("item_codes must be a non-empty list"), frappe.ValidationError)
+
+        if len(item_codes) > MAX_DETAIL_BATCH_SIZE:
+            frappe.throw(
+                _("At most {0} items can be fetched at once").format(MAX_DETAIL_BATCH_SIZE),
+                frappe.ValidationError,
+            )
+
+        items_details = get_items_details(item_codes, fields=fields)
+
+        frappe.response["data"] = {
+            "items": list(items_details.values()),
+            "missing_item_codes": [
+                item_code for item_code in item_codes if item_code not in items_details
+            ],
+        }
+
+    except frappe.ValidationError as e:
+        frappe.local.response["http_status_code"] = HTTPStatus.BAD_REQUEST
+        frappe.response["data"] = {"message": str(e)}
+
+    except Exception:
+        frappe.log_error(
+            frappe.get_traceback(), "Unexpected Error in get_website_items_details API"
+        )
+        frappe.local.response["http_status_code"] = HTTPStatus.INTERNAL_SERVER_ERROR
+        frappe.response["data"] = {
+            "message": "An unexpected error occurred. Please try again later."
+        }
 
 
 def get_stock_availability(item):
@@ -670,7 +496,13 @@ def get_stock_availability(item):
 
 
 @frappe.whitelist(allow_guest=True, methods=["GET"])
-def search(query=None, page=1, page_size=10):
+def search(query=None, page=1, page_size=10, cursor=None):
+    """
+    Search published website items, ranked by relevance.
+
+    Pages are selected with `page`, or with `cursor` (the `next_cursor` of the
+    previous page) which skips counting the total for infinite scroll clients.
+    """
     try:
         # Validate Authorization header
         auth_header = frappe.get_request_header("Authorization", str)
@@ -702,24 +534,23 @@ def search(query=None, page=1, page_size=10):
         # Calculate offset and limit for pagination
         offset = (page - 1) * page_size
         limit = page_size
-        items = frappe.get_all(
-            "Item",
-            filters={
-                "item_name": ["like", f"%{query}%"],
-                "disabled": 0,  # Assuming this field indicates if the item is active
-                "published_in_website": 1,  # Assuming this field indicates if the item is published
-            },
-            fields=["item_code"],
-            limit_start=offset,
-            limit_page_length=limit,
+
+        # Look up the query in the product search index, ranked by relevance,
+        # with one extra match to know whether there is a next page
+        matches, total_items = search_items(
+            query, start=offset, page_length=limit + 1, cursor=cursor
         )
+        next_cursor = None
+        if len(matches) > limit:
+            matches = matches[:limit]
+            next_cursor = encode_cursor(matches[-1].score, matches[-1].item_code)
 
-        item_codes = [item["item_code"] for item in items]
+        website_item_names = [match.website_item for match in matches]
 
-        # Fetch website items corresponding to the top-selling item codes
+        # Fetch website items corresponding to the matched items
         searched_items = frappe.get_all(
             "Website Item",
-            filters={"item_code": ["in", item_codes], "published": 1},
+            filters={"name": ["in", website_item_names], "published": 1},
             fields=[
                 "web_item_name",
                 "name",
@@ -732,92 +563,26 @@ def search(query=None, page=1, page_size=10):
                 "ranking",
             ],
         )
+        # Keep the relevance order of the index
+        searched_items.sort(key=lambda item: website_item_names.index(item.name))
 
-        for item in searched_items:
-            try:
-                # Get stock quantity
-                stock_qty = frappe.db.get_value(
-                    "Bin", {"item_code": item.item_code}, "projected_qty"
-                )
-                item["stock_qty"] = stock_qty if stock_qty else 0
-
-                # Get product pricing information
-                product_info = get_product_info_for_website(
-                    item.item_code, skip_quotation_creation=True
-                ).get("product_info")
-                if product_info and product_info["price"]:
-                    item.update(
-                        {
-                            "currency": product_info["price"].get("currency"),
-                            "formatted_mrp": product_info["price"].get("formatted_mrp"),
-                            "formatted_price": product_info["price"].get(
-                                "formatted_price"
-                            ),
-                            "price_list_rate": product_info["price"].get(
-                                "price_list_rate"
-                            ),
-                        }
-                    )
-                    if product_info["price"].get("discount_percent"):
-                        item.update(
-                            {
-                                "discount_percent": flt(
-                                    product_info["price"].get("discount_percent")
-                                ),
-                                "discount": product_info["price"].get(
-                                    "formatted_discount_percent"
-                                )
-                                or product_info["price"].get("formatted_discount_rate"),
-                            }
-                        )
-            except Exception as e:
-                frappe.log_error(
-                    f"Error fetching product info for item {item.name}: {str(e)}",
-                    "Get Offer Items API",
-                )
-
-            try:
-                # Get item rating
-                ratings = frappe.get_all(
-                    "Item Review", filters={"item": item.item_code}, fields=["rating"]
-                )
-                if ratings:
-                    qty_limits = get_cart_qty_limits(item.item_code)
-                    item["minimum_qty"] = qty_limits["minimum_qty"]
-                    item["maximum_qty"] = qty_limits["maximum_qty"]
-                    total_rating = sum([r["rating"] for r in ratings])
-                    average_rating = total_rating / len(ratings)
-                    item["rating"] = round(average_rating, 1)
-                else:
-                    item["rating"] = 0  # No ratings, default to 0
-            except Exception as e:
-                frappe.log_error(
-                    f"Error fetching ratings for item {item.item_code}: {str(e)}",
-                    "Get Offer Items API",
-                )
-                item["rating"] = 0  # Default rating if fetching fails
+        # Add price, stock, rating and qty limits in bulk
+        enrich_items(searched_items)
 
-        # Determine total items and total pages for pagination
-        total_items = frappe.db.count(
-            "Item",
-            filters={
-                "item_name": ["like", f"%{query}%"],
-                "disabled": 0,
-                "published_in_website": 1,
-            },
-        )
-
-        total_pages = (total_items + page_size - 1) // page_size  # Ceiling division
+        total_pages = None
+        if total_items is not None:
+            total_pages = (total_items + page_size - 1) // page_size  # Ceiling division
 
         # Return the response with pagination details
         frappe.response["data"] = {
             "status": "success",
             "items": searched_items,
             "pagination": {
-                "current_page": page,
+                "current_page": None if cursor else page,
                 "page_size": page_size,
                 "total_items": total_items,
                 "total_pages": total_pages,
+                "next_cursor": next_cursor,
             },
         }
 
@@ -877,69 +642,8 @@ def get_new_website_items(limit=10, price_list="Standard Selling"):
             limit=limit,  # Limit the number of items returned
         )
 
-        for item in items:
-            try:
-                # Fetch product information including pricing details
-                product_info = get_product_info_for_website(
-                    item.item_code, skip_quotation_creation=True
-                ).get("product_info")
-                if product_info and product_info["price"]:
-                    item.update(
-                        {
-                            "formatted_mrp": product_info["price"].get("formatted_mrp"),
-                            "formatted_price": product_info["price"].get(
-                                "formatted_price"
-                            ),
-                            "price_list_rate": product_info["price"].get(
-                                "price_list_rate"
-                            ),
-                        }
-                    )
-                if product_info["price"].get("discount_percent"):
-                    item.update(
-                        {
-                            "discount_percent": flt(
-                                product_info["price"].discount_percent
-                            )
-                        }
-                    )
-                if item.formatted_mrp:
-                    item.update(
-                        {
-                            "discount": product_info["price"].get(
-                                "formatted_discount_percent"
-                            )
-                            or product_info["price"].get("formatted_discount_rate")
-                        }
-                    )
-            except Exception as e:
-                frappe.log_error(
-                    message=f"Error fetching product info for item {item.get('item_code')}: {str(e)}",
-                    title="Get New Website Items Error",
-                )
-                # You may also choose to skip this item or return a default value instead
-                continue
-
-            try:
-                # Fetch item rating
-                ratings = frappe.get_all(
-                    "Item Review", filters={"item": item.item_code}, fields=["rating"]
-                )
-                qty_limits = get_cart_qty_limits(item.item_code)
-                item["minimum_qty"] = qty_limits["minimum_qty"]
-                item["maximum_qty"] = qty_limits["maximum_qty"]
-                if ratings:
-                    total_rating = sum([r["rating"] for r in ratings])
-                    average_rating = total_rating / len(ratings)
-                    item["rating"] = round(average_rating, 1)
-                else:
-                    item["rating"] = 0
-            except Exception as e:
-                frappe.log_error(
-                    message=f"Error fetching ratings for item {item.get('item_code')}: {str(e)}",
-                    title="Get New Website Items Error",
-                )
-                item["rating"] = 0  # Default value if rating fetch fails
+        # Add pricing, stock, rating and qty limits in bulk
+        enrich_items(items)
 
     except Exception as e:
         frappe.log_error(
@@ -964,42 +668,9 @@ def get_hot_deals_website_items(limit=10, price_list="Standard Selling"):
         dict: A dictionary containing the list of hot deal website items or an error message.
     """
     try:
-        # Fetch active pricing rules
-        active_pricing_rules = frappe.get_all(
-            "Pricing Rule",
-            filters={
-                "disable": 0,
-                "apply_on": "Item Code",
-                "valid_from": ["<=", frappe.utils.nowdate()],
-                "valid_upto": ["in", ["", None, ["gt", frappe.utils.nowdate()]]],
-                "discount_percentage": [">", 0],
-            },
-            fields=["name"],
-        )
-
-        # If no active pricing rules are found, return an empty list
-        if not active_pricing_rules:
-            return {"items": []}
-
-        # Fetch items linked to these pricing rules
-        pricing_rule_names = [rule["name"] for rule in active_pricing_rules]
-        items = frappe.get_all(
-            "Pricing Rule Item Code",
-            filters={"parent": ["in", pricing_rule_names]},
-            fields=["item_code"],
-        )
-        logger.debug(items)
-
-        item_codes = [item["item_code"] for item in items]
-
-        # Step 2: Fetch Website Items linked to these item codes
-        items = frappe.get_all(
-            "Website Item",
-            filters={
-                "item_code": ["in", item_codes],
-                "published": 1,  # Ensure only published items are fetched
-            },
-            fields=[
+        # Fetch website items covered by active item code pricing rules
+        items, _total = get_offer_website_items(
+            [
                 "web_item_name",
                 "name",
                 "item_name",
@@ -1015,74 +686,13 @@ def get_hot_deals_website_items(limit=10, price_list="Standard Selling"):
                 "ranking",
                 "on_backorder",
             ],
-            order_by="creation desc",  # Order by creation date to get the newest items
-            limit=limit,
+            filters={"apply_on": "Item Code", "min_discount": 0},
+            order_by="wi.creation DESC",  # Order by creation date to get the newest items
+            page_length=limit,
         )
 
-        # Step 3: Enhance each item with pricing and rating details
-        for item in items:
-            try:
-                # Fetch product information including pricing details
-                product_info = get_product_info_for_website(
-                    item.item_code, skip_quotation_creation=True
-                ).get("product_info")
-                if product_info and product_info["price"]:
-                    item.update(
-                        {
-                            "formatted_mrp": product_info["price"].get("formatted_mrp"),
-                            "formatted_price": product_info["price"].get(
-                                "formatted_price"
-                            ),
-                            "price_list_rate": product_info["price"].get(
-                                "price_list_rate"
-                            ),
-                        }
-                    )
-                if product_info["price"].get("discount_percent"):
-                    item.update(
-                        {
-                            "discount_percent": flt(
-                                product_info["price"].discount_percent
-                            )
-                        }
-                    )
-                if item.formatted_mrp:
-                    item.update(
-                        {
-                            "discount": product_info["price"].get(
-                                "formatted_discount_percent"
-                            )
-                            or product_info["price"].get("formatted_discount_rate")
-                        }
-                    )
-            except Exception as e:
-                frappe.log_error(
-                    message=f"Error fetching product info for item {item.get('item_code')}: {str(e)}",
-                    title="Get New Website Items Error",
-                )
-                # You may also choose to skip this item or return a default value instead
-                continue
-
-            try:
-                # Fetch item rating
-                ratings = frappe.get_all(
-                    "Item Review", filters={"item": item.item_code}, fields=["rating"]
-                )
-                qty_limits = get_cart_qty_limits(item.item_code)
-                item["minimum_qty"] = qty_limits["minimum_qty"]
-                item["maximum_qty"] = qty_limits["maximum_qty"]
-                if ratings:
-                    total_rating = sum([r["rating"] for r in ratings])
-                    average_rating = total_rating / len(ratings)
-                    item["rating"] = round(average_rating, 1)
-                else:
-                    item["rating"] = 0
-            except Exception as e:
-                frappe.log_error(
-                    message=f"Error fetching ratings for item {item.get('item_code')}: {str(e)}",
-                    title="Get New Website Items Error",
-                )
-                item["rating"] = 0  # Default value if rating fetch fails
+        # Step 3: Enhance the items with pricing and rating details in bulk
+        enrich_items(items)
 
         return {"items": items}
 
@@ -1092,7 +702,7 @@ def get_hot_deals_website_items(limit=10, price_list="Standard Selling"):
 
 
 @frappe.whitelist(allow_guest=True, methods=["GET"])
-def get_top_selling_products(period=None, page=1, page_size=10):
+def get_top_selling_products(period=None, page=1, page_size=10, cursor=None):
     try:
         # Validate Authorization header
         auth_header = frappe.get_request_header("Authorization", str)
@@ -1124,28 +734,17 @@ def get_top_selling_products(period=None, page=1, page_size=10):
         # Calculate offset and limit for pagination
         offset = (page - 1) * page_size
         limit = page_size
-        # Define the period for fetching sales data
-        if period == "last_month":
-            start_date = frappe.utils.add_months(frappe.utils.nowdate(), -1)
-        elif period == "last_week":
-            start_date = frappe.utils.add_days(frappe.utils.nowdate(), -7)
-        else:
-            start_date = None  # Use all available data if no specific period is defined
-
-        filters = {}
-        if start_date:
-            filters["creation"] = [">=", start_date]
-
-        # Fetch top-selling items based on quantity sold
-        top_items = frappe.db.get_all(
-            "Sales Invoice Item",
-            filters=filters,
-            fields=["item_code", "sum(qty) as total_sold"],
-            group_by="item_code",
-            order_by="total_sold desc",
-            limit_start=offset,
-            limit_page_length=limit,
-        )
+        # Fetch top-selling items based on quantity sold, from the daily
+        # sales rollups for last_week / last_month and all-time otherwise
+        top_items, total_items = get_top_selling_items(
+            period, start=offset, page_length=limit + 1, cursor=cursor
+        )
+        next_cursor = None
+        if len(top_items) > limit:
+            top_items = top_items[:limit]
+            next_cursor = encode_cursor(
+                top_items[-1]["total_sold"], top_items[-1]["item_code"]
+            )
 
         item_codes = [item["item_code"] for item in top_items]
 
@@ -1166,91 +765,26 @@ def get_top_selling_products(period=None, page=1, page_size=10):
             ],
         )
 
-        for item in top_selling_items:
-            try:
-                # Get stock quantity
-                stock_qty = frappe.db.get_value(
-                    "Bin", {"item_code": item.item_code}, "projected_qty"
-                )
-                item["stock_qty"] = stock_qty if stock_qty else 0
-
-                # Get product pricing information
-                product_info = get_product_info_for_website(
-                    item.item_code, skip_quotation_creation=True
-                ).get("product_info")
-                if product_info and product_info["price"]:
-                    item.update(
-                        {
-                            "currency": product_info["price"].get("currency"),
-                            "formatted_mrp": product_info["price"].get("formatted_mrp"),
-                            "formatted_price": product_info["price"].get(
-                                "formatted_price"
-                            ),
-                            "price_list_rate": product_info["price"].get(
-                                "price_list_rate"
-                            ),
-                        }
-                    )
-                    if product_info["price"].get("discount_percent"):
-                        item.update(
-                            {
-                                "discount_percent": flt(
-                                    product_info["price"].get("discount_percent")
-                                ),
-                                "discount": product_info["price"].get(
-                                    "formatted_discount_percent"
-                                )
-                                or product_info["price"].get("formatted_discount_rate"),
-                            }
-                        )
-            except Exception as e:
-                frappe.log_error(
-                    f"Error fetching product info for item {item.name}: {str(e)}",
-                    "Get Offer Items API",
-                )
+        # Keep the sales ranking order
+        top_selling_items.sort(key=lambda item: item_codes.index(item.item_code))
 
-            try:
-                # Get item rating
-                ratings = frappe.get_all(
-                    "Item Review", filters={"item": item.item_code}, fields=["rating"]
-                )
-                if ratings:
-                    qty_limits = get_cart_qty_limits(item.item_code)
-                    item["minimum_qty"] = qty_limits["minimum_qty"]
-                    item["maximum_qty"] = qty_limits["maximum_qty"]
-                    total_rating = sum([r["rating"] for r in ratings])
-                    average_rating = total_rating / len(ratings)
-                    item["rating"] = round(average_rating, 1)
-                else:
-                    item["rating"] = 0  # No ratings, default to 0
-            except Exception as e:
-                frappe.log_error(
-                    f"Error fetching ratings for item {item.item_code}: {str(e)}",
-                    "Get Offer Items API",
-                )
-                item["rating"] = 0  # Default rating if fetching fails
+        # Add price, stock, rating and qty limits in bulk
+        enrich_items(top_selling_items)
 
-        # Determine total items and total pages for pagination
-        total_items = frappe.db.get_all(
-            "Sales Invoice Item",
-            filters=filters,
-            fields=["item_code", "sum(qty) as total_sold"],
-            group_by="item_code",
-            order_by="total_sold desc",
-        )
-        total_pages = (
-            len(total_items) + page_size - 1
-        ) // page_size  # Ceiling division
+        total_pages = None
+        if total_items is not None:
+            total_pages = (total_items + page_size - 1) // page_size  # Ceiling division
 
         # Return the response with pagination details
         frappe.response["data"] = {
             "status": "success",
             "items": top_selling_items,
             "pagination": {
-                "current_page": page,
+                "current_page": None if cursor else page,
                 "page_size": page_size,
-                "total_items": len(total_items),
+                "total_items": total_items,
                 "total_pages": total_pages,
+                "next_cursor": next_cursor,
             },
         }
 
@@ -1308,80 +842,13 @@ def get_limited_time_offers(page=1, page_size=10, price_list="Standard Selling")
         offset = (page - 1) * page_size
         limit = page_size
 
-        # Fetch active pricing rules
-        # active_pricing_rules = frappe.get_all(
-        #     "Pricing Rule",
-        #     filters={
-        #         "disable": 0,
-        #         "apply_on": "Item Code",
-        #         "valid_from": ["<=", today_date],
-        #         "valid_upto": ["between", [today_date, expiring_soon_date]],
-        #         "discount_percentage": [">", 0]
-        #     },
-        #     fields=["name", "valid_upto"]
-        # )
-        promotional_scheme_doc = frappe.get_doc(
+        promotional_scheme_doc = frappe.get_cached_doc(
             "Promotional Scheme", "Limited Time Offer"
         )
 
-        limited_time_offer_rules = frappe.get_all(
-            "Pricing Rule",
-            filters={
-                "disable": 0,
-                "promotional_scheme": "Limited Time Offer",
-                "valid_from": ["<=", frappe.utils.nowdate()],
-                "discount_percentage": [">", 0],
-            },
-            fields=["name", "valid_upto", "apply_on"],
-        )
-
-        # If no active pricing rules are found, return an empty list
-        if not limited_time_offer_rules:
-            return {"items": []}
-
-        # Map pricing rule valid_upto to item codes
-        pricing_rule_map = {
-            rule["name"]: rule["valid_upto"] for rule in limited_time_offer_rules
-        }
-        pricing_rule_names = list(pricing_rule_map.keys())
-
-        if limited_time_offer_rules[0].apply_on == "Item Code":
-            # Fetch items linked to these pricing rules
-            items = frappe.get_all(
-                "Pricing Rule Item Code",
-                filters={"parent": ["in", pricing_rule_names]},
-                fields=["item_code", "parent"],
-            )
-        elif limited_time_offer_rules[0].apply_on == "Item Group":
-            item_groups = frappe.get_all(
-                "Pricing Rule Item Group",
-                filters={"parent": limited_time_offer_rules[0].name},
-                fields=["item_group"],
-            )
-            item_group_names = [item_group["item_group"] for item_group in item_groups]
-            # Fetch items linked to these item_groups
-            items = frappe.get_all(
-                "Item",
-                filters={
-                    "item_group": ["in", item_group_names],
-                    "published_in_website": 1,
-                },
-                fields=["item_code"],
-            )
-
-        if not items:
-            return {"items": []}
-
-        item_codes = [item["item_code"] for item in items]
-
-        # Step 2: Fetch Website Items linked to these item codes
-        website_items = frappe.get_all(
-            "Website Item",
-            filters={
-                "item_code": ["in", item_codes],
-                "published": 1,  # Ensure only published items are fetched
-            },
-            fields=[
+        # Fetch the scheme's website items from the pricing rule index
+        website_items, total_items = get_offer_website_items(
+            [
                 "web_item_name",
                 "name",
                 "item_code",
@@ -1392,96 +859,21 @@ def get_limited_time_offers(page=1, page_size=10, price_list="Standard Selling")
                 "short_description",
                 "ranking",
             ],
-            order_by="ranking desc",
-            limit_start=offset,
-            limit_page_length=limit,
+            filters={"promotional_scheme": "Limited Time Offer", "min_discount": 0},
+            start=offset,
+            page_length=limit,
+            with_total=True,
         )
 
-        # Create a dictionary to map item codes to their associated pricing rule expiry dates
-        # expiry_dates = {item["item_code"]: pricing_rule_map.get(item.get("parent")) for item in items}
-        expiry_dates = limited_time_offer_rules[0].valid_upto
-
-        # Step 3: Enhance each item with pricing, rating, and valid_upto details
+        # Step 3: Enhance the items with pricing, rating, and valid_upto details
         for item in website_items:
-            try:
-                # Attach the expiry date from the pricing rule to the item if available
-                # item["offer_ends"] = "This offer ends on "+ date_to_words(expiry_dates.get(item["item_code"]))
-                item["offer_ends"] = "This offer ends on " + date_to_words(expiry_dates)
-                # Get stock quantity
-                stock_qty = frappe.db.get_value(
-                    "Bin", {"item_code": item.item_code}, "projected_qty"
-                )
-                item["stock_qty"] = stock_qty if stock_qty else 0
-
-                # Get product pricing information
-                product_info = get_product_info_for_website(
-                    item.item_code, skip_quotation_creation=True
-                ).get("product_info")
-                if product_info and product_info["price"]:
-                    item.update(
-                        {
-                            "currency": product_info["price"].get("currency"),
-                            "formatted_mrp": product_info["price"].get("formatted_mrp"),
-                            "formatted_price": product_info["price"].get(
-                                "formatted_price"
-                            ),
-                            "price_list_rate": product_info["price"].get(
-                                "price_list_rate"
-                            ),
-                        }
-                    )
-                    if product_info["price"].get("discount_percent"):
-                        item.update(
-                            {
-                                "discount_percent": flt(
-                                    product_info["price"].get("discount_percent")
-                                ),
-                                "discount": product_info["price"].get(
-                                    "formatted_discount_percent"
-                                )
-                                or product_info["price"].get("formatted_discount_rate"),
-                            }
-                        )
-
-                # Add pricing rule expiration date
-                # item["pricing_rule_expiration"] = pricing_rule_map.get(item.get("parent"))
-                # item["pricing_rule_expiration"] = pricing_rule_map.get('PRLE-0003')
-
-            except Exception as e:
-                frappe.log_error(
-                    f"Error fetching product info for item {item.name}: {str(e)}",
-                    "Get Offer Items API",
-                )
+            # Attach the expiry date of the item's pricing rule
+            offer_ends = date_to_words(item.valid_upto) if item.valid_upto else None
+            if offer_ends:
+                item["offer_ends"] = "This offer ends on " + offer_ends
 
-            try:
-                # Get item rating
-                ratings = frappe.get_all(
-                    "Item Review", filters={"item": item.item_code}, fields=["rating"]
-                )
-                qty_limits = get_cart_qty_limits(item.item_code)
-                item["minimum_qty"] = qty_limits["minimum_qty"]
-                item["maximum_qty"] = qty_limits["maximum_qty"]
-                if ratings:
-                    total_rating = sum([r["rating"] for r in ratings])
-                    average_rating = total_rating / len(ratings)
-                    item["rating"] = round(average_rating, 1)
-                else:
-                    item["rating"] = 0  # No ratings, default to 0
-            except Exception as e:
-                frappe.log_error(
-                    f"Error fetching ratings for item {item.item_code}: {str(e)}",
-                    "Get Offer Items API",
-                )
-                item["rating"] = 0  # Default rating if fetching fails
+        enrich_items(website_items)
 
-        # Determine total items and total pages for pagination
-        total_items = frappe.db.count(
-            "Website Item",
-            filters={
-                "item_code": ["in", item_codes],
-                "published": 1,  # Ensure only published items are fetched
-            },
-        )
         total_pages = (total_items + page_size - 1) // page_size  # Ceiling division
 
         # Return the response with pagination details
@@ -1606,70 +998,8 @@ def get_special_discount_items(limit=10):
         logger.debug("get_special_discount_items")
         logger.debug(items)
 
-        # Step 3: Enhance each item with pricing and rating details
-        for item in items:
-            try:
-                # Fetch product information including pricing details
-                product_info = get_product_info_for_website(
-                    item.item_code, skip_quotation_creation=True
-                ).get("product_info")
-                if product_info and product_info["price"]:
-                    item.update(
-                        {
-                            "formatted_mrp": product_info["price"].get("formatted_mrp"),
-                            "formatted_price": product_info["price"].get(
-                                "formatted_price"
-                            ),
-                            "price_list_rate": product_info["price"].get(
-                                "price_list_rate"
-                            ),
-                        }
-                    )
-                if product_info["price"].get("discount_percent"):
-                    item.update(
-                        {
-                            "discount_percent": flt(
-                                product_info["price"].discount_percent
-                            )
-                        }
-                    )
-                if item.formatted_mrp:
-                    item.update(
-                        {
-                            "discount": product_info["price"].get(
-                                "formatted_discount_percent"
-                            )
-                            or product_info["price"].get("formatted_discount_rate")
-                        }
-                    )
-            except Exception as e:
-                frappe.log_error(
-                    message=f"Error fetching product info for item {item.get('item_code')}: {str(e)}",
-                    title="Get New Website Items Error",
-                )
-                # You may also choose to skip this item or return a default value instead
-                continue
-
-            try:
-                # Fetch item rating
-                ratings = frappe.get_all(
-                    "Item Review", filters={"item": item.item_code}, fields=["rating"]
-                )
-                qty_limits = get_cart_qty_limits(item.item_code)
-                item["minimum_qty"] = qty_limits["minimum_qty"]
-                item["maximum_qty"] = qty_limits["maximum_qty"]
-                if ratings:
-                    total_rating = sum([r["rating"] for r in ratings])
-                    average_rating = total_rating / len(ratings)
-                    item["rating"] = round(average_rating, 1)
-                else:
-                    item["rating"] = 0
-            except Exception as e:
-                frappe.log_error(
-                    message=f"Error fetching ratings for item {item.get('item_code')}: {str(e)}",
-                    title="Get New Website Items Error",
-                )
-                item["rating"] = 0  # Default value if rating fetch fails
+        # Step 3: Enhance the items with pricing and rating details in bulk
+        enrich_items(items)
 
         return {"items": items}
 
@@ -1679,7 +1009,7 @@ def get_special_discount_items(limit=10):
 
 
 @frappe.whitelist(allow_guest=True)
-def get_offer_items(offer_title, page=1, page_size=10):
+def get_offer_items(offer_title, page=1, page_size=10, cursor=None):
     try:
         # Validate Authorization header
         auth_header = frappe.get_request_header("Authorization", str)
@@ -1712,7 +1042,7 @@ def get_offer_items(offer_title, page=1, page_size=10):
         offset = (page - 1) * page_size
         limit = page_size
 
-        promotional_scheme_doc = frappe.get_doc("Promotional Scheme", offer_title)
+        promotional_scheme_doc = frappe.get_cached_doc("Promotional Scheme", offer_title)
         # Validate the scheme's validity
         current_date = getdate(nowdate())
         valid_from = getdate(promotional_scheme_doc.valid_from)
@@ -1724,62 +1054,9 @@ def get_offer_items(offer_title, page=1, page_size=10):
                 frappe.ValidationError,
             )
 
-        offer_rules = frappe.get_all(
-            "Pricing Rule",
-            filters={
-                "disable": 0,
-                "promotional_scheme": promotional_scheme_doc.name,
-                "valid_from": ["<=", frappe.utils.nowdate()],
-                "discount_percentage": [">", 0],
-            },
-            fields=["name", "valid_upto", "apply_on"],
-        )
-
-        # If no active pricing rules are found, return an empty list
-        if not offer_rules:
-            return {"items": []}
-
-        # Map pricing rule valid_upto to item codes
-        pricing_rule_map = {rule["name"]: rule["valid_upto"] for rule in offer_rules}
-        pricing_rule_names = list(pricing_rule_map.keys())
-
-        if offer_rules[0].apply_on == "Item Code":
-            # Fetch items linked to these pricing rules
-            items = frappe.get_all(
-                "Pricing Rule Item Code",
-                filters={"parent": ["in", pricing_rule_names]},
-                fields=["item_code", "parent"],
-            )
-        elif offer_rules[0].apply_on == "Item Group":
-            item_groups = frappe.get_all(
-                "Pricing Rule Item Group",
-                filters={"parent": offer_rules[0].name},
-                fields=["item_group"],
-            )
-            item_group_names = [item_group["item_group"] for item_group in item_groups]
-            # Fetch items linked to these item_groups
-            items = frappe.get_all(
-                "Item",
-                filters={
-                    "item_group": ["in", item_group_names],
-                    "published_in_website": 1,
-                },
-                fields=["item_code"],
-            )
-
-        if not items:
-            return {"items": []}
-
-        item_codes = [item["item_code"] for item in items]
-
-        # Step 2: Fetch Website Items linked to these item codes
-        website_items = frappe.get_all(
-            "Website Item",
-            filters={
-                "item_code": ["in", item_codes],
-                "published": 1,  # Ensure only published items are fetched
-            },
-            fields=[
+        # Fetch the scheme's website items from the pricing rule index
+        website_items, total_items = get_offer_website_items(
+            [
                 "web_item_name",
                 "name",
                 "item_code",
@@ -1790,97 +1067,32 @@ def get_offer_items(offer_title, page=1, page_size=10):
                 "short_description",
                 "ranking",
             ],
-            order_by="ranking desc",
-            limit_start=offset,
-            limit_page_length=limit,
+            filters={
+                "promotional_scheme": promotional_scheme_doc.name,
+                "min_discount": 0,
+            },
+            start=offset,
+            page_length=limit + 1,
+            with_total=True,
+            cursor=cursor,
         )
+        next_cursor = None
+        if len(website_items) > limit:
+            website_items = website_items[:limit]
+            next_cursor = encode_cursor(website_items[-1].ranking, website_items[-1].name)
 
-        # Create a dictionary to map item codes to their associated pricing rule expiry dates
-        # expiry_dates = {item["item_code"]: pricing_rule_map.get(item.get("parent")) for item in items}
-        expiry_dates = offer_rules[0].valid_upto
-
-        # Step 3: Enhance each item with pricing, rating, and valid_upto details
+        # Step 3: Enhance the items with pricing, rating, and valid_upto details
         for item in website_items:
-            try:
-                # Attach the expiry date from the pricing rule to the item if available
-                # item["offer_ends"] = "This offer ends on "+ date_to_words(expiry_dates.get(item["item_code"]))
-                item["offer_ends"] = "This offer ends on " + date_to_words(expiry_dates)
-                # Get stock quantity
-                stock_qty = frappe.db.get_value(
-                    "Bin", {"item_code": item.item_code}, "projected_qty"
-                )
-                item["stock_qty"] = stock_qty if stock_qty else 0
-
-                # Get product pricing information
-                product_info = get_product_info_for_website(
-                    item.item_code, skip_quotation_creation=True
-                ).get("product_info")
-                if product_info and product_info["price"]:
-                    item.update(
-                        {
-                            "currency": product_info["price"].get("currency"),
-                            "formatted_mrp": product_info["price"].get("formatted_mrp"),
-                            "formatted_price": product_info["price"].get(
-                                "formatted_price"
-                            ),
-                            "price_list_rate": product_info["price"].get(
-                                "price_list_rate"
-                            ),
-                        }
-                    )
-                    if product_info["price"].get("discount_percent"):
-                        item.update(
-                            {
-                                "discount_percent": flt(
-                                    product_info["price"].get("discount_percent")
-                                ),
-                                "discount": product_info["price"].get(
-                                    "formatted_discount_percent"
-                                )
-                                or product_info["price"].get("formatted_discount_rate"),
-                            }
-                        )
-
-                # Add pricing rule expiration date
-                # item["pricing_rule_expiration"] = pricing_rule_map.get(item.get("parent"))
-                # item["pricing_rule_expiration"] = pricing_rule_map.get('PRLE-0003')
-
-            except Exception as e:
-                frappe.log_error(
-                    f"Error fetching product info for item {item.name}: {str(e)}",
-                    "Get Offer Items API",
-                )
+            # Attach the expiry date of the item's pricing rule
+            offer_ends = date_to_words(item.valid_upto) if item.valid_upto else None
+            if offer_ends:
+                item["offer_ends"] = "This offer ends on " + offer_ends
 
-            try:
-                # Get item rating
-                ratings = frappe.get_all(
-                    "Item Review", filters={"item": item.item_code}, fields=["rating"]
-                )
-                qty_limits = get_cart_qty_limits(item.item_code)
-                item["minimum_qty"] = qty_limits["minimum_qty"]
-                item["maximum_qty"] = qty_limits["maximum_qty"]
-                if ratings:
-                    total_rating = sum([r["rating"] for r in ratings])
-                    average_rating = total_rating / len(ratings)
-                    item["rating"] = round(average_rating, 1)
-                else:
-                    item["rating"] = 0  # No ratings, default to 0
-            except Exception as e:
-                frappe.log_error(
-                    f"Error fetching ratings for item {item.item_code}: {str(e)}",
-                    "Get Offer Items API",
-                )
-                item["rating"] = 0  # Default rating if fetching fails
+        enrich_items(website_items)
 
-        # Determine total items and total pages for pagination
-        total_items = frappe.db.count(
-            "Website Item",
-            filters={
-                "item_code": ["in", item_codes],
-                "published": 1,  # Ensure only published items are fetched
-            },
-        )
-        total_pages = (total_items + page_size - 1) // page_size  # Ceiling division
+        total_pages = None
+        if total_items is not None:
+            total_pages = (total_items + page_size - 1) // page_size  # Ceiling division
 
         # Return the response with pagination details
         frappe.response["data"] = {
@@ -1888,10 +1100,11 @@ def get_offer_items(offer_title, page=1, page_size=10):
             "valid_upto": end_of_day_iso(promotional_scheme_doc.valid_upto),
             "items": website_items,
             "pagination": {
-                "current_page": page,
+                "current_page": None if cursor else page,
                 "page_size": page_size,
                 "total_items": total_items,
                 "total_pages": total_pages,
+                "next_cursor": next_cursor,
             },
         }
 
@@ -1998,69 +1211,7 @@ def get_offer_items_old(offer_title, page=1, page_size=10):
         )
 
         # Enhance items with stock, pricing, and rating information
-        for item in items:
-            try:
-                # Get stock quantity
-                stock_qty = frappe.db.get_value(
-                    "Bin", {"item_code": item.item_code}, "projected_qty"
-                )
-                item["stock_qty"] = stock_qty if stock_qty else 0
-
-                # Get product pricing information
-                product_info = get_product_info_for_website(
-                    item.item_code, skip_quotation_creation=True
-                ).get("product_info")
-                if product_info and product_info["price"]:
-                    item.update(
-                        {
-                            "currency": product_info["price"].get("currency"),
-                            "formatted_mrp": product_info["price"].get("formatted_mrp"),
-                            "formatted_price": product_info["price"].get(
-                                "formatted_price"
-                            ),
-                            "price_list_rate": product_info["price"].get(
-                                "price_list_rate"
-                            ),
-                        }
-                    )
-                    if product_info["price"].get("discount_percent"):
-                        item.update(
-                            {
-                                "discount_percent": flt(
-                                    product_info["price"].get("discount_percent")
-                                ),
-                                "discount": product_info["price"].get(
-                                    "formatted_discount_percent"
-                                )
-                                or product_info["price"].get("formatted_discount_rate"),
-                            }
-                        )
-            except Exception as e:
-                frappe.log_error(
-                    f"Error fetching product info for item {item.name}: {str(e)}",
-                    "Get Offer Items API",
-                )
-
-            try:
-                # Get item rating
-                ratings = frappe.get_all(
-                    "Item Review", filters={"item": item.item_code}, fields=["rating"]
-                )
-                qty_limits = get_cart_qty_limits(item.item_code)
-                item["minimum_qty"] = qty_limits["minimum_qty"]
-                item["maximum_qty"] = qty_limits["maximum_qty"]
-                if ratings:
-                    total_rating = sum([r["rating"] for r in ratings])
-                    average_rating = total_rating / len(ratings)
-                    item["rating"] = round(average_rating, 1)
-                else:
-                    item["rating"] = 0  # No ratings, default to 0
-            except Exception as e:
-                frappe.log_error(
-                    f"Error fetching ratings for item {item.item_code}: {str(e)}",
-                    "Get Offer Items API",
-                )
-                item["rating"] = 0  # Default rating if fetching fails
+        enrich_items(items)
 
         # Determine total items and total pages for pagination
         total_items = len(web_items)
@@ -2109,50 +1260,24 @@ def get_items_by_pricing_rule(pricing_rule_name=None, limit=None):
 
         # Fetch Pricing Rule details
         pricing_rules = frappe.get_all(
-            "Pricing Rule", filters={"title": pricing_rule_name, "disable": 0}
+            "Pricing Rule",
+            filters={"title": pricing_rule_name, "disable": 0},
+            fields=["name", "apply_on"],
+            limit=1,
         )
         if not pricing_rules:
             frappe.throw(("Pricing Rule not found"))
 
-        pricing_rule = frappe.get_doc("Pricing Rule", pricing_rules[0].name)
-
-        filters = {}
-        items = []
+        pricing_rule = pricing_rules[0]
 
         # Determine rule application
-        if pricing_rule.apply_on == "Item Code":
-            # Fetch items associated with the Pricing Rule directly
-            items = frappe.get_all(
-                "Pricing Rule Item Code",
-                filters={"parent": pricing_rule.name},
-                fields=["item_code"],
-            )
-
-        elif pricing_rule.apply_on == "Item Group":
-            # Fetch items in the specified item group
-            filters["item_group"] = pricing_rule.item_group
-
-        elif pricing_rule.apply_on == "Brand":
-            # Fetch items in the specified brand
-            filters["brand"] = pricing_rule.brand
-
-        else:
+        if pricing_rule.apply_on not in ("Item Code", "Item Group", "Brand"):
             frappe.throw(_("Unsupported rule_based_on value"))
 
-        # If applicable, fetch items based on item group or brand
-        if filters:
-            items = frappe.get_all("Item", filters=filters, fields=["item_code"])
-
-        item_codes = [item["item_code"] for item in items]
-
-        # Step 2: Fetch Website Items linked to these item codes
-        website_items = frappe.get_all(
-            "Website Item",
-            filters={
-                "item_code": ["in", item_codes],
-                "published": 1,  # Ensure only published items are fetched
-            },
-            fields=[
+        # Fetch the website items the rule applies to from the pricing rule index,
+        # together with the rule's valid_upto
+        website_items, _total = get_offer_website_items(
+            [
                 "web_item_name",
                 "name",
                 "item_name",
@@ -2168,83 +1293,13 @@ def get_items_by_pricing_rule(pricing_rule_name=None, limit=None):
                 "ranking",
                 "on_backorder",
             ],
-            order_by="creation desc",  # Order by creation date to get the newest items
-            limit=limit,
+            filters={"pricing_rules": [pricing_rule.name]},
+            order_by="wi.creation DESC",  # Order by creation date to get the newest items
+            page_length=limit,
         )
 
-        # Step 3: Enhance each item with pricing, rating, and valid_upto details
-        for item in website_items:
-            try:
-                # Fetch product information including pricing details
-                product_info = get_product_info_for_website(
-                    item.item_code, skip_quotation_creation=True
-                ).get("product_info")
-                if product_info and product_info["price"]:
-                    item.update(
-                        {
-                            "formatted_mrp": product_info["price"].get("formatted_mrp"),
-                            "formatted_price": product_info["price"].get(
-                                "formatted_price"
-                            ),
-                            "price_list_rate": product_info["price"].get(
-                                "price_list_rate"
-                            ),
-                        }
-                    )
-
-                if product_info["price"].get("discount_percent"):
-                    item.update(
-                        {
-                            "discount_percent": flt(
-                                product_info["price"].get("discount_percent")
-                            )
-                        }
-                    )
-
-                if item.get("formatted_mrp"):
-                    item.update(
-                        {
-                            "discount": product_info["price"].get(
-                                "formatted_discount_percent"
-                            )
-                            or product_info["price"].get("formatted_discount_rate")
-                        }
-                    )
-
-                # Map valid_upto from pricing rule to the item
-                pricing_rule_entry = next(
-                    (p for p in items if p["item_code"] == item["item_code"]), None
-                )
-                if pricing_rule_entry:
-                    item["valid_upto"] = pricing_rule.valid_upto
-
-            except Exception as e:
-                frappe.log_error(
-                    message=f"Error fetching product info for item {item.get('item_code')}: {str(e)}",
-                    title="Get New Website Items Error",
-                )
-                continue
-
-            try:
-                # Fetch item rating
-                ratings = frappe.get_all(
-                    "Item Review", filters={"item": item.item_code}, fields=["rating"]
-                )
-                qty_limits = get_cart_qty_limits(item.item_code)
-                item["minimum_qty"] = qty_limits["minimum_qty"]
-                item["maximum_qty"] = qty_limits["maximum_qty"]
-                if ratings:
-                    total_rating = sum([r["rating"] for r in ratings])
-                    average_rating = total_rating / len(ratings)
-                    item["rating"] = round(average_rating, 1)
-                else:
-                    item["rating"] = 0
-            except Exception as e:
-                frappe.log_error(
-                    message=f"Error fetching ratings for item {item.get('item_code')}: {str(e)}",
-                    title="Get New Website Items Error",
-                )
-                item["rating"] = 0  # Default value if rating fetch fails
+        # Step 3: Enhance the items with pricing and rating details
+        enrich_items(website_items)
 
         frappe.response["data"] = {"items": website_items}
 
@@ -2341,6 +1396,7 @@ def submit_item_review(item_code, review):
             # Save the review
             item_review.save()
             frappe.db.set_value("Item Review", item_review.name, "rating", rating)
+            clear_item_details([item_code])
             frappe.db.commit()
         else:
             frappe.throw(_("You have existing review"), frappe.ValidationError)
@@ -2523,33 +1579,11 @@ def get_wishlist():
             fields=["item_code", "item_name", "description", "image", "warehouse"],
         )
 
-        # Loop through wishlist items and append price
+        # Loop through wishlist items and append price, resolved in bulk
+        prices = get_price_map([item["item_code"] for item in wishlist_items])
         for item in wishlist_items:
             get_stock_availability(item)
-            product_info = get_product_info_for_website(
-                item["item_code"], skip_quotation_creation=True
-            ).get("product_info")
-            if product_info and product_info["price"]:
-                item.update(
-                    {
-                        "formatted_mrp": product_info["price"].get("formatted_mrp"),
-                        "formatted_price": product_info["price"].get("formatted_price"),
-                        "price_list_rate": product_info["price"].get("price_list_rate"),
-                    }
-                )
-            if product_info["price"].get("discount_percent"):
-                item.update(
-                    {"discount_percent": flt(product_info["price"].discount_percent)}
-                )
-            if item.formatted_mrp:
-                item.update(
-                    {
-                        "discount": product_info["price"].get(
-                            "formatted_discount_percent"
-                        )
-                        or product_info["price"].get("formatted_discount_rate")
-                    }
-                )
+            item.update(prices.get(item["item_code"], {}))
 
         frappe.response["data"] = {
             "message": "Wishlist items fetched successfully.",
@@ -2574,6 +1608,7 @@ def get_wishlist():
 
 
 @frappe.whitelist(allow_guest=True)
+@cached_response(tags=["Item Group"])
 def get_item_groups(limit=None):
     """
     API to fetch all active Item Groups in ERPNext, or limit the number of results.
@@ -2585,19 +1620,8 @@ def get_item_groups(limit=None):
         dict: A dictionary containing the list of item groups.
     """
     try:
-        # Set default limit to None to fetch all if no limit is specified
-        limit = int(limit) if limit else None
-
-        # Fetch active Item Groups with optional limit
-        item_groups = frappe.get_all(
-            "Item Group",
-            filters={
-                "show_in_website": 1
-            },  # Filter only active groups shown on website
-            fields=["name", "parent_item_group", "image", "is_group"],
-            order_by="weightage desc",
-            limit=limit,  # Use limit only if provided, otherwise fetch all
-        )
+        # Served from the cached Item Group tree
+        item_groups = get_website_item_groups(limit=limit)
 
         if not item_groups:
             frappe.response["data"] = {
@@ -2618,6 +1642,7 @@ def get_item_groups(limit=None):
 
 
 @frappe.whitelist(allow_guest=True)
+@cached_response(tags=["Item Group"])
 def get_child_item_groups_by_parent(parent_item_group, limit=None):
     """
     API to fetch all active Item Groups in ERPNext, or limit the number of results.
@@ -2629,20 +1654,8 @@ def get_child_item_groups_by_parent(parent_item_group, limit=None):
         dict: A dictionary containing the list of item groups.
     """
     try:
-        # Set default limit to None to fetch all if no limit is specified
-        limit = int(limit) if limit else None
-
-        # Fetch active Item Groups with optional limit
-        item_groups = frappe.get_all(
-            "Item Group",
-            filters={
-                "show_in_website": 1,
-                "parent_item_group": parent_item_group,
-            },  # Filter only active groups shown on website
-            fields=["name", "parent_item_group", "image", "is_group"],
-            order_by="weightage desc",
-            limit=limit,  # Use limit only if provided, otherwise fetch all
-        )
+        # Served from the cached Item Group tree
+        item_groups = get_website_item_groups(parent_item_group, limit=limit)
 
         if not item_groups:
             frappe.response["data"] = {
@@ -2663,53 +1676,17 @@ def get_child_item_groups_by_parent(parent_item_group, limit=None):
 
 
 @frappe.whitelist(allow_guest=True)
+@cached_response(tags=["Item Group"])
 def get_dashboard_categories():
+    """
+    Item groups of the app dashboard sections, configured through
+    `keno_dashboard_categories` in site_config.json.
+    """
     try:
-        # Fetch active Item Groups with optional limit
-        cooking_item_groups = frappe.get_all(
-            "Item Group",
-            filters={
-                "show_in_website": 1,
-                "parent_item_group": "Cooking",
-            },  # Filter only active groups shown on website
-            fields=["name", "parent_item_group", "image", "is_group"],
-            order_by="weightage desc",
-            limit=8,  # Use limit only if provided, otherwise fetch all
-        )
-
-        bv_item_groups = frappe.get_all(
-            "Item Group",
-            filters={
-                "show_in_website": 1,
-                "parent_item_group": "Beverages",
-            },  # Filter only active groups shown on website
-            fields=["name", "parent_item_group", "image", "is_group"],
-            order_by="weightage desc",
-            limit=8,  # Use limit only if provided, otherwise fetch all
-        )
+        # Every section is a slice of the cached Item Group tree
+        sections = get_dashboard_category_sections()
 
-        pcare_item_groups = frappe.get_all(
-            "Item Group",
-            filters={
-                "show_in_website": 1,
-                "parent_item_group": "Personal Care",
-            },  # Filter only active groups shown on website
-            fields=["name", "parent_item_group", "image", "is_group"],
-            order_by="weightage desc",
-            limit=8,  # Use limit only if provided, otherwise fetch all
-        )
-
-        best_item_groups = frappe.get_all(
-            "Item Group",
-            filters={
-                "show_in_website": 1
-            },  # Filter only active groups shown on website
-            fields=["name", "parent_item_group", "image", "is_group"],
-            order_by="weightage desc",
-            limit=8,  # Use limit only if provided, otherwise fetch all
-        )
-
-        if not cooking_item_groups:
+        if not any(items for section in sections for items in section.values()):
             frappe.response["data"] = {
                 "message": "No item groups found.",
                 "item_groups": [],
@@ -2717,12 +1694,7 @@ def get_dashboard_categories():
         else:
             frappe.response["data"] = {
                 "message": "Item groups fetched successfully.",
-                "item_groups": [
-                    {"cooking_item_groups": cooking_item_groups},
-                    {"beverages_item_groups": bv_item_groups},
-                    {"pcare_item_groups": pcare_item_groups},
-                    {"best_item_groups": best_item_groups},
-                ],
+                "item_groups": sections,
             }
 
     except Exception as e:
@@ -2794,6 +1766,7 @@ def generate_session_id():
 
 
 @frappe.whitelist(allow_guest=True, methods=["GET"])
+@cached_response(max_age=3600)
 def get_coverage_area_info():
     try:
         # Pickup Locations
@@ -2863,343 +1836,23 @@ def get_coverage_area_info():
 
 @frappe.whitelist(allow_guest=True, methods=["GET"])
 def get_shipping_allowed_neighborhood():
+    """
+    Returns neighborhood data for Queens, Nassau and Suffolk County.
+
+    The payload carries a `version` which is also sent as ETag, clients sending
+    it back in If-None-Match get an empty 304 response until the data changes.
+    """
     try:
-        """
-        Returns neighborhood data for Queens and Nassau County.
-        """
-        data = {
-            "Queens": {
-                "Arverne": ["11692"],
-                "Astoria": ["11101", "11102", "11103", "11104", "11105", "11106"],
-                "Bayside": ["11359", "11360", "11361"],
-                "Beechhurst": ["11357"],
-                "Bellerose": ["11426"],
-                "Breezy Point": ["11697"],
-                "Briarwood": ["11435"],
-                "Broad Channel": ["11693"],
-                "Cambria Heights": ["11411"],
-                "College Point": ["11356"],
-                "Corona": ["11368"],
-                "Douglaston": ["11362", "11363"],
-                "East Elmhurst": ["11369", "11370", "11371"],
-                "Edgemere": ["11690"],
-                "Elmhurst": ["11373", "11380"],
-                "Far Rockaway": [
-                    "11690",
-                    "11691",
-                    "11692",
-                    "11693",
-                    "11694",
-                    "11695",
-                    "11697",
-                ],
-                "Floral Park": ["11004", "11005"],
-                "Flushing": [
-                    "11351",
-                    "11352",
-                    "11354",
-                    "11355",
-                    "11356",
-                    "11357",
-                    "11358",
-                    "11359",
-                    "11360",
-                    "11361",
-                    "11362",
-                    "11363",
-                    "11364",
-                    "11365",
-                    "11366",
-                    "11367",
-                    "11368",
-                    "11369",
-                    "11370",
-                    "11371",
-                    "11372",
-                    "11373",
-                    "11374",
-                    "11375",
-                    "11377",
-                    "11378",
-                    "11379",
-                    "11380",
-                    "11385",
-                    "11386",
-                ],
-                "Forest Hills": ["11375"],
-                "Fort Tilden": ["11695"],
-                "Fort Totten": ["11359"],
-                "Fresh Meadows": ["11365", "11366"],
-                "Glen Oaks": ["11004"],
-                "Glendale": ["11385"],
-                "Hollis": ["11423"],
-                "Howard Beach": ["11414"],
-                "Jackson Heights": ["11372"],
-                "Jamaica": [
-                    "11411",
-                    "11412",
-                    "11413",
-                    "11414",
-                    "11415",
-                    "11416",
-                    "11417",
-                    "11418",
-                    "11419",
-                    "11420",
-                    "11421",
-                    "11422",
-                    "11423",
-                    "11424",
-                    "11426",
-                    "11427",
-                    "11428",
-                    "11429",
-                    "11430",
-                    "11431",
-                    "11432",
-                    "11433",
-                    "11434",
-                    "11435",
-                    "11436",
-                ],
-                "Jamaica Estates": ["11432"],
-                "John F Kennedy Airport": ["11430"],
-                "Kew Gardens": ["11415"],
-                "La Guardia Airport": ["11371"],
-                "Laurelton": ["11413"],
-                "Little Neck": ["11362", "11363"],
-                "Long Island City": [
-                    "11101",
-                    "11102",
-                    "11103",
-                    "11104",
-                    "11105",
-                    "11106",
-                    "11109",
-                ],
-                "Malba": ["11357"],
-                "Maspeth": ["11378"],
-                "Middle Village": ["11379"],
-                "Neponsit": ["11694"],
-                "Oakland Gardens": ["11364"],
-                "Ozone Park": ["11416", "11417"],
-                "Queens Village": ["11427", "11428", "11429"],
-                "Rego Park": ["11374"],
-                "Richmond Hill": ["11418"],
-                "Ridgewood": ["11385", "11386"],
-                "Rockaway Beach": ["11693"],
-                "Rockaway Park": ["11694"],
-                "Rockaway Point": ["11697"],
-                "Rosedale": ["11422"],
-                "South Ozone Park": ["11420"],
-                "South Richmond Hill": ["11419"],
-                "Springfield Gardens": ["11413"],
-                "St. Albans": ["11412"],
-                "Sunnyside": ["11104"],
-                "Wave Crest": ["11690"],
-                "Whitestone": ["11357"],
-                "Woodhaven": ["11421"],
-                "Woodside": ["11377"],
-            },
-            "Nassau County": {
-                "Albertson": ["11507"],
-                "Alden Manor": ["11003"],
-                "Allenwood": ["11021"],
-                "Argo Village": ["11003"],
-                "Atlantic Beach": ["11509"],
-                "Baldwin": ["11510"],
-                "Baldwin Harbor": ["11510"],
-                "Bar Harbor": ["11762"],
-                "Barnum Island": ["11558"],
-                "Baxter Estates": ["11050"],
-                "Bayville": ["11709"],
-                "Bellerose Terrace": ["11001"],
-                "Bellerose Village": ["11001"],
-                "Bellmore": ["11710"],
-                "Bethpage": ["11714"],
-                "Briar Park": ["11793"],
-                "Brookville": ["11545", "11548"],
-                "Carle Place": ["11514"],
-                "Cedarhurst": ["11516"],
-                "Centre Island": ["11771"],
-                "Cove Neck": ["11771"],
-                "East Atlantic Beach": ["11561"],
-                "East Farmingdale": ["11735"],
-                "East Hills": ["11548", "11576", "11577"],
-                "East Massapequa": ["11758"],
-                "East Meadow": ["11554"],
-                "East Norwich": ["11732"],
-                "East Rockaway": ["11518"],
-                "East Williston": ["11596"],
-                "Elmont": ["11003"],
-                "Far Rockaway": ["11096"],
-                "Farmingdale": ["11735", "11736", "11737", "11774"],
-                "Floral Park": ["11001", "11002", "11003"],
-                "Franklin Square": ["11010"],
-                "Freeport": ["11520"],
-                "Garden City": ["11530", "11531", "11535", "11536", "11599"],
-                "Garden City Park": ["11040"],
-                "Garden City South": ["11530"],
-                "Glen Cove": ["11542"],
-                "Glen Head": ["11545"],
-                "Glenwood Landing": ["11547"],
-                "Great Neck": [
-                    "11020",
-                    "11021",
-                    "11022",
-                    "11023",
-                    "11024",
-                    "11025",
-                    "11026",
-                    "11027",
-                ],
-                "Great Neck Estates": ["11021"],
-                "Greenvale": ["11548"],
-                "Harbor Acres": ["11050"],
-                "Harbor Hills": ["11023"],
-                "Harbor Isle": ["11558"],
-                "Hempstead": ["11549", "11550", "11551"],
-                "Herricks": ["11040"],
-                "Hewlett": ["11557"],
-                "Hewlett Bay": ["11557"],
-                "Hewlett Bay Park": ["11557"],
-                "Hewlett Harbor": ["11557"],
-                "Hewlett Neck": ["11598"],
-                "Hicksville": [
-                    "11801",
-                    "11802",
-                    "11803",
-                    "11804",
-                    "11815",
-                    "11819",
-                    "11854",
-                    "11855",
-                ],
-                "Inwood": ["11096"],
-                "Island Park": ["11558"],
-                "Island Trees": ["11756"],
-                "Jericho": ["11753", "11853"],
-                "Kenilworth": ["11024"],
-                "Kensington": ["11021"],
-                "Kings Point": ["11024"],
-                "Lake Gardens": ["11022"],
-                "Lake Success": ["11020", "11042"],
-                "Lakeview": ["11552", "11570"],
-                "Lakeville Estates": ["11040"],
-                "Lattingtown": ["11560"],
-                "Laurel Hollow": ["11771", "11791"],
-                "Lawrence": ["11559"],
-                "Levittown": ["11756"],
-                "Lido Beach": ["11561"],
-                "Locust Valley": ["11560"],
-                "Locustwood": ["11003"],
-                "Long Beach": ["11561"],
-                "Lynbrook": ["11563", "11564"],
-                "Malverne": ["11565"],
-                "Manhasset": ["11030"],
-                "Manhasset Hills": ["11040"],
-                "Manorhaven": ["11050"],
-                "Massapequa": ["11758"],
-                "Massapequa Park": ["11762"],
-                "Matinecock": ["11560"],
-                "Meacham": ["11003"],
-                "Meadowmere Park": ["11559"],
-                "Merrick": ["11566"],
-                "Mill Neck": ["11765"],
-                "Mineola": ["11501"],
-                "Mitchell Field": ["11530", "11553"],
-                "Muttontown": ["11545", "11732", "11753", "11771", "11791"],
-                "New Cassel": ["11590"],
-                "New Hyde Park": ["11040", "11041", "11042", "11043", "11044", "11099"],
-                "North Baldwin": ["11510"],
-                "North Bellmore": ["11710"],
-                "North Hills": ["11040"],
-                "North Massapequa": ["11758"],
-                "North Merrick": ["11566"],
-                "North New Hyde Park": ["11040"],
-                "North Valley Stream": ["11580"],
-                "North Wantagh": ["11793"],
-                "North Woodmere": ["11581"],
-                "Oceanside": ["11572"],
-                "Old Bethpage": ["11804"],
-                "Old Brookville": ["11545", "11548"],
-                "Old Westbury": ["11568"],
-                "Oyster Bay": ["11771"],
-                "Oyster Bay Cove": ["11771", "11791"],
-                "Plainedge": ["11756"],
-                "Plainview": ["11803"],
-                "Plandome": ["11030"],
-                "Point Lookout": ["11569"],
-                "Port Washington": [
-                    "11050",
-                    "11051",
-                    "11052",
-                    "11053",
-                    "11054",
-                    "11055",
-                ],
-                "Rockville Centre": ["11570", "11571", "11572", "11592"],
-                "Roosevelt": ["11575"],
-                "Roosevelt Field": ["11530", "11531"],
-                "Roslyn": ["11576"],
-                "Roslyn Estates": ["11576"],
-                "Roslyn Harbor": ["11545", "11548", "11576"],
-                "Roslyn Heights": ["11577"],
-                "Russell Gardens": ["11021"],
-                "Saddle Rock": ["11023"],
-                "Saddle Rock Estates": ["11021"],
-                "Sands Point": ["11050"],
-                "Sea Cliff": ["11579"],
-                "Seaford": ["11783"],
-                "South Farmingdale": ["11735"],
-                "South Floral Park": ["11001"],
-                "South Hempstead": ["11550"],
-                "Stewart Manor": ["11530"],
-                "Strathmore": ["11030"],
-                "Sutton Park": ["11559"],
-                "Syosset": ["11773", "11791"],
-                "The Terrace": ["11050"],
-                "Thomaston": ["11021"],
-                "Uniondale": ["11553", "11555", "11556", "11588"],
-                "University Gardens": ["11020"],
-                "Upper Brookville": ["11545", "11732", "11771"],
-                "Valley Stream": ["11580", "11581", "11582", "11583"],
-                "Wantagh": ["11793"],
-                "West Hempstead": ["11552"],
-                "Westbury": ["11568", "11590", "11593", "11594", "11595", "11597"],
-                "Williston Park": ["11596"],
-                "Woodbury": ["11797"],
-                "Woodmere": ["11598"],
-                "Woodsburgh": ["11598"],
-            },
-            "Suffolk County": {
-                "Babylon": ["11702", "11703", "11704", "11707"],
-                "Bohemia": ["11716"],
-                "Brentwood": ["11717"],
-                "Centereach": ["11720"],
-                "Coram": ["11727"],
-                "Deer Park": ["11729"],
-                "Dix Hills": ["11746"],
-                "Huntington": ["11743"],
-                "Huntington Station": ["11746", "11747", "11750"],
-                "Kings Park": ["11754"],
-                "Lake Ronkonkoma": ["11779"],
-                "Lake Ronkonkoma Heights": ["11779"],
-                "Lindenhurst": ["11757"],
-                "Melville": ["11747", "11750", "11775"],
-                "South Huntington": ["11746"],
-                "West Hills": ["11743"],
-                "Wyandanch": ["11798"],
-                "Ronkonkoma": ["11749", "11779"],
-                "Smithtown": ["11745", "11787", "11788"],
-                "Selden": ["11784"],
-            },
-        }
+        dataset = get_neighborhood_dataset()
+
+        if is_not_modified(dataset["version"], max_age=3600):
+            return
 
         # Return API Response
         frappe.response["data"] = {
             "status": "success",
-            "neighborhoods": data,
+            "version": dataset["version"],
+            "neighborhoods": dataset["neighborhoods"],
         }
 
     except Exception as e:
@@ -3210,6 +1863,40 @@ def get_shipping_allowed_neighborhood():
         frappe.throw(_("An error occurred while fetching neighborhoods information."))
 
 
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def get_zip_serviceability(zip_code):
+    """
+    Tells whether a zip code is serviceable, with the counties and
+    neighborhoods it covers and the delivery zone serving it.
+    """
+    try:
+        if not zip_code:
+            frappe.throw(_("Zip code is required"), frappe.ValidationError)
+
+        areas = get_zip_areas(zip_code)
+
+        frappe.response["data"] = {
+            "status": "success",
+            "zip_code": zip_code,
+            "serviceable": bool(areas),
+            "areas": areas,
+            "delivery_zone": get_zone_for_zip(zip_code),
+            "version": get_neighborhood_dataset()["version"],
+        }
+
+    except frappe.ValidationError as e:
+        frappe.local.response["http_status_code"] = HTTPStatus.BAD_REQUEST
+        frappe.response["data"] = {"status": "error", "message": str(e)}
+
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "Failed to check zip serviceability")
+        frappe.local.response["http_status_code"] = HTTPStatus.INTERNAL_SERVER_ERROR
+        frappe.response["data"] = {
+            "status": "error",
+            "message": "An unexpected error occurred. Please try again later.",
+        }
+
+
 @frappe.whitelist(allow_guest=True, methods=["POST"])
 def subscribe_to_newsletter(email):
     try:
@@ -3224,6 +1911,7 @@ def subscribe_to_newsletter(email):
 
 
 @frappe.whitelist(allow_guest=True, methods=["GET"])
+@cached_response(tags=["Website Slideshow"])
 def get_slideshow(slideshow_name):
     try:
         # Check if slideshow exists
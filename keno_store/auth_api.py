@@ -6,15 +6,25 @@ from frappe.email.doctype.email_template.email_template import get_email_templat
 from frappe.rate_limiter import rate_limit
 from frappe.utils.password import get_password_reset_limit
 from frappe.utils import get_formatted_email
+from keno_store.keno_store.guest_cart import merge_guest_cart
 
 
 @frappe.whitelist(allow_guest=True)
-def custom_login(usr, pwd):
+def custom_login(usr, pwd, session_id=None):
     login_manager = LoginManager()
     login_manager.authenticate(usr, pwd)
     login_manager.post_login()
     if frappe.response["message"] == "Logged In":
         user = login_manager.user
+        if session_id:
+            # Move the guest cart of the session into the user's cart, a failed
+            # merge is rolled back entirely and does not prevent the login
+            frappe.db.savepoint("merge_guest_cart")
+            try:
+                merge_guest_cart(session_id)
+            except Exception:
+                frappe.db.rollback(save_point="merge_guest_cart")
+                frappe.log_error(frappe.get_traceback(), "Guest Cart Merge Error")
         frappe.response["sid"] = frappe.session.sid
         frappe.response["token"] = generate_token(user)
         frappe.response["user_details"] = get_user_details(user)
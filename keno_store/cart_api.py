@@ -7,13 +7,38 @@ import frappe
 from frappe.auth import validate_auth_via_api_keys
 from frappe.model.docstatus import DocStatus
 from frappe.utils.data import add_days, getdate, now, today
-from keno_store.utils import validate_coupon_against_cart
+from keno_store.utils import is_not_modified, validate_coupon_against_cart
+from keno_store.keno_store.doctype.delivery_zone.delivery_zone import get_zone_for_zip
+from keno_store.keno_store.cart_charges import get_cart_tax_template, get_delivery_shipping_rule
+from keno_store.keno_store.cart_validation import (
+    validate_cart_changes,
+    validate_cart_items,
+    validate_cart_line,
+)
+from keno_store.keno_store.guest_cart import (
+    get_ephemeral_cart,
+    materialize_guest_cart,
+    update_ephemeral_cart,
+)
+from keno_store.keno_store.party import (
+    GUEST_CUSTOMER,
+    get_cached_party,
+    get_customer_price_list,
+)
+from keno_store.keno_store.pricing_rule_index import has_cross_line_pricing_rules
+from keno_store.keno_store.quotation import (
+    build_cart_snapshot,
+    get_cart_snapshot,
+    get_cart_summary,
+    get_guest_cart,
+    get_guest_cart_name,
+)
+from keno_store.keno_store.response_cache import get_cached_payload
 import requests
 import stripe
 import frappe.defaults
-from frappe import _, throw
+from frappe import _
 from frappe.contacts.doctype.address.address import get_address_display
-from frappe.contacts.doctype.contact.contact import get_contact_name
 from frappe.utils import cint, cstr, flt, get_fullname, money_in_words
 import frappe.utils
 from frappe.utils.nestedset import get_root_of
@@ -23,12 +48,22 @@ from erpnext.accounts.utils import get_account_name
 from webshop.webshop.doctype.webshop_settings.webshop_settings import (
     get_shopping_cart_settings,
 )
-from webshop.webshop.utils.product import get_web_item_qty_in_stock
 from erpnext.selling.doctype.quotation.quotation import _make_sales_order
 
 frappe.utils.logger.set_log_level("DEBUG")
 logger = frappe.logger("cart_api", allow_site=True, file_count=50)
 
+MAX_CART_BATCH_SIZE = 100
+
+# Any change to these fields reprices the whole cart
+PRICING_CONTEXT_FIELDS = (
+    "selling_price_list",
+    "party_name",
+    "customer_address",
+    "shipping_address_name",
+    "coupon_code",
+)
+
 
 class WebsitePriceListMissingError(frappe.ValidationError):
     pass
@@ -69,105 +104,35 @@ def get_cart_quotation(doc=None, session_id=None):
         # Get the party (customer)
         party = get_party()
 
-        # Fetch or create the quotation (cart)
-        if not doc:
-            if frappe.local.session.user is None or frappe.session.user == "Guest":
-                quotation = frappe.get_all(
-                    "Quotation",
-                    filters={"custom_session_id": session_id, "docstatus": 0},
-                    limit=1,
-                )
-                if quotation:
-                    quotation = frappe.get_doc("Quotation", quotation[0].name)
-                else:
-                    frappe.throw("Cart is emplty!!")
+        # Read the cart from its snapshot, the Quotation is only loaded when
+        # there is no snapshot yet
+        if doc:
+            cart = build_cart_snapshot(doc)
+        elif frappe.local.session.user is None or frappe.session.user == "Guest":
+            quotation_name = get_guest_cart_name(session_id)
+            if quotation_name:
+                cart = get_cart_snapshot(quotation_name)
             else:
-                quotation = _get_cart_quotation(party)
-
-            doc = quotation
-            set_cart_count(quotation)
-
-        # Get addresses for the party
-        addresses = get_address_docs(party=party)
-        coupon_code = None
-
-        if quotation.coupon_code:
-            coupon = frappe.get_doc("Coupon Code", {"name": quotation.coupon_code})
-            # Access details from the coupon document
-            coupon_code = coupon.coupon_code
-
-        # Update billing address if none exists and addresses are available
-        if not doc.customer_address and addresses:
-            update_cart_address("billing", addresses[0].name)
-
-        f_billing_address = get_formatted_address(quotation.customer_address)
-        f_shipping_address = get_formatted_address(quotation.shipping_address_name)
-        is_ready_for_order = False
-        if quotation.custom_delivery_method == "Home Delivery":
-            if (
-                f_billing_address
-                and f_shipping_address
-                and quotation.custom_delivery_slot
-                and quotation.contact_display
-                and quotation.contact_mobile
-            ):
-                is_ready_for_order = True
-        elif quotation.custom_delivery_method == "Store Pickup":
-            if quotation.custom_pickup_store and quotation.custom_store_pickup_datetime:
-                is_ready_for_order = True
-
-        cart = {
-            "session_id": quotation.custom_session_id,
-            "contact_name": quotation.contact_display,
-            "contact_mobile": quotation.contact_mobile,
-            "contact_email": quotation.contact_email,
-            "net_total": quotation.net_total,
-            "total": quotation.total,
-            "discount_amount": quotation.discount_amount,
-            "taxes_and_charges": quotation.base_total_taxes_and_charges,
-            "grand_total": quotation.grand_total,
-            "rounding_adjustment": quotation.grand_total,
-            "rounding_adjustment": quotation.rounding_adjustment,
-            "rounded_total": quotation.rounded_total,
-            "in_words": quotation.in_words,
-            "coupon_code": coupon_code,
-            "is_coupon_applied": bool(quotation.coupon_code),
-            "is_ready_for_order": is_ready_for_order,
-            "delivery_option": {
-                "delivery_method": quotation.custom_delivery_method,
-                "delivery_type": quotation.custom_delivery_type,
-                "delivery_slot": quotation.custom_delivery_slot,
-                "store": quotation.custom_pickup_store,
-                "store_pickup_time": quotation.custom_store_pickup_datetime,
-            },
-            "items": [
-                {
-                    "item_code": item.item_code,
-                    "item_name": item.item_name,
-                    "quantity": item.qty,
-                    "base_price": item.price_list_rate,
-                    "price": item.rate,
-                    "discount_amount": item.discount_amount,
-                    "amount": item.amount,
-                    "image": item.image,
-                    "item_category": item.item_group,
-                    "item_brand": item.brand
+                cart = (get_ephemeral_cart(session_id) or {}).get("snapshot")
 
-                }
-                for item in quotation.items
-            ],
-            "taxes": [
-                {
-                    "tax_type": tax.description,
-                    "tax_rate": tax.rate,
-                    "tax_amount": tax.tax_amount,
-                }
-                for tax in quotation.taxes
-            ],
-            # "shipping_address": get_shipping_addresses(party)[0],
-            "billing_address": f_billing_address,
-            "shipping_address": f_shipping_address,
-        }
+            if not cart:
+                frappe.throw("Cart is emplty!!")
+        else:
+            quotation_name = get_cart_quotation_name(party)
+            if quotation_name:
+                cart = get_cart_snapshot(quotation_name)
+            else:
+                cart = build_cart_snapshot(_get_cart_quotation(party))
+
+        if not doc:
+            set_cart_count(cart)
+
+        # Update billing address if none exists and addresses are available,
+        # guest carts still in Redis get theirs when materialized
+        if cart.name and not cart.customer_address:
+            addresses = get_address_docs(party=party)
+            if addresses:
+                update_cart_address("billing", addresses[0].name)
 
         # # Return the cart quotation and related data
         # return {
@@ -177,7 +142,7 @@ def get_cart_quotation(doc=None, session_id=None):
         #     "shipping_rules": get_applicable_shipping_rules(party),
         #     # "cart_settings": frappe.get_cached_doc("Webshop Settings"),
         # }
-        frappe.response["data"] = {"status": "success", "cart": cart}
+        frappe.response["data"] = {"status": "success", "cart": get_cart_summary(cart)}
 
     except frappe.ValidationError as e:
         # Handle specific validation errors
@@ -199,21 +164,6 @@ def get_cart_quotation(doc=None, session_id=None):
         }
 
 
-def get_formatted_address(address):
-    if address:
-        address_doc = frappe.get_doc("Address", address)
-        return {
-            "address_line1": address_doc.address_line1,
-            "address_line2": address_doc.address_line2,
-            "city": address_doc.city,
-            "state": address_doc.state,
-            "pincode": address_doc.pincode,
-            "country": address_doc.country,
-        }
-    else:
-        return None
-
-
 @frappe.whitelist()
 def get_shipping_addresses(party=None):
     if not party:
@@ -291,14 +241,8 @@ def place_order_old(payment_method, session_id=None):
 
         # Fetch or create the quotation (cart)
         if frappe.local.session.user is None or frappe.session.user == "Guest":
-            quotation = frappe.get_all(
-                "Quotation",
-                filters={"custom_session_id": session_id, "docstatus": 0},
-                limit=1,
-            )
-            if quotation:
-                quotation = frappe.get_doc("Quotation", quotation[0].name)
-            else:
+            quotation = get_guest_cart(session_id) or materialize_guest_cart(session_id)
+            if not quotation:
                 frappe.throw("Cart is empty!", frappe.ValidationError)
         else:
             quotation = _get_cart_quotation(party)
@@ -339,27 +283,8 @@ def place_order_old(payment_method, session_id=None):
         )
         sales_order.payment_schedule = []
 
-        if not cint(cart_settings.allow_items_not_in_stock):
-            for item in sales_order.get("items"):
-                item.warehouse = frappe.db.get_value(
-                    "Website Item", {"item_code": item.item_code}, "website_warehouse"
-                )
-                is_stock_item = frappe.db.get_value(
-                    "Item", item.item_code, "is_stock_item"
-                )
-
-                if is_stock_item:
-                    item_stock = get_web_item_qty_in_stock(
-                        item.item_code, "website_warehouse"
-                    )
-                    if not cint(item_stock.in_stock):
-                        throw(_("{0} Not in Stock").format(item.item_code))
-                    if item.qty > item_stock.stock_qty:
-                        throw(
-                            _("Only {0} in Stock for item {1}").format(
-                                item_stock.stock_qty, item.item_code
-                            )
-                        )
+        # Validate quantity limits and live stock, and set the fulfilment warehouse
+        validate_cart_items(sales_order.get("items"))
         # Adding Delivery Method, Delivery Date And Delivery Slots data
         sales_order.custom_delivery_method = quotation.custom_delivery_method
         if quotation.custom_delivery_slot:
@@ -607,47 +532,8 @@ def update_cart(item_code, qty, additional_notes=None):
             else:
                 empty_cart = True
         else:
-            # Fetch minimum and maximum quantity limits
-            item_name, stock_uom, min_qty, max_qty = frappe.db.get_value(
-                "Item", item_code, ["item_name", "stock_uom", "custom_minimum_cart_qty", "custom_maximum_cart_qty"]
-            )
-
-            # Default to 0 if the values are None
-            min_qty = min_qty or 0
-            max_qty = max_qty or 0
-
-            # Validate the requested quantity
-            if min_qty and qty < min_qty:
-                frappe.throw(
-                    _("Minimum order quantity for {0} is {1} {2}.").format(
-                        item_name, min_qty, stock_uom
-                    )
-                )
-
-            if max_qty and qty > max_qty:
-                frappe.throw(
-                    _("Maximum order quantity for {0} is {1} {2}.").format(
-                        item_name, max_qty, stock_uom
-                    )
-                )
-            # Fetch warehouse and stock information
-            warehouse = frappe.get_cached_value(
-                "Website Item", {"item_code": item_code}, "website_warehouse"
-            )
-
-            # Verify projected qty (available_qty - reserved_qty)
-            projected_qty = frappe.get_cached_value(
-                "Bin", {"item_code": item_code, "warehouse": warehouse}, "projected_qty"
-            )
-
-            if projected_qty:
-                # Check if sufficient stock is available
-                if projected_qty < qty:
-                    frappe.throw(
-                        _("Only {0} units of {1} are available in stock.").format(
-                            projected_qty, item_name
-                        )
-                    )
+            # Validate quantity limits and live stock, and get the fulfilment warehouse
+            warehouse = validate_cart_line(item_code, qty).warehouse
 
             # Update or add item to quotation
             quotation_items = quotation.get("items", {"item_code": item_code})
@@ -668,7 +554,7 @@ def update_cart(item_code, qty, additional_notes=None):
                 quotation_items[0].additional_notes = additional_notes
 
         # Apply cart settings and save or delete the quotation
-        apply_cart_settings(quotation=quotation)
+        apply_cart_settings(quotation=quotation, changed_items=[item_code])
         quotation.flags.ignore_permissions = True
         quotation.payment_schedule = []
         if not empty_cart:
@@ -849,11 +735,8 @@ def decorate_quotation_doc(doc):
     return doc
 
 
-def _get_cart_quotation(party=None):
-    """Return the open Quotation of type "Shopping Cart" or make a new one"""
-    if not party:
-        party = get_party()
-
+def get_cart_quotation_name(party):
+    """Return the name of the open shopping cart Quotation of the party, if any"""
     quotation = frappe.get_all(
         "Quotation",
         fields=["name"],
@@ -869,8 +752,18 @@ def _get_cart_quotation(party=None):
         limit_page_length=1,
     )
 
-    if quotation:
-        qdoc = frappe.get_doc("Quotation", quotation[0].name)
+    return quotation[0].name if quotation else None
+
+
+def _get_cart_quotation(party=None):
+    """Return the open Quotation of type "Shopping Cart" or make a new one"""
+    if not party:
+        party = get_party()
+
+    quotation_name = get_cart_quotation_name(party)
+
+    if quotation_name:
+        qdoc = frappe.get_doc("Quotation", quotation_name)
     else:
         company = frappe.db.get_single_value("Webshop Settings", "company")
         qdoc = frappe.get_doc(
@@ -905,20 +798,20 @@ def _get_cart_quotation(party=None):
 def update_party(fullname, company_name=None, mobile_no=None, phone=None, email=None):
     party = get_party()
 
-    party.customer_name = company_name or fullname
-    party.customer_type = "Company" if company_name else "Individual"
+    party_doc = frappe.get_doc(party.doctype, party.name)
+    party_doc.customer_name = company_name or fullname
+    party_doc.customer_type = "Company" if company_name else "Individual"
 
     contact_name = frappe.db.get_value("Contact", {"email_id": frappe.session.user})
     contact = frappe.get_doc("Contact", contact_name)
     contact.first_name = fullname
     contact.last_name = None
-    contact.customer_name = party.customer_name
+    contact.customer_name = party_doc.customer_name
     contact.mobile_no = mobile_no
     contact.phone = phone
     contact.flags.ignore_permissions = True
     contact.save()
 
-    party_doc = frappe.get_doc(party.as_dict())
     party_doc.flags.ignore_permissions = True
     party_doc.save()
 
@@ -930,7 +823,16 @@ def update_party(fullname, company_name=None, mobile_no=None, phone=None, email=
         qdoc.save()
 
 
-def apply_cart_settings(party=None, quotation=None):
+def apply_cart_settings(party=None, quotation=None, changed_items=None):
+    """
+    Price the cart, then set its taxes and shipping charges.
+
+    `changed_items` are the item codes of the lines added, updated or removed by
+    the caller. Only those lines are repriced and the totals recomputed, unless
+    the price list, party, addresses or coupon of the cart changed since it was
+    saved, or a pricing rule of the cart can change the price of other lines,
+    in which case the whole cart is repriced.
+    """
     if not party:
         party = get_party()
     if not quotation:
@@ -938,16 +840,62 @@ def apply_cart_settings(party=None, quotation=None):
 
     cart_settings = frappe.get_cached_doc("Webshop Settings")
 
-    set_price_list_and_rate(quotation, cart_settings)
+    if (
+        changed_items is not None
+        and not is_pricing_context_changed(quotation, cart_settings)
+        # Removed lines count too, they may have qualified other lines for a rule
+        and not has_cross_line_pricing_rules(
+            {*changed_items, *(item.item_code for item in quotation.get("items"))}
+        )
+    ):
+        reprice_cart_items(quotation, changed_items)
+
+        quotation.run_method("calculate_taxes_and_totals")
+    else:
+        set_price_list_and_rate(quotation, cart_settings)
 
-    quotation.run_method("calculate_taxes_and_totals")
+        quotation.run_method("calculate_taxes_and_totals")
 
-    set_taxes(quotation, cart_settings)
+        set_taxes(quotation, cart_settings, party)
 
     if quotation.custom_delivery_method and len(quotation.items) > 0:
         _apply_shipping_rule(party, quotation, cart_settings)
 
 
+def is_pricing_context_changed(quotation, cart_settings):
+    """Whether the cart is new or any of `PRICING_CONTEXT_FIELDS` differs from the saved cart"""
+    if quotation.is_new():
+        return True
+
+    _set_price_list(cart_settings, quotation)
+    saved = frappe.db.get_value(
+        "Quotation", quotation.name, PRICING_CONTEXT_FIELDS, as_dict=True
+    )
+
+    return not saved or any(
+        (saved[fieldname] or None) != (quotation.get(fieldname) or None)
+        for fieldname in PRICING_CONTEXT_FIELDS
+    )
+
+
+def reprice_cart_items(quotation, item_codes):
+    """Refetch the price and pricing rule details of the cart lines of `item_codes` only"""
+    items = [item for item in quotation.get("items") if item.item_code in item_codes]
+    if not items:
+        return
+
+    for item in items:
+        item.price_list_rate = item.discount_percentage = item.rate = item.amount = None
+
+    # Let ERPNext fetch the item details of the changed lines only
+    all_items = quotation.items
+    quotation.items = items
+    try:
+        quotation.run_method("set_price_list_and_item_details")
+    finally:
+        quotation.items = all_items
+
+
 def set_price_list_and_rate(quotation, cart_settings):
     """set price list based on billing territory"""
 
@@ -972,16 +920,12 @@ def set_price_list_and_rate(quotation, cart_settings):
 
 def _set_price_list(cart_settings, quotation=None):
     """Set price list based on customer or shopping cart default"""
-    from erpnext.accounts.party import get_default_price_list
-
     party_name = quotation.get("party_name") if quotation else get_party().get("name")
     selling_price_list = None
 
-    # check if default customer price list exists
-    if party_name and frappe.db.exists("Customer", party_name):
-        selling_price_list = get_default_price_list(
-            frappe.get_doc("Customer", party_name)
-        )
+    # check if default customer price list exists, guests use the shopping cart default
+    if party_name and party_name != GUEST_CUSTOMER:
+        selling_price_list = get_customer_price_list(party_name)
 
     # check default price list in shopping cart
     if not selling_price_list:
@@ -993,26 +937,17 @@ def _set_price_list(cart_settings, quotation=None):
     return selling_price_list
 
 
-def set_taxes(quotation, cart_settings):
+def set_taxes(quotation, cart_settings, party=None):
     """set taxes based on billing territory"""
-    from erpnext.accounts.party import set_taxes
-
-    customer_group = frappe.db.get_value(
-        "Customer", quotation.party_name, "customer_group"
-    )
+    # The cached party carries its customer group, guest carts look it up
+    if party and party.get("name") == quotation.party_name and party.get("customer_group"):
+        customer_group = party.get("customer_group")
+    else:
+        customer_group = frappe.get_cached_value(
+            "Customer", quotation.party_name, "customer_group"
+        )
 
-    quotation.taxes_and_charges = set_taxes(
-        quotation.party_name,
-        "Customer",
-        quotation.transaction_date,
-        quotation.company,
-        customer_group=customer_group,
-        supplier_group=None,
-        tax_category=quotation.tax_category,
-        billing_address=quotation.customer_address,
-        shipping_address=quotation.shipping_address_name,
-        use_for_shopping_cart=1,
-    )
+    quotation.taxes_and_charges = get_cart_tax_template(quotation, customer_group)
     #
     # 	# clear table
     quotation.set("taxes", [])
@@ -1023,74 +958,60 @@ def set_taxes(quotation, cart_settings):
 
 
 def get_party(user=None):
+    """
+    Return the party of the user from the party cache, making a Customer and
+    Contact for users without one.
+    """
     if not user:
         user = frappe.session.user
 
-    contact_name = get_contact_name(user)
-    party = None
-
-    if contact_name:
-        contact = frappe.get_doc("Contact", contact_name)
-        if contact.links:
-            party_doctype = contact.links[0].link_doctype
-            party = contact.links[0].link_name
+    party = get_cached_party(user)
+    if party:
+        return party
 
     cart_settings = frappe.get_cached_doc("Webshop Settings")
+    if not cart_settings.enabled:
+        frappe.local.flags.redirect_location = "/contact"
+        raise frappe.Redirect
 
     debtors_account = ""
-
     if cart_settings.enable_checkout:
         debtors_account = get_debtors_account(cart_settings)
 
-    if party:
-        doc = frappe.get_doc(party_doctype, party)
-        if doc.doctype in ["Customer", "Supplier"]:
-            if not frappe.db.exists("Portal User", {"parent": doc.name, "user": user}):
-                doc.append("portal_users", {"user": user})
-                doc.flags.ignore_permissions = True
-                doc.flags.ignore_mandatory = True
-                doc.save()
+    customer = frappe.new_doc("Customer")
+    fullname = get_fullname(user)
+    customer.update(
+        {
+            "customer_name": fullname,
+            "customer_type": "Individual",
+            "customer_group": get_shopping_cart_settings().default_customer_group,
+            "territory": get_root_of("Territory"),
+        }
+    )
 
-        return doc
+    customer.append("portal_users", {"user": user})
 
-    else:
-        if not cart_settings.enabled:
-            frappe.local.flags.redirect_location = "/contact"
-            raise frappe.Redirect
-        customer = frappe.new_doc("Customer")
-        fullname = get_fullname(user)
+    if debtors_account:
         customer.update(
             {
-                "customer_name": fullname,
-                "customer_type": "Individual",
-                "customer_group": get_shopping_cart_settings().default_customer_group,
-                "territory": get_root_of("Territory"),
+                "accounts": [
+                    {"company": cart_settings.company, "account": debtors_account}
+                ]
             }
         )
 
-        customer.append("portal_users", {"user": user})
-
-        if debtors_account:
-            customer.update(
-                {
-                    "accounts": [
-                        {"company": cart_settings.company, "account": debtors_account}
-                    ]
-                }
-            )
-
-        customer.flags.ignore_mandatory = True
-        customer.insert(ignore_permissions=True)
+    customer.flags.ignore_mandatory = True
+    customer.insert(ignore_permissions=True)
 
-        contact = frappe.new_doc("Contact")
-        contact.update(
-            {"first_name": fullname, "email_ids": [{"email_id": user, "is_primary": 1}]}
-        )
-        contact.append("links", dict(link_doctype="Customer", link_name=customer.name))
-        contact.flags.ignore_mandatory = True
-        contact.insert(ignore_permissions=True)
+    contact = frappe.new_doc("Contact")
+    contact.update(
+        {"first_name": fullname, "email_ids": [{"email_id": user, "is_primary": 1}]}
+    )
+    contact.append("links", dict(link_doctype="Customer", link_name=customer.name))
+    contact.flags.ignore_mandatory = True
+    contact.insert(ignore_permissions=True)
 
-        return customer
+    return customer
 
 
 def get_debtors_account(cart_settings):
@@ -1189,26 +1110,13 @@ def _apply_shipping_rule(party=None, quotation=None, cart_settings=None):
     # if not quotation.shipping_rule:
     # Check if custom delivery method is set
     if quotation.custom_delivery_method:
-        # Handle store pickup scenario
-        if quotation.custom_delivery_method == "Store Pickup":
-            try:
-                shipping_rules = [frappe.get_doc("Shipping Rule", "Store Pickup").name]
-
-            except frappe.DoesNotExistError:
-                frappe.throw(_("Store Pickup shipping rule does not exist."))
-        elif quotation.custom_delivery_method == "Home Delivery":
-            try:
-                if quotation.custom_delivery_type == "Express Delivery":
-                    shipping_rules = [
-                        frappe.get_doc("Shipping Rule", "Express Delivery").name
-                    ]
-                else:
-                    shipping_rules = [
-                        frappe.get_doc("Shipping Rule", "Standard Delivery").name
-                    ]
-
-            except frappe.DoesNotExistError:
-                frappe.throw(_("Store Pickup shipping rule does not exist."))
+        # Store pickup, or express or standard home delivery
+        if quotation.custom_delivery_method in ("Store Pickup", "Home Delivery"):
+            shipping_rules = [
+                get_delivery_shipping_rule(
+                    quotation.custom_delivery_method, quotation.custom_delivery_type
+                )
+            ]
     else:
         # Get available shipping rules based on the quotation and cart settings
         shipping_rules = get_shipping_rules(quotation, cart_settings)
@@ -1332,14 +1240,7 @@ def apply_coupon_code(
             frappe.set_user("Guest")
 
         if frappe.local.session.user is None or frappe.session.user == "Guest":
-            quotation = frappe.get_all(
-                "Quotation",
-                filters={"custom_session_id": session_id, "docstatus": 0},
-                limit=1,
-            )
-            if quotation:
-                # Fetch the existing quotation for the session
-                quotation = frappe.get_doc("Quotation", quotation[0].name)
+            quotation = get_guest_cart(session_id) or materialize_guest_cart(session_id)
         else:
             quotation = _get_cart_quotation()
 
@@ -1405,18 +1306,12 @@ def remove_coupon_from_cart(
             frappe.set_user("Guest")
 
         if frappe.local.session.user is None or frappe.session.user == "Guest":
-            quotation = frappe.get_all(
-                "Quotation",
-                filters={"custom_session_id": session_id, "docstatus": 0},
-                limit=1,
-            )
-            if quotation:
-                # Fetch the existing quotation for the session
-                quotation = frappe.get_doc("Quotation", quotation[0].name)
+            quotation = get_guest_cart(session_id)
         else:
             quotation = _get_cart_quotation()
 
-        if not quotation.coupon_code:
+        # Carts still in Redis have no coupon
+        if not quotation or not quotation.coupon_code:
             frappe.throw(_("Coupon not present", frappe.ValidationError))
 
         quotation.additional_discount_percentage = None
@@ -1460,140 +1355,61 @@ def update_guest_cart(
     session_id, item_code, qty, with_items=None, additional_notes=None
 ):
     try:
-        default_customer = "Guest"
         empty_card = False
+        qty = flt(qty)
 
-        quotation = frappe.get_all(
-            "Quotation", filters={"custom_session_id": session_id, "docstatus": 0}, limit=1
-        )
-
-        if quotation:
-            # Fetch the existing quotation for the session
-            quotation = frappe.get_doc("Quotation", quotation[0].name)
-            qty = flt(qty)
-            if qty == 0:
-                quotation_items = quotation.get("items", {"item_code": ["!=", item_code]})
-                if quotation_items:
-                    quotation.set("items", quotation_items)
-                else:
-                    empty_card = True
-
-            else:
-                # Fetch minimum and maximum quantity limits
-                item_name, stock_uom, min_qty, max_qty = frappe.db.get_value(
-                    "Item", item_code, ["item_name", "stock_uom", "custom_minimum_cart_qty", "custom_maximum_cart_qty"]
-                )
-
-                # Default to 0 if the values are None
-                min_qty = min_qty or 0
-                max_qty = max_qty or 0
-
-                # Validate the requested quantity
-                if min_qty and qty < min_qty:
-                    frappe.throw(
-                        _("Minimum order quantity for {0} is {1} {2}.").format(
-                            item_name, min_qty, stock_uom
-                        )
-                    )
+        # Fetch the existing quotation for the session
+        quotation = get_guest_cart(session_id)
 
-                if max_qty and qty > max_qty:
-                    frappe.throw(
-                        _("Maximum order quantity for {0} is {1}.").format(
-                            item_name, max_qty
-                        )
-                    )
-                warehouse = frappe.get_cached_value(
-                    "Website Item", {"item_code": item_code}, "website_warehouse"
-                )
+        if not quotation:
+            # Guest carts live in Redis until checkout or login
+            warehouse = validate_cart_line(item_code, qty).warehouse if qty else None
+            cart = update_ephemeral_cart(
+                session_id,
+                [
+                    {
+                        "item_code": item_code,
+                        "qty": qty,
+                        "additional_notes": additional_notes,
+                        "warehouse": warehouse,
+                    }
+                ],
+            )
+            set_cart_count(cart["snapshot"] if cart else frappe._dict(total_qty=0))
 
-                # Verify projected qty (available_qty - reserved_qty)
-                projected_qty = frappe.get_cached_value(
-                    "Bin", {"item_code": item_code, "warehouse": warehouse}, "projected_qty"
-                )
+            frappe.local.response["http_status_code"] = HTTPStatus.OK
+            frappe.response["data"] = {"message": "Successfully updated the user's cart"}
+            return
 
-                if projected_qty:
-                    # Check if sufficient stock is available
-                    if projected_qty < qty:
-                        frappe.throw(
-                            _("Only {0} units of {1} are available in stock.").format(
-                                projected_qty, item_name
-                            )
-                        )
+        if qty == 0:
+            quotation_items = quotation.get("items", {"item_code": ["!=", item_code]})
+            if quotation_items:
+                quotation.set("items", quotation_items)
+            else:
+                empty_card = True
 
-                quotation_items = quotation.get("items", {"item_code": item_code})
-                if not quotation_items:
-                    quotation.append(
-                        "items",
-                        {
-                            "doctype": "Quotation Item",
-                            "item_code": item_code,
-                            "qty": qty,
-                            "additional_notes": additional_notes,
-                            "warehouse": warehouse,
-                        },
-                    )
-                else:
-                    quotation_items[0].qty = qty
-                    quotation_items[0].warehouse = warehouse
-                    quotation_items[0].additional_notes = additional_notes
         else:
-            # Fetch minimum and maximum quantity limits
-            item_name, stock_uom, min_qty, max_qty = frappe.db.get_value(
-                "Item", item_code, ["item_name", "stock_uom", "custom_minimum_cart_qty", "custom_maximum_cart_qty"]
-            )
+            # Validate quantity limits and live stock, and get the fulfilment warehouse
+            warehouse = validate_cart_line(item_code, qty).warehouse
 
-            # Default to 0 if the values are None
-            min_qty = min_qty or 0
-            max_qty = max_qty or 0
-
-            # Validate the requested quantity
-            if min_qty and qty < min_qty:
-                frappe.throw(
-                    _("Minimum order quantity for {0} is {1} {2}.").format(
-                        item_name, min_qty, stock_uom
-                    )
-                )
-
-            if max_qty and qty > max_qty:
-                frappe.throw(
-                    _("Maximum order quantity for {0} is {1}.").format(
-                        item_name, max_qty
-                    )
+            quotation_items = quotation.get("items", {"item_code": item_code})
+            if not quotation_items:
+                quotation.append(
+                    "items",
+                    {
+                        "doctype": "Quotation Item",
+                        "item_code": item_code,
+                        "qty": qty,
+                        "additional_notes": additional_notes,
+                        "warehouse": warehouse,
+                    },
                 )
-            # Create a new quotation for the session
-            company = frappe.db.get_single_value("Webshop Settings", "company")
-            quotation = frappe.get_doc(
-                {
-                    "doctype": "Quotation",
-                    "quotation_to": "Customer",  # You can change this to "Lead" if needed
-                    "party_name": default_customer,  # Associate with the default customer
-                    "transaction_date": frappe.utils.nowdate(),
-                    "custom_session_id": session_id,  # Custom field to track guest session
-                    "items": [],
-                    "company": company,
-                    "order_type": "Shopping Cart",
-                    "status": "Draft",
-                    "docstatus": 0,
-                }
-            )
-
-            # Add item to quotation
-            warehouse = frappe.get_cached_value(
-                "Website Item", {"item_code": item_code}, "website_warehouse"
-            )
-
-            # Append the item if not already added
-            quotation.append(
-                "items",
-                {
-                    "doctype": "Quotation Item",
-                    "item_code": item_code,
-                    "qty": flt(qty),
-                    "warehouse": warehouse,
-                },
-            )
+            else:
+                quotation_items[0].qty = qty
+                quotation_items[0].warehouse = warehouse
+                quotation_items[0].additional_notes = additional_notes
 
-        apply_cart_settings(quotation=quotation)
+        apply_cart_settings(quotation=quotation, changed_items=[item_code])
 
         quotation.flags.ignore_permissions = True
 
@@ -1633,6 +1449,141 @@ def update_guest_cart(
         frappe.response["data"] = {"error": "An unexpected error occurred"}
 
 
+def new_guest_cart(session_id, party_name=GUEST_CUSTOMER):
+    """Unsaved cart Quotation of a guest session"""
+    company = frappe.db.get_single_value("Webshop Settings", "company")
+    return frappe.get_doc(
+        {
+            "doctype": "Quotation",
+            "quotation_to": "Customer",  # You can change this to "Lead" if needed
+            "party_name": party_name,  # Associate with the default customer
+            "transaction_date": frappe.utils.nowdate(),
+            "custom_session_id": session_id,  # Custom field to track guest session
+            "items": [],
+            "company": company,
+            "order_type": "Shopping Cart",
+            "status": "Draft",
+            "docstatus": 0,
+        }
+    )
+
+
+@frappe.whitelist(allow_guest=True)
+def update_cart_items(items, session_id=None):
+    """
+    Apply several cart changes at once, to restore a cart, add a recipe or sync
+    an offline cart.
+
+    Args:
+        items (list | str): Changes as [{"item_code", "qty", "additional_notes"}],
+            a list or a JSON encoded list. A qty of 0 removes the item.
+        session_id (str, optional): Session of a guest cart.
+
+    Changes failing validation are skipped and reported in `errors`, the others
+    are applied and the cart is saved once.
+    """
+    try:
+        validate_auth_via_api_keys(
+            frappe.get_request_header("Authorization", str).split(" ")[1:]
+        )
+
+        # Check if the user is logged in
+        if frappe.local.session.user is None or frappe.session.user == "Guest":
+            if session_id is None:
+                frappe.throw("Should include session id for Guest user.")
+        if session_id:
+            frappe.set_user("Guest")
+
+        items = frappe.parse_json(items) or []
+        if not isinstance(items, list) or not items:
+            frappe.throw(_("items must be a non-empty list"), frappe.ValidationError)
+
+        if len(items) > MAX_CART_BATCH_SIZE:
+            frappe.throw(
+                _("At most {0} items can be updated at once").format(MAX_CART_BATCH_SIZE),
+                frappe.ValidationError,
+            )
+
+        changes, errors = validate_cart_changes(items)
+
+        if session_id:
+            quotation = get_guest_cart(session_id)
+        else:
+            quotation = _get_cart_quotation()
+
+        if not quotation:
+            # Guest carts live in Redis until checkout or login
+            if changes:
+                cart = update_ephemeral_cart(session_id, changes)
+                set_cart_count(cart["snapshot"] if cart else frappe._dict(total_qty=0))
+        else:
+            for change in changes:
+                quotation_items = quotation.get("items", {"item_code": change.item_code})
+                if not change.qty:
+                    if quotation_items:
+                        quotation.set(
+                            "items",
+                            quotation.get("items", {"item_code": ["!=", change.item_code]}),
+                        )
+                elif not quotation_items:
+                    quotation.append(
+                        "items",
+                        {
+                            "doctype": "Quotation Item",
+                            "item_code": change.item_code,
+                            "qty": change.qty,
+                            "additional_notes": change.additional_notes,
+                            "warehouse": change.warehouse,
+                        },
+                    )
+                else:
+                    quotation_items[0].qty = change.qty
+                    quotation_items[0].warehouse = change.warehouse
+                    quotation_items[0].additional_notes = change.additional_notes
+
+            # Save once, or delete the cart when the changes emptied it
+            if changes:
+                if quotation.get("items"):
+                    apply_cart_settings(
+                        quotation=quotation,
+                        changed_items=[change.item_code for change in changes],
+                    )
+                    quotation.flags.ignore_permissions = True
+                    quotation.payment_schedule = []
+                    quotation.save()
+                elif not quotation.is_new():
+                    quotation.flags.ignore_permissions = True
+                    quotation.delete()
+                    quotation = None
+
+                set_cart_count(quotation)
+
+        frappe.local.response["http_status_code"] = HTTPStatus.OK
+        frappe.response["data"] = {
+            "message": "Successfully updated the user's cart",
+            "updated_items": [change.item_code for change in changes],
+            "errors": errors,
+        }
+
+    except frappe.DoesNotExistError as e:
+        # Handle missing records
+        frappe.log_error(f"Record not found: {e}", "Cart Update Error")
+        frappe.local.response["http_status_code"] = HTTPStatus.NOT_FOUND
+        frappe.response["data"] = {"error": str(e)}
+
+    except frappe.ValidationError as e:
+        # Handle validation issues
+        frappe.log_error(f"Validation error: {e}", "Cart Update Error")
+        frappe.local.response["http_status_code"] = HTTPStatus.BAD_REQUEST
+        frappe.response["data"] = {"error": str(e)}
+
+    except Exception as e:
+        # Handle unexpected errors
+        frappe.log_error(f"Unexpected error: {e}", "Cart Update Error")
+        frappe.local.response["http_status_code"] = HTTPStatus.INTERNAL_SERVER_ERROR
+        frappe.response["data"] = {"error": "An unexpected error occurred"}
+
+
 def get_stripe_keys():
     stripe_settings = frappe.get_doc("Stripe Settings", "Stripe")
 
@@ -1687,14 +1638,8 @@ def place_order(payment_method, session_id=None):
 
         # Fetch or create the quotation (cart)
         if frappe.local.session.user is None or frappe.session.user == "Guest":
-            quotation = frappe.get_all(
-                "Quotation",
-                filters={"custom_session_id": session_id, "docstatus": 0},
-                limit=1,
-            )
-            if quotation:
-                quotation = frappe.get_doc("Quotation", quotation[0].name)
-            else:
+            quotation = get_guest_cart(session_id) or materialize_guest_cart(session_id)
+            if not quotation:
                 frappe.throw("Cart is empty!", frappe.ValidationError)
         else:
             quotation = _get_cart_quotation(party)
@@ -1718,6 +1663,9 @@ def place_order(payment_method, session_id=None):
         ):
             frappe.throw("Cart is not ready to place order", frappe.ValidationError)
 
+        # Check the cart is still in stock before taking the payment
+        validate_cart_items(quotation.get("items"))
+
         # Validate the amount with quotation's total amount
         quotation_total = float(quotation.rounded_total or quotation.grand_total)
 
@@ -1773,6 +1721,13 @@ def place_order(payment_method, session_id=None):
             saddress = frappe.get_doc("Address",quotation.shipping_address_name)
             if saddress:
                 if quotation.custom_delivery_method == "Home Delivery":
+                    # Make sure we deliver to the shipping address zip code
+                    if not get_zone_for_zip(saddress.get("pincode")):
+                        frappe.throw(
+                            f"Home delivery is not available for zip code {saddress.get('pincode')}.",
+                            frappe.ValidationError,
+                        )
+
                     shipping_address_string = ", ".join(
                         [
                             saddress.get("address_line1") or "",
@@ -2032,27 +1987,8 @@ def process_order_after_payment_success(quotation_name, payment_intent, payment_
         )
         sales_order.payment_schedule = []
 
-        if not cint(cart_settings.allow_items_not_in_stock):
-            for item in sales_order.get("items"):
-                item.warehouse = frappe.db.get_value(
-                    "Website Item", {"item_code": item.item_code}, "website_warehouse"
-                )
-                is_stock_item = frappe.db.get_value(
-                    "Item", item.item_code, "is_stock_item"
-                )
-
-                if is_stock_item:
-                    item_stock = get_web_item_qty_in_stock(
-                        item.item_code, "website_warehouse"
-                    )
-                    if not cint(item_stock.in_stock):
-                        throw(_("{0} Not in Stock").format(item.item_code))
-                    if item.qty > item_stock.stock_qty:
-                        throw(
-                            _("Only {0} in Stock for item {1}").format(
-                                item_stock.stock_qty, item.item_code
-                            )
-                        )
+        # Validate quantity limits and live stock, and set the fulfilment warehouse
+        validate_cart_items(sales_order.get("items"))
         # Adding Delivery Method, Delivery Date And Delivery Slots data
         sales_order.custom_delivery_method = quotation.custom_delivery_method
         if quotation.custom_delivery_slot:
@@ -2458,14 +2394,8 @@ def update_cart_details(cart, session_id=None,):
 
         # Fetch or create the quotation (cart)
         if frappe.local.session.user is None or frappe.session.user == "Guest":
-            quotation = frappe.get_all(
-                "Quotation",
-                filters={"custom_session_id": session_id, "docstatus": 0},
-                limit=1,
-            )
-            if quotation:
-                quotation = frappe.get_doc("Quotation", quotation[0].name)
-            else:
+            quotation = get_guest_cart(session_id) or materialize_guest_cart(session_id)
+            if not quotation:
                 frappe.throw("Cart is empty!", frappe.ValidationError)
         else:
             quotation = _get_cart_quotation(party)
@@ -2604,35 +2534,16 @@ def get_pickup_store():
         # Call the custom validation function for API keys
         validate_auth_via_api_keys(api_keys)
 
-        # Fetch warehouses where warehouse_type is 'Pickup Point'
-        pickup_points = frappe.get_all(
-            "Warehouse",
-            filters={"warehouse_type": "Pickup Point", "disabled": 0},
-            fields=[
-                "name",
-                "warehouse_name",
-                "address_line_1",
-                "address_line_2",
-                "city",
-                "state",
-                "pin",
-            ],
+        # Pickup points only change with their Warehouse, serve them from the response cache
+        entry = get_cached_payload(
+            "keno_store.cart_api.get_pickup_store", ["Warehouse"], get_pickup_points
         )
-
-        for pickup_point in pickup_points:
-            # Fetch working hours from the child table linked to the Warehouse
-            working_hours = frappe.get_all(
-                "Warehouse Working Hours",
-                filters={"parent": pickup_point.name},
-                fields=["day_of_week", "start_time", "end_time"],
-            )
-
-            # Add working hours to the warehouse
-            pickup_point["working_hours"] = working_hours
+        if is_not_modified(entry["etag"]):
+            return
 
         # Return the list of pickup points with working hours
         frappe.local.response["http_status_code"] = HTTPStatus.OK
-        frappe.response["data"] = {"status": "success", "pickup_points": pickup_points}
+        frappe.response["data"] = {"status": "success", "pickup_points": entry["payload"]}
 
     except frappe.AuthenticationError as e:
         # Handle authentication errors (invalid/missing API keys)
@@ -2654,6 +2565,43 @@ def get_pickup_store():
         }
 
 
+def get_pickup_points():
+    """Return the enabled Pickup Point warehouses with their working hours."""
+    pickup_points = frappe.get_all(
+        "Warehouse",
+        filters={"warehouse_type": "Pickup Point", "disabled": 0},
+        fields=[
+            "name",
+            "warehouse_name",
+            "address_line_1",
+            "address_line_2",
+            "city",
+            "state",
+            "pin",
+        ],
+    )
+    if not pickup_points:
+        return pickup_points
+
+    # Fetch working hours of all pickup points at once
+    working_hours = {}
+    for row in frappe.get_all(
+        "Warehouse Working Hours",
+        filters={
+            "parent": ["in", [pickup_point.name for pickup_point in pickup_points]],
+            "parenttype": "Warehouse",
+        },
+        fields=["parent", "day_of_week", "start_time", "end_time"],
+        order_by="idx",
+    ):
+        working_hours.setdefault(row.pop("parent"), []).append(row)
+
+    for pickup_point in pickup_points:
+        pickup_point["working_hours"] = working_hours.get(pickup_point.name, [])
+
+    return pickup_points
+
+
 @frappe.whitelist(allow_guest=True, methods="GET")
 def get_delivery_slot(delivery_type=None):
     try:
@@ -2757,40 +2705,24 @@ def fetch_cart(session_id=None):
         # Get the party (customer)
         party = get_party()
 
-        # Fetch or create the quotation (cart)
-
+        # Find the cart, its items are read from the cart snapshot
+        cart = None
         if frappe.local.session.user is None or frappe.session.user == "Guest":
-            quotation = frappe.get_all(
-                "Quotation",
-                filters={"custom_session_id": session_id, "docstatus": 0},
-                limit=1,
-            )
-            if quotation:
-                quotation = frappe.get_doc("Quotation", quotation[0].name)
-            else:
-                # frappe.throw("Cart is emplty!!")
-                # Create a new quotation for the session
-                company = frappe.db.get_single_value("Webshop Settings", "company")
-                quotation = frappe.get_doc(
-                    {
-                        "doctype": "Quotation",
-                        "quotation_to": "Customer",  # You can change this to "Lead" if needed
-                        "party_name": "Guest",  # Associate with the default customer
-                        "transaction_date": frappe.utils.nowdate(),
-                        "custom_session_id": session_id,  # Custom field to track guest session
-                        "items": [],
-                        "company": company,
-                        "order_type": "Shopping Cart",
-                        "status": "Draft",
-                        "docstatus": 0,
-                    }
-                )
+            quotation_name = get_guest_cart_name(session_id)
+            if not quotation_name:
+                # Guest carts live in Redis until checkout or login
+                cart = (get_ephemeral_cart(session_id) or {}).get("snapshot")
         else:
-            quotation = _get_cart_quotation(party)
+            quotation_name = get_cart_quotation_name(party)
+
+        # No cart yet, it is created when the first item is added
+        if quotation_name:
+            cart = get_cart_snapshot(quotation_name)
+        cart_items = cart["items"] if cart else []
 
         # Prepare the response data
         cart_response = []
-        for cart_item in quotation.items:
+        for cart_item in cart_items:
             # item_details = frappe.get_doc("Item", cart_item.item_code)
             formatted_item = {
                 "_id": cart_item.item_code,
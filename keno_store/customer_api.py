@@ -2,9 +2,15 @@ from http import HTTPStatus
 import frappe
 from frappe import _
 from frappe.auth import validate_auth_via_api_keys
-from frappe.utils.data import cint
+from frappe.utils.data import cint, flt
 from frappe.utils.file_manager import save_file
 from keno_store.cart_api import _get_cart_quotation, apply_cart_settings, set_cart_count
+from keno_store.keno_store.cart_validation import (
+    get_cart_item_limits,
+    get_cart_line_error,
+    is_stock_checked,
+)
+from keno_store.utils import encode_cursor, get_cursor_filters
 from webshop.webshop.doctype.item_review.item_review import get_customer
 
 
@@ -443,11 +449,14 @@ def manage_customer_profile(profile=None):
 
 
 @frappe.whitelist(allow_guest=True, methods=["GET"])
-def get_customer_past_orders(page=1, page_size=10):
+def get_customer_past_orders(page=1, page_size=10, cursor=None):
     """
     Custom API to get the logged-in customer's past orders.
     Returns details such as order ID, date, status, and total amount.
     Includes exception handling for various scenarios.
+
+    Pages are selected with `page`, or with `cursor` (the `next_cursor` of the
+    previous page) which skips counting the orders.
     """
     try:
         # Validate API key authorization
@@ -492,18 +501,31 @@ def get_customer_past_orders(page=1, page_size=10):
         offset = (page - 1) * page_size
         limit = page_size
 
-        # Fetch past orders for the customer
+        filters = [
+            ["customer", "=", customer["name"]],
+            ["docstatus", "=", 1],  # Assuming docstatus=1 means completed orders
+        ]
+        or_filters = None
+        if cursor:
+            # Continue after the last order of the previous page
+            cursor_filters, or_filters = get_cursor_filters(cursor, "transaction_date")
+            filters += cursor_filters
+            offset = 0
+
+        # Fetch past orders for the customer, with one extra to know whether there is a next page
         orders = frappe.get_all(
             "Sales Order",
-            filters={
-                "customer": customer["name"],
-                "docstatus": 1,
-            },  # Assuming docstatus=1 means completed orders
+            filters=filters,
+            or_filters=or_filters,
             fields=["name", "transaction_date", "status", "grand_total"],
-            order_by="transaction_date desc",
+            order_by="transaction_date desc, name desc",
             limit_start=offset,
-            limit_page_length=limit,
+            limit_page_length=limit + 1,
         )
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            next_cursor = encode_cursor(orders[-1].transaction_date, orders[-1].name)
 
         # Prepare orders data
         # order_data = [
@@ -572,21 +594,24 @@ def get_customer_past_orders(page=1, page_size=10):
 
         #     orders_data.append(order_data)
 
-        # Check if there are more pages
-        total_orders = frappe.db.count(
-            "Sales Order", filters={"customer": customer["name"]}
-        )
-        total_pages = (total_orders + page_size - 1) // page_size  # Ceiling division
+        # Check if there are more pages, cursor pages skip the count
+        total_orders, total_pages = None, None
+        if not cursor:
+            total_orders = frappe.db.count(
+                "Sales Order", filters={"customer": customer["name"]}
+            )
+            total_pages = (total_orders + page_size - 1) // page_size  # Ceiling division
 
         # Return orders data
         frappe.response["data"] = {
             "status": "success",
             "orders": order_data,
             "pagination": {
-                "current_page": page,
+                "current_page": None if cursor else page,
                 "page_size": page_size,
                 "total_orders": total_orders,
                 "total_pages": total_pages,
+                "next_cursor": next_cursor,
             },
         }
 
@@ -1170,29 +1195,21 @@ def reorder_quotation(order_id=None):
         # Track unavailable items
         unavailable_items = []
 
+        # Quantity limits, fulfilment warehouse and live stock of all the items
+        item_limits = get_cart_item_limits([item.item_code for item in sales_order.items])
+        check_stock = is_stock_checked()
+
         # Loop through each item from the previous Sales Order
         for item in sales_order.items:
             try:
-                # Step 1: Check if the item is available (not disabled)
-                item_status = frappe.db.get_value(
-                    "Item", {"item_code": item.item_code}, ["disabled", "is_stock_item"]
-                )
-                if item_status and item_status[0] == 1:
-                    unavailable_items.append(f"Item '{item.item_code}' is disabled.")
+                # Check the item is available, within its limits and in stock
+                limits = item_limits.get(item.item_code)
+                error = get_cart_line_error(item.item_code, flt(item.qty), limits, check_stock)
+                if error:
+                    unavailable_items.append(error)
                     continue  # Skip to the next item
 
-                # Step 2: Check stock availability for stock items
-                if item_status and item_status[1] == 1:  # If the item is a stock item
-                    available_qty = frappe.db.get_value(
-                        "Bin",
-                        {"item_code": item.item_code, "warehouse": item.warehouse},
-                        "projected_qty",
-                    )
-                    if available_qty < item.qty:
-                        unavailable_items.append(
-                            f"Item '{item.item_code}' is out of stock. Available: {available_qty}, Required: {item.qty}."
-                        )
-                        continue  # Skip to the next item
+                warehouse = limits.warehouse or item.warehouse
 
                 # # Step 3: Apply Pricing Rule (if any)
                 # price_list_rate = get_pricing_rule(item.item_code, quotation.party_name, quotation.transaction_date, item.qty, quotation.currency)
@@ -1206,12 +1223,12 @@ def reorder_quotation(order_id=None):
                             "item_code": item.item_code,
                             "qty": item.qty,
                             "additional_notes": item.additional_notes,
-                            "warehouse": item.warehouse,
+                            "warehouse": warehouse,
                         },
                     )
                 else:
                     quotation_items[0].qty = item.qty
-                    quotation_items[0].warehouse = item.warehouse
+                    quotation_items[0].warehouse = warehouse
                     quotation_items[0].additional_notes = item.additional_notes
 
             except Exception as item_error:
@@ -2,6 +2,7 @@ from http import HTTPStatus
 import frappe
 from frappe import _
 from frappe.auth import validate_auth_via_api_keys
+from keno_store.utils import encode_cursor, get_cursor_filters
 
 @frappe.whitelist(allow_guest=True, methods=["POST"])
 def confirmOrder(delivery_note_id=None, order_id=None, liveLocation=None):
@@ -191,7 +192,7 @@ def updateOrderStatus(delivery_note_id, order_id, status, deliveryPersonLocation
 
 
 @frappe.whitelist(allow_guest=True, methods=["GET"])
-def getOrders(status=None, deliveryPartner=None, page=1, page_size=10):
+def getOrders(status=None, deliveryPartner=None, page=1, page_size=10, cursor=None):
     try:
         # Validate API key authorization
         validate_auth_via_api_keys(
@@ -222,56 +223,56 @@ def getOrders(status=None, deliveryPartner=None, page=1, page_size=10):
         total_delivery_notes = 0
         delivery_notes = []
 
+        filters = None
         if status == 'Ready for Pickup' or status == 'available':
             # Fetch Delivery Notes filtered by custom_delivery_status
-            delivery_notes = frappe.get_all(
-                "Delivery Note",
-                filters={"custom_delivery_status": 'Ready for Pickup', "custom_delivery_method": "Home Delivery", "docstatus":0},
-                fields=["name", "posting_date", "customer", "custom_delivery_status as status", "grand_total", "shipping_address_name"],
-                limit_start=offset,
-                limit_page_length=limit
-            )
-            # Check if there are more pages
-            total_delivery_notes = frappe.db.count(
-                "Delivery Note", filters={"custom_delivery_status": status, "docstatus":0}
-            )
+            filters = {"custom_delivery_status": 'Ready for Pickup', "custom_delivery_method": "Home Delivery", "docstatus":0}
+            count_filters = {"custom_delivery_status": status, "docstatus":0}
         elif status != 'Ready for Pickup' and deliveryPartner:
             supplier = get_transporter_supplier_by_user(deliveryPartner)
             if supplier:
                 if status == 'Delivered':
-                    delivery_notes = frappe.get_all(
-                        "Delivery Note",
-                        # filters={"custom_delivery_status": status, "transporter": supplier.name, "docstatus":0},
-                        filters={"custom_delivery_status": status, "transporter": deliveryPartner, "custom_delivery_method": "Home Delivery", "docstatus":1},
-                        fields=["name", "posting_date", "customer", "custom_delivery_status as status", "grand_total", "shipping_address_name"],
-                        limit_start=offset,
-                        limit_page_length=limit
-                    )
+                    # filters={"custom_delivery_status": status, "transporter": supplier.name, "docstatus":0},
+                    filters = {"custom_delivery_status": status, "transporter": deliveryPartner, "custom_delivery_method": "Home Delivery", "docstatus":1}
                 elif status != '*':
-                    delivery_notes = frappe.get_all(
-                        "Delivery Note",
-                        # filters={"custom_delivery_status": status, "transporter": supplier.name, "docstatus":0},
-                        filters={"custom_delivery_status": status, "transporter": deliveryPartner, "custom_delivery_method":"Home Delivery", "docstatus":0},
-                        fields=["name", "posting_date", "customer", "custom_delivery_status as status", "grand_total", "shipping_address_name"],
-                        limit_start=offset,
-                        limit_page_length=limit
-                    )
+                    # filters={"custom_delivery_status": status, "transporter": supplier.name, "docstatus":0},
+                    filters = {"custom_delivery_status": status, "transporter": deliveryPartner, "custom_delivery_method":"Home Delivery", "docstatus":0}
                 else:
-                    delivery_notes = frappe.get_all(
-                        "Delivery Note",
-                        # filters={"custom_delivery_status": status, "transporter": supplier.name, "docstatus":0},
-                        filters={
-                            "custom_delivery_status": ["not in", "Delivered"],
-                            # "custom_delivery_status": status, 
-                            "transporter": deliveryPartner, "docstatus":0},
-                        fields=["name", "posting_date", "customer", "custom_delivery_status as status", "grand_total", "shipping_address_name"],
-                        limit_start=offset,
-                        limit_page_length=limit
-                    )
-                # Check if there are more pages
-                total_delivery_notes = frappe.db.count(
-                    "Delivery Note", filters={"custom_delivery_status": status, "transporter": supplier.name, "docstatus":0}
-                )
+                    filters = {
+                        "custom_delivery_status": ["not in", "Delivered"],
+                        # "custom_delivery_status": status, 
+                        "transporter": deliveryPartner, "docstatus":0}
+                count_filters = {"custom_delivery_status": status, "transporter": supplier.name, "docstatus":0}
+
+        next_cursor = None
+        if filters:
+            or_filters = None
+            if cursor:
+                # Continue after the last delivery note of the previous page
+                cursor_filters, or_filters = get_cursor_filters(cursor, "creation")
+                filters.update({field: [operator, value] for field, operator, value in cursor_filters})
+                offset = 0
+
+            # Fetch one extra delivery note to know whether there is a next page
+            delivery_notes = frappe.get_all(
+                "Delivery Note",
+                filters=filters,
+                or_filters=or_filters,
+                fields=["name", "creation", "posting_date", "customer", "custom_delivery_status as status", "grand_total", "shipping_address_name"],
+                order_by="creation desc, name desc",
+                limit_start=offset,
+                limit_page_length=limit + 1
+            )
+            if len(delivery_notes) > limit:
+                delivery_notes = delivery_notes[:limit]
+                next_cursor = encode_cursor(delivery_notes[-1].creation, delivery_notes[-1].name)
+            for note in delivery_notes:
+                note.pop("creation")
+
+            # Check if there are more pages, cursor pages skip the count
+            if not cursor:
+                total_delivery_notes = frappe.db.count("Delivery Note", filters=count_filters)
+
         # Loop through each delivery note to fetch the linked sales order
         for note in delivery_notes:
             # Fetch the linked Sales Order using the 'against_sales_order' field from Delivery Note Item
@@ -314,16 +315,19 @@ def getOrders(status=None, deliveryPartner=None, page=1, page_size=10):
                 for item in order_doc.items
             ])
 
-        total_pages = (total_delivery_notes + page_size - 1) // page_size  # Ceiling division
+        total_pages = None
+        if not cursor:
+            total_pages = (total_delivery_notes + page_size - 1) // page_size  # Ceiling division
 
         frappe.response["data"] = {
             "status": "success",
             "delivery_notes": delivery_notes,
             "pagination": {
-                "current_page": page,
+                "current_page": None if cursor else page,
                 "page_size": page_size,
-                "total_orders": total_delivery_notes,
+                "total_orders": None if cursor else total_delivery_notes,
                 "total_pages": total_pages,
+                "next_cursor": next_cursor,
             }
         }
 
@@ -68,7 +68,8 @@ app_license = "mit"
 # ------------
 
 # before_install = "keno_store.install.before_install"
-# after_install = "keno_store.install.after_install"
+after_install = "keno_store.install.after_install"
+after_migrate = "keno_store.install.after_migrate"
 
 # Uninstallation
 # ------------
@@ -133,6 +134,12 @@ app_license = "mit"
 # Scheduled Tasks
 # ---------------
 
+scheduler_events = {
+    "daily": [
+        "keno_store.keno_store.pricing_rule_index.rebuild_pricing_rule_memberships",
+    ],
+}
+
 # scheduler_events = {
 # 	"all": [
 # 		"keno_store.tasks.all"
@@ -238,7 +245,133 @@ doc_events = {
     },
     "Quotation": {
         "validate": "keno_store.keno_store.coupon_validation.validate_coupon_on_cart_update",
-    }
+        "after_insert": "keno_store.keno_store.quotation.on_quotation_insert",
+        "on_update": "keno_store.keno_store.quotation.on_quotation_update",
+        "on_submit": "keno_store.keno_store.quotation.on_quotation_close",
+        "on_cancel": "keno_store.keno_store.quotation.on_quotation_close",
+        "on_trash": "keno_store.keno_store.quotation.on_quotation_close",
+    },
+    "Address": {
+        "on_update": "keno_store.keno_store.quotation.on_address_update",
+        "on_trash": "keno_store.keno_store.quotation.on_address_update",
+    },
+    "Coupon Code": {
+        "on_update": "keno_store.keno_store.quotation.on_coupon_code_update",
+        "on_trash": "keno_store.keno_store.quotation.on_coupon_code_update",
+    },
+    "Item Review": {
+        "after_insert": "keno_store.keno_store.item_review.on_item_review_insert",
+        "on_update": [
+            "keno_store.keno_store.item_review.on_item_review_update",
+            "keno_store.keno_store.item_detail.on_item_update",
+        ],
+        "after_delete": [
+            "keno_store.keno_store.item_review.on_item_review_delete",
+            "keno_store.keno_store.item_detail.on_item_update",
+        ],
+    },
+    "Item Price": {
+        "on_update": "keno_store.keno_store.catalog.clear_price_snapshot",
+        "on_trash": "keno_store.keno_store.catalog.clear_price_snapshot",
+    },
+    "Pricing Rule": {
+        "on_update": [
+            "keno_store.keno_store.catalog.clear_price_snapshot",
+            "keno_store.keno_store.pricing_rule_index.on_pricing_rule_update",
+        ],
+        "on_trash": [
+            "keno_store.keno_store.catalog.clear_price_snapshot",
+            "keno_store.keno_store.pricing_rule_index.on_pricing_rule_trash",
+        ],
+    },
+    "Promotional Scheme": {
+        "on_update": [
+            "keno_store.keno_store.catalog.clear_price_snapshot",
+            "keno_store.keno_store.pricing_rule_index.on_promotional_scheme_update",
+        ],
+        "on_trash": [
+            "keno_store.keno_store.catalog.clear_price_snapshot",
+            "keno_store.keno_store.pricing_rule_index.on_promotional_scheme_trash",
+        ],
+    },
+    "Website Item": {
+        "validate": "keno_store.keno_store.item_detail.set_specification_values",
+        "on_update": [
+            "keno_store.keno_store.product_search.on_website_item_update",
+            "keno_store.keno_store.item_detail.on_item_update",
+            "keno_store.keno_store.response_cache.clear_doctype_tag",
+        ],
+        "on_trash": [
+            "keno_store.keno_store.product_search.on_website_item_trash",
+            "keno_store.keno_store.item_detail.on_item_update",
+            "keno_store.keno_store.response_cache.clear_doctype_tag",
+        ],
+    },
+    "Item": {
+        "on_update": [
+            "keno_store.keno_store.product_search.on_item_update",
+            "keno_store.keno_store.pricing_rule_index.on_item_update",
+            "keno_store.keno_store.item_detail.on_item_update",
+        ],
+        "on_trash": [
+            "keno_store.keno_store.product_search.on_item_trash",
+            "keno_store.keno_store.pricing_rule_index.on_item_trash",
+            "keno_store.keno_store.item_detail.on_item_update",
+        ],
+    },
+    "Item Group": {
+        "on_update": "keno_store.keno_store.response_cache.clear_doctype_tag",
+        "on_trash": "keno_store.keno_store.response_cache.clear_doctype_tag",
+        "after_rename": "keno_store.keno_store.response_cache.clear_doctype_tag",
+    },
+    "Website Slideshow": {
+        "on_update": [
+            "keno_store.keno_store.response_cache.clear_doctype_tag",
+            "keno_store.keno_store.item_detail.on_website_slideshow_update",
+        ],
+        "on_trash": [
+            "keno_store.keno_store.response_cache.clear_doctype_tag",
+            "keno_store.keno_store.item_detail.on_website_slideshow_update",
+        ],
+        "after_rename": "keno_store.keno_store.response_cache.clear_doctype_tag",
+    },
+    "Warehouse": {
+        "on_update": "keno_store.keno_store.response_cache.clear_doctype_tag",
+        "on_trash": "keno_store.keno_store.response_cache.clear_doctype_tag",
+        "after_rename": "keno_store.keno_store.response_cache.clear_doctype_tag",
+    },
+    "Sales Invoice": {
+        "on_submit": "keno_store.keno_store.sales_rollup.on_sales_invoice_submit",
+        "on_cancel": "keno_store.keno_store.sales_rollup.on_sales_invoice_cancel",
+    },
+    "Sales Taxes and Charges Template": {
+        "on_update": "keno_store.keno_store.cart_charges.clear_cart_charges",
+        "on_trash": "keno_store.keno_store.cart_charges.clear_cart_charges",
+        "after_rename": "keno_store.keno_store.cart_charges.clear_cart_charges",
+    },
+    "Tax Rule": {
+        "on_update": "keno_store.keno_store.cart_charges.clear_cart_charges",
+        "on_trash": "keno_store.keno_store.cart_charges.clear_cart_charges",
+    },
+    "Shipping Rule": {
+        "on_update": "keno_store.keno_store.cart_charges.clear_cart_charges",
+        "on_trash": "keno_store.keno_store.cart_charges.clear_cart_charges",
+        "after_rename": "keno_store.keno_store.cart_charges.clear_cart_charges",
+    },
+    "Contact": {
+        "on_update": "keno_store.keno_store.party.on_contact_update",
+        "on_trash": "keno_store.keno_store.party.on_contact_update",
+    },
+    "Customer": {
+        "on_update": "keno_store.keno_store.party.on_customer_update",
+        "on_trash": "keno_store.keno_store.party.on_customer_update",
+        "after_rename": "keno_store.keno_store.party.on_customer_update",
+    },
+    "Customer Group": {
+        "on_update": "keno_store.keno_store.party.on_customer_group_update",
+        "on_trash": "keno_store.keno_store.party.on_customer_group_update",
+        "after_rename": "keno_store.keno_store.party.on_customer_group_update",
+    },
 }
 
 
@@ -0,0 +1,31 @@
+from frappe.custom.doctype.custom_field.custom_field import create_custom_fields
+
+from keno_store.keno_store.item_detail import SPEC_VALUE_FIELD
+
+
+def after_install():
+    make_custom_fields()
+
+
+def after_migrate():
+    make_custom_fields()
+
+
+def make_custom_fields():
+    """Custom fields the app's code reads, created on install and kept in sync on migrate."""
+    create_custom_fields(
+        {
+            "Item Website Specification": [
+                # Plain text of the specification, so product pages do not parse HTML
+                {
+                    "fieldname": SPEC_VALUE_FIELD,
+                    "label": "Value Text",
+                    "fieldtype": "Small Text",
+                    "insert_after": "description",
+                    "read_only": 1,
+                    "hidden": 1,
+                }
+            ]
+        },
+        update=True,
+    )
@@ -0,0 +1,124 @@
+import hashlib
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import nowdate
+
+CART_CHARGES_KEY = "keno_store:cart_charges"
+# Memo hashes are per day, tax keys carry the date so older days are never read again
+CART_CHARGES_TTL = 2 * 24 * 60 * 60
+
+# Address fields Tax Rules can match on, zip code included
+TERRITORY_FIELDS = ("city", "county", "state", "pincode", "country")
+
+STORE_PICKUP_RULE = "Store Pickup"
+EXPRESS_DELIVERY_RULE = "Express Delivery"
+STANDARD_DELIVERY_RULE = "Standard Delivery"
+
+
+def get_cart_tax_template(quotation, customer_group):
+    """
+    Return the Sales Taxes and Charges Template of a cart, memoized per
+    customer group, tax category, billing and shipping territory and date.
+
+    The customer is part of the key only when some Tax Rule is customer specific.
+    """
+    territories = get_address_territories(
+        [quotation.customer_address, quotation.shipping_address_name]
+    )
+    key = get_memo_key(
+        "tax",
+        quotation.company,
+        customer_group,
+        quotation.tax_category,
+        territories.get(quotation.customer_address),
+        territories.get(quotation.shipping_address_name),
+        str(quotation.transaction_date),
+        quotation.party_name if has_customer_tax_rules() else None,
+    )
+
+    def resolve():
+        from erpnext.accounts.party import set_taxes
+
+        return set_taxes(
+            quotation.party_name,
+            "Customer",
+            quotation.transaction_date,
+            quotation.company,
+            customer_group=customer_group,
+            supplier_group=None,
+            tax_category=quotation.tax_category,
+            billing_address=quotation.customer_address,
+            shipping_address=quotation.shipping_address_name,
+            use_for_shopping_cart=1,
+        )
+
+    return get_memoized(key, resolve)
+
+
+def get_delivery_shipping_rule(delivery_method, delivery_type=None):
+    """Return the Shipping Rule of a delivery method and type, memoized."""
+    if delivery_method == "Store Pickup":
+        shipping_rule = STORE_PICKUP_RULE
+    elif delivery_type == "Express Delivery":
+        shipping_rule = EXPRESS_DELIVERY_RULE
+    else:
+        shipping_rule = STANDARD_DELIVERY_RULE
+
+    key = get_memo_key("shipping_rule", delivery_method, delivery_type)
+    name = get_memoized(key, lambda: frappe.db.exists("Shipping Rule", shipping_rule))
+    if not name:
+        frappe.throw(
+            _("{0} shipping rule does not exist.").format(shipping_rule),
+            frappe.DoesNotExistError,
+        )
+
+    return name
+
+
+def get_address_territories(address_names):
+    """Return {address name: (city, county, state, pincode, country)} in one query."""
+    address_names = list({name for name in address_names if name})
+    if not address_names:
+        return {}
+
+    addresses = frappe.get_all(
+        "Address",
+        filters={"name": ["in", address_names]},
+        fields=["name", *TERRITORY_FIELDS],
+    )
+    return {
+        address.name: tuple(address[field] or "" for field in TERRITORY_FIELDS)
+        for address in addresses
+    }
+
+
+def has_customer_tax_rules():
+    return get_memoized(
+        get_memo_key("customer_tax_rules"),
+        lambda: bool(frappe.db.exists("Tax Rule", {"customer": ["is", "set"]})),
+    )
+
+
+def get_memo_key(*parts):
+    content = json.dumps(parts, default=str, separators=(",", ":"))
+    return f"{parts[0]}:{hashlib.sha256(content.encode()).hexdigest()[:16]}"
+
+
+def get_memoized(key, resolve):
+    """Read a resolved value from the memo hash of the day, None results are memoized too."""
+    cache = frappe.cache()
+    memo_key = f"{CART_CHARGES_KEY}:{nowdate()}"
+    entry = cache.hget(memo_key, key)
+    if entry is None:
+        entry = {"value": resolve()}
+        cache.hset(memo_key, key, entry)
+        cache.expire(cache.make_key(memo_key), CART_CHARGES_TTL)
+
+    return entry["value"]
+
+
+def clear_cart_charges(doc=None, method=None, *args):
+    """Sales Taxes and Charges Template, Tax Rule and Shipping Rule hook."""
+    frappe.cache().delete_keys(f"{CART_CHARGES_KEY}:")
@@ -0,0 +1,147 @@
+import frappe
+from frappe import _
+from frappe.utils import cint, flt
+
+
+def get_cart_item_limits(item_codes):
+    """
+    Return {item_code: limits} for the given items: cart quantity limits,
+    fulfilment warehouse (the Website Item warehouse) and its live projected
+    qty, in one query.
+    """
+    item_codes = list({item_code for item_code in item_codes if item_code})
+    if not item_codes:
+        return {}
+
+    rows = frappe.db.sql(
+        """
+        SELECT
+            item.name AS item_code,
+            item.item_name,
+            item.stock_uom,
+            item.disabled,
+            item.is_stock_item,
+            item.custom_minimum_cart_qty AS minimum_qty,
+            item.custom_maximum_cart_qty AS maximum_qty,
+            wi.website_warehouse AS warehouse,
+            bin.projected_qty
+        FROM `tabItem` item
+        LEFT JOIN `tabWebsite Item` wi ON wi.item_code = item.name
+        LEFT JOIN `tabBin` bin
+            ON bin.item_code = item.name AND bin.warehouse = wi.website_warehouse
+        WHERE item.name IN %(item_codes)s
+        """,
+        {"item_codes": item_codes},
+        as_dict=True,
+    )
+    return {row.item_code: row for row in rows}
+
+
+def get_cart_line_error(item_code, qty, limits, check_stock=True):
+    """Return why `qty` of an item cannot be in the cart, None when it can."""
+    if not limits:
+        return _("Item {0} not found.").format(item_code)
+
+    if limits.disabled:
+        return _("Item {0} is disabled.").format(limits.item_name)
+
+    if limits.minimum_qty and qty < limits.minimum_qty:
+        return _("Minimum order quantity for {0} is {1} {2}.").format(
+            limits.item_name, limits.minimum_qty, limits.stock_uom
+        )
+
+    if limits.maximum_qty and qty > limits.maximum_qty:
+        return _("Maximum order quantity for {0} is {1} {2}.").format(
+            limits.item_name, limits.maximum_qty, limits.stock_uom
+        )
+
+    # Projected qty is the available qty minus the reserved qty
+    if check_stock and limits.is_stock_item and flt(limits.projected_qty) < qty:
+        return _("Only {0} units of {1} are available in stock.").format(
+            max(flt(limits.projected_qty), 0), limits.item_name
+        )
+
+
+def is_stock_checked():
+    return not cint(frappe.get_cached_doc("Webshop Settings").allow_items_not_in_stock)
+
+
+def validate_cart_line(item_code, qty):
+    """
+    Validate the new qty of a cart line, raise a ValidationError when it is
+    not allowed.
+
+    Returns the limits of the item, with its fulfilment warehouse.
+    """
+    limits = get_cart_item_limits([item_code]).get(item_code)
+    if not limits:
+        frappe.throw(_("Item {0} not found.").format(item_code), frappe.DoesNotExistError)
+
+    error = get_cart_line_error(item_code, flt(qty), limits, is_stock_checked())
+    if error:
+        frappe.throw(error, frappe.ValidationError)
+
+    return limits
+
+
+def validate_cart_items(items):
+    """
+    Validate all the lines of a cart or order before checkout, and set their
+    fulfilment warehouse. Raise a ValidationError on the first invalid line.
+    """
+    limits = get_cart_item_limits([item.item_code for item in items])
+    check_stock = is_stock_checked()
+
+    for item in items:
+        item_limits = limits.get(item.item_code)
+        error = get_cart_line_error(item.item_code, flt(item.qty), item_limits, check_stock)
+        if error:
+            frappe.throw(error, frappe.ValidationError)
+
+        item.warehouse = item_limits.warehouse or item.warehouse
+
+
+def validate_cart_changes(lines):
+    """
+    Validate a batch of cart changes against the limits of their items.
+
+    Returns the valid changes, the last one of each item, with the fulfilment
+    warehouse of the item, and the rejected ones as [{"item_code", "error"}].
+    """
+    changes, errors = {}, []
+    for line in lines:
+        line = frappe._dict(line) if isinstance(line, dict) else frappe._dict()
+        if not line.item_code:
+            errors.append({"item_code": None, "error": _("Item code is required.")})
+            continue
+
+        qty = flt(line.qty)
+        if qty < 0:
+            errors.append(
+                {"item_code": line.item_code, "error": _("Quantity cannot be negative.")}
+            )
+            continue
+
+        changes[line.item_code] = frappe._dict(
+            item_code=line.item_code, qty=qty, additional_notes=line.additional_notes
+        )
+
+    limits = get_cart_item_limits(list(changes))
+    check_stock = is_stock_checked()
+
+    valid_changes = []
+    for change in changes.values():
+        item_limits = limits.get(change.item_code)
+        change.warehouse = item_limits.warehouse if item_limits else None
+
+        # Removing an item needs no validation
+        error = None
+        if change.qty:
+            error = get_cart_line_error(change.item_code, change.qty, item_limits, check_stock)
+
+        if error:
+            errors.append({"item_code": change.item_code, "error": error})
+        else:
+            valid_changes.append(change)
+
+    return valid_changes, errors
@@ -0,0 +1,218 @@
+import pickle
+
+import frappe
+from frappe.utils import flt, nowdate
+from erpnext.utilities.product import get_price
+from webshop.webshop.doctype.webshop_settings.webshop_settings import (
+    get_shopping_cart_settings,
+)
+from webshop.webshop.shopping_cart.cart import _set_price_list
+
+PRICE_SNAPSHOT_KEY = "keno_store:price_snapshot"
+# Snapshots are keyed by date, so they only need to outlive the day
+PRICE_SNAPSHOT_TTL = 24 * 60 * 60
+
+
+def enrich_items(items, price=True, stock=True):
+    """
+    Adds price, stock, rating and cart quantity limits to listing items.
+
+    Every lookup is done in bulk for the whole page, so the number of queries
+    does not grow with the number of items.
+
+    Args:
+        items (list): Website Item rows (dicts) having an `item_code` key.
+        price (bool): Set to False when the rows already carry pricing.
+        stock (bool): Set to False when the rows already carry stock details.
+
+    Returns:
+        list: The same list, updated in place.
+    """
+    item_codes = list({item.get("item_code") for item in items if item.get("item_code")})
+    if not item_codes:
+        return items
+
+    qty_limits = get_qty_limits_map(item_codes)
+    ratings = get_rating_map(item_codes)
+    stock_qty = get_stock_qty_map(item_codes) if stock else {}
+    prices = get_price_map(item_codes) if price else {}
+
+    for item in items:
+        item_code = item.get("item_code")
+        if not item_code:
+            continue
+
+        limits = qty_limits.get(item_code, {})
+        item["minimum_qty"] = limits.get("minimum_qty") or 0
+        item["maximum_qty"] = limits.get("maximum_qty") or 0
+        item["rating"] = ratings.get(item_code, 0)
+
+        if stock:
+            item["stock_qty"] = stock_qty.get(item_code, 0)
+
+        if item_code in prices:
+            item.update(prices[item_code])
+
+    return items
+
+
+def get_qty_limits_map(item_codes):
+    """Return {item_code: {"minimum_qty", "maximum_qty"}} for the given items."""
+    rows = frappe.get_all(
+        "Item",
+        filters={"name": ["in", item_codes]},
+        fields=[
+            "name",
+            "custom_minimum_cart_qty as minimum_qty",
+            "custom_maximum_cart_qty as maximum_qty",
+        ],
+    )
+    return {row.name: row for row in rows}
+
+
+def get_rating_map(item_codes):
+    """Return {item_code: average rating} rounded to one decimal place."""
+    rows = frappe.get_all(
+        "Item Rating Summary",
+        filters={"item": ["in", item_codes]},
+        fields=["item", "average_rating"],
+    )
+    return {row.item: round(flt(row.average_rating), 1) for row in rows}
+
+
+def get_stock_qty_map(item_codes):
+    """Return {item_code: projected qty} in the Website Item warehouse of each item."""
+    if not item_codes:
+        return {}
+
+    rows = frappe.db.sql(
+        """
+        SELECT wi.item_code, bin.projected_qty
+        FROM `tabWebsite Item` wi
+        INNER JOIN `tabBin` bin
+            ON bin.item_code = wi.item_code AND bin.warehouse = wi.website_warehouse
+        WHERE wi.item_code IN %(item_codes)s
+        """,
+        {"item_codes": list(item_codes)},
+        as_dict=True,
+    )
+    return {row.item_code: flt(row.projected_qty) for row in rows}
+
+
+def get_price_map(item_codes):
+    """
+    Return {item_code: price fields} for the given items.
+
+    Webshop settings and the selling price list are resolved once for the
+    whole batch. Prices are served from the price snapshot cache and only
+    computed for the items missing from it.
+    """
+    if not item_codes:
+        return {}
+
+    cart_settings = get_shopping_cart_settings()
+    selling_price_list = get_selling_price_list(cart_settings)
+    if not selling_price_list:
+        return {}
+
+    cache_key = get_price_snapshot_key(
+        selling_price_list, cart_settings.default_customer_group
+    )
+
+    prices = get_cached_prices(cache_key, item_codes)
+    for item_code in item_codes:
+        if item_code in prices:
+            continue
+
+        try:
+            price = get_price(
+                item_code,
+                selling_price_list,
+                cart_settings.default_customer_group,
+                cart_settings.company,
+            )
+        except Exception as e:
+            frappe.log_error(
+                message=f"Error fetching price for item {item_code}: {str(e)}",
+                title="Catalog Price Error",
+            )
+            continue
+
+        # Items without a price are cached as well, so they are not priced again
+        prices[item_code] = get_price_fields(price) if price else {}
+        frappe.cache().hset(cache_key, item_code, prices[item_code])
+
+    frappe.cache().expire(frappe.cache().make_key(cache_key), PRICE_SNAPSHOT_TTL)
+
+    return {item_code: price for item_code, price in prices.items() if price}
+
+
+def get_selling_price_list(cart_settings=None):
+    """Selling price list of the current user, None when prices are not shown to them."""
+    cart_settings = cart_settings or get_shopping_cart_settings()
+    if not cart_settings.enabled or not cart_settings.show_price:
+        return None
+
+    if frappe.session.user == "Guest" and cart_settings.hide_price_for_guest:
+        return None
+
+    return _set_price_list(cart_settings, None)
+
+
+def get_price_snapshot_key(price_list, customer_group):
+    """
+    Cache key of the price snapshot for a price list and customer group.
+
+    The current date is part of the key, so prices roll over by themselves when
+    a pricing rule or promotional scheme starts or ends (`valid_from` and
+    `valid_upto` are dates).
+    """
+    return f"{PRICE_SNAPSHOT_KEY}:{price_list}:{customer_group}:{nowdate()}"
+
+
+def get_cached_prices(cache_key, item_codes):
+    """Read the snapshot entries of the given items in a single round trip."""
+    cache = frappe.cache()
+    values = cache.hmget(cache.make_key(cache_key), item_codes)
+    return {
+        item_code: pickle.loads(value)
+        for item_code, value in zip(item_codes, values)
+        if value is not None
+    }
+
+
+def clear_price_snapshot(doc=None, method=None):
+    """
+    Drop cached prices when an Item Price, Pricing Rule or Promotional Scheme
+    changes. Item Price changes only drop the snapshots of their price list.
+    """
+    key = PRICE_SNAPSHOT_KEY
+    if (
+        doc
+        and doc.doctype == "Item Price"
+        and doc.price_list
+        and not doc.has_value_changed("price_list")
+    ):
+        key = f"{PRICE_SNAPSHOT_KEY}:{doc.price_list}:"
+
+    frappe.cache().delete_keys(key)
+
+
+def get_price_fields(price):
+    """Map a webshop price object to the fields exposed by the listing APIs."""
+    fields = {
+        "currency": price.get("currency"),
+        "formatted_mrp": price.get("formatted_mrp"),
+        "formatted_price": price.get("formatted_price"),
+        "price_list_rate": price.get("price_list_rate"),
+    }
+
+    if price.get("discount_percent"):
+        fields["discount_percent"] = flt(price.get("discount_percent"))
+
+    if price.get("formatted_mrp"):
+        fields["discount"] = price.get("formatted_discount_percent") or price.get(
+            "formatted_discount_rate"
+        )
+
+    return fields
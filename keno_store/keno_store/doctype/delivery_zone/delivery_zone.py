@@ -1,9 +1,90 @@
 # Copyright (c) 2024, Adnan Rahman and contributors
 # For license information, please see license.txt
 
-# import frappe
+import re
+
+import frappe
+from frappe import _
 from frappe.model.document import Document
 
+from keno_store.keno_store.doctype.delivery_zone_schedule.delivery_zone_schedule import (
+	clear_weekly_schedule_cache,
+)
+
+ZIP_ZONE_INDEX_KEY = "keno_store:zip_zone_index"
+# Marks the index as built, so unknown zips are not looked up in the database
+INDEX_BUILT_FLAG = "__built__"
+
 
 class DeliveryZone(Document):
-	pass
+	def validate(self):
+		self.validate_zip_codes()
+
+	def on_update(self):
+		clear_zip_zone_index()
+
+	def on_trash(self):
+		clear_zip_zone_index()
+
+	def after_rename(self, old, new, merge=False):
+		clear_zip_zone_index()
+		# compiled schedules are keyed by zone name
+		clear_weekly_schedule_cache()
+
+	def validate_zip_codes(self):
+		"""Warn about zip codes that already belong to another zone."""
+		zip_codes = set(parse_zip_codes(self.zip_codes))
+		for zone in frappe.get_all(
+			"Delivery Zone", filters={"name": ["!=", self.name]}, fields=["name", "zip_codes"]
+		):
+			overlap = zip_codes.intersection(parse_zip_codes(zone.zip_codes))
+			if overlap:
+				frappe.msgprint(
+					_("Zip codes {0} are also part of zone {1}").format(
+						", ".join(sorted(overlap)), zone.name
+					),
+					indicator="orange",
+					alert=True,
+				)
+
+
+def normalize_zip(zip_code):
+	"""Return the 5 digit zip code, so `11375-1234` and ` 11375` match `11375`."""
+	return re.sub(r"\D", "", str(zip_code or ""))[:5]
+
+
+def parse_zip_codes(zip_codes):
+	"""Split the comma separated zip codes of a zone into normalized zip codes."""
+	return [zip_code for zip_code in map(normalize_zip, (zip_codes or "").split(",")) if zip_code]
+
+
+def build_zip_zone_index():
+	"""Load every zone's zip codes into the zip -> zone hash."""
+	cache = frappe.cache()
+	cache.delete_key(ZIP_ZONE_INDEX_KEY)
+
+	# Older zones win when a zip code is listed in more than one zone
+	for zone in frappe.get_all(
+		"Delivery Zone", fields=["name", "zip_codes"], order_by="creation desc"
+	):
+		for zip_code in parse_zip_codes(zone.zip_codes):
+			cache.hset(ZIP_ZONE_INDEX_KEY, zip_code, zone.name)
+
+	cache.hset(ZIP_ZONE_INDEX_KEY, INDEX_BUILT_FLAG, 1)
+
+
+def clear_zip_zone_index():
+	frappe.cache().delete_key(ZIP_ZONE_INDEX_KEY)
+
+
+def get_zone_for_zip(zip_code):
+	"""Return the Delivery Zone serving a zip code, or None."""
+	zip_code = normalize_zip(zip_code)
+	if not zip_code:
+		return None
+
+	cache = frappe.cache()
+	if not cache.hget(ZIP_ZONE_INDEX_KEY, INDEX_BUILT_FLAG):
+		build_zip_zone_index()
+
+	return cache.hget(ZIP_ZONE_INDEX_KEY, zip_code)
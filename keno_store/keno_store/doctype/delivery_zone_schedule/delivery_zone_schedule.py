@@ -1,9 +1,62 @@
 # Copyright (c) 2024, Adnan Rahman and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+WEEKLY_SCHEDULE_CACHE_KEY = "keno_store:weekly_delivery_schedule"
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
 
 class DeliveryZoneSchedule(Document):
-	pass
+	def on_update(self):
+		clear_weekly_schedule_cache()
+
+	def on_trash(self):
+		clear_weekly_schedule_cache()
+
+	def after_rename(self, old, new, merge=False):
+		clear_weekly_schedule_cache()
+
+
+def get_weekly_schedules():
+	"""
+	Return the compiled weekly schedule of every zone having delivery slots,
+	as {zone: {"weekly_schedule": {day: [{"start_time", "end_time"}]}}}.
+	"""
+	return frappe.cache().get_value(WEEKLY_SCHEDULE_CACHE_KEY, generator=compile_weekly_schedules)
+
+
+def compile_weekly_schedules():
+	"""Build the weekly schedule of all zones from the Delivery Slot table in one query."""
+	slots = frappe.db.sql(
+		"""
+		SELECT
+			schedule.delivery_zone, slot.day, slot.start_time, slot.end_time
+		FROM `tabDelivery Slot` slot
+		INNER JOIN `tabDelivery Zone Schedule` schedule
+			ON schedule.name = slot.parent
+			AND slot.parenttype = 'Delivery Zone Schedule'
+		ORDER BY slot.start_time, slot.end_time
+		""",
+		as_dict=True,
+	)
+
+	slots_by_zone = {}
+	for slot in slots:
+		slots_by_zone.setdefault(slot.delivery_zone, {}).setdefault(slot.day, []).append(
+			{"start_time": str(slot.start_time), "end_time": str(slot.end_time)}
+		)
+
+	schedules = {}
+	for zone, days in slots_by_zone.items():
+		# Keep the weekdays in calendar order
+		schedules[zone] = {
+			"weekly_schedule": {day: days[day] for day in WEEKDAYS if days.get(day)}
+		}
+
+	return schedules
+
+
+def clear_weekly_schedule_cache():
+	frappe.cache().delete_value(WEEKLY_SCHEDULE_CACHE_KEY)
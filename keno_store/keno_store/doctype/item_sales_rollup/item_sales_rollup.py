@@ -0,0 +1,14 @@
+# Copyright (c) 2024, Adnan Rahman and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class ItemSalesRollup(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_unique("Item Sales Rollup", ["item_code", "sale_date"])
+	frappe.db.add_index("Item Sales Rollup", ["sale_date", "item_code", "qty"])
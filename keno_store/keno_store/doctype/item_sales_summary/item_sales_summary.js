@@ -0,0 +1,8 @@
+// Copyright (c) 2024, Adnan Rahman and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Item Sales Summary", {
+// 	refresh(frm) {
+
+// 	},
+// });
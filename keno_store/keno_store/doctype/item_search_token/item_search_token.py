@@ -0,0 +1,14 @@
+# Copyright (c) 2024, Adnan Rahman and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class ItemSearchToken(Document):
+	pass
+
+
+def on_doctype_update():
+	# postings are looked up by token and then grouped per item
+	frappe.db.add_index("Item Search Token", ["token", "item_code", "weight"])
@@ -0,0 +1,14 @@
+# Copyright (c) 2024, Adnan Rahman and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class PricingRuleMembership(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Pricing Rule Membership", ["promotional_scheme", "valid_from"])
+	frappe.db.add_index("Pricing Rule Membership", ["apply_on", "valid_from"])
@@ -0,0 +1,111 @@
+# Copyright (c) 2024, Adnan Rahman and Contributors
+# See license.txt
+
+import frappe
+from erpnext.stock.doctype.item.test_item import make_item
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, nowdate
+
+from keno_store.keno_store.pricing_rule_index import rebuild_pricing_rule_memberships
+
+
+class TestPricingRuleMembership(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_item_group("_Test Offer Group", "All Item Groups", is_group=1)
+		make_item_group("_Test Offer Sub Group", "_Test Offer Group")
+		make_item_group("_Test Offer Other Group", "All Item Groups")
+		if not frappe.db.exists("Brand", "_Test Offer Brand"):
+			frappe.get_doc({"doctype": "Brand", "brand": "_Test Offer Brand"}).insert()
+
+		make_item("_Test Offer Sub Group Item", {"item_group": "_Test Offer Sub Group"})
+		make_item("_Test Offer Other Group Item", {"item_group": "_Test Offer Other Group"})
+		make_item(
+			"_Test Offer Brand Item",
+			{"item_group": "_Test Offer Other Group", "brand": "_Test Offer Brand"},
+		)
+
+	def test_item_group_rule_covers_descendants(self):
+		rule = make_pricing_rule("Item Group", "_Test Offer Group")
+
+		item_codes = get_member_item_codes(rule.name)
+		self.assertIn("_Test Offer Sub Group Item", item_codes)
+		self.assertNotIn("_Test Offer Other Group Item", item_codes)
+
+	def test_brand_rule_follows_item_brand(self):
+		rule = make_pricing_rule("Brand", "_Test Offer Brand")
+		self.assertEqual(get_member_item_codes(rule.name), ["_Test Offer Brand Item"])
+
+		item = frappe.get_doc("Item", "_Test Offer Brand Item")
+		item.brand = None
+		item.save()
+		self.assertEqual(get_member_item_codes(rule.name), [])
+
+	def test_validity_window(self):
+		expired = make_pricing_rule(
+			"Item Group",
+			"_Test Offer Group",
+			valid_from=add_days(nowdate(), -10),
+			valid_upto=add_days(nowdate(), -1),
+		)
+		self.assertEqual(get_member_item_codes(expired.name), [])
+
+		# Rules starting later are indexed, reads filter on valid_from
+		upcoming = make_pricing_rule(
+			"Item Group", "_Test Offer Group", valid_from=add_days(nowdate(), 5)
+		)
+		self.assertIn("_Test Offer Sub Group Item", get_member_item_codes(upcoming.name))
+
+		ending = make_pricing_rule(
+			"Item Group",
+			"_Test Offer Group",
+			valid_from=add_days(nowdate(), -10),
+			valid_upto=nowdate(),
+		)
+		self.assertIn("_Test Offer Sub Group Item", get_member_item_codes(ending.name))
+
+		frappe.db.set_value("Pricing Rule", ending.name, "valid_upto", add_days(nowdate(), -1))
+		rebuild_pricing_rule_memberships()
+		self.assertEqual(get_member_item_codes(ending.name), [])
+
+
+def make_item_group(name, parent, is_group=0):
+	if not frappe.db.exists("Item Group", name):
+		frappe.get_doc(
+			{
+				"doctype": "Item Group",
+				"item_group_name": name,
+				"parent_item_group": parent,
+				"is_group": is_group,
+			}
+		).insert()
+
+
+def make_pricing_rule(apply_on, value, **kwargs):
+	table, field = {
+		"Item Group": ("item_groups", "item_group"),
+		"Brand": ("brands", "brand"),
+	}[apply_on]
+
+	return frappe.get_doc(
+		{
+			"doctype": "Pricing Rule",
+			"title": f"_Test Offer {apply_on} Rule",
+			"company": "_Test Company",
+			"apply_on": apply_on,
+			table: [{field: value}],
+			"selling": 1,
+			"rate_or_discount": "Discount Percentage",
+			"discount_percentage": 10,
+			**kwargs,
+		}
+	).insert()
+
+
+def get_member_item_codes(pricing_rule):
+	return sorted(
+		frappe.get_all(
+			"Pricing Rule Membership", filters={"pricing_rule": pricing_rule}, pluck="item_code"
+		)
+	)
@@ -0,0 +1,145 @@
+import frappe
+from frappe.utils import cint, flt
+
+from keno_store.keno_store.quotation import build_cart_snapshot, get_guest_cart
+
+GUEST_CART_PREFIX = "keno_store:ephemeral_cart"
+# Idle guest carts expire after a week, override with `keno_guest_cart_ttl` in site_config.json
+GUEST_CART_TTL = 7 * 24 * 60 * 60
+GUEST_CART_LINE_FIELDS = ("item_code", "qty", "additional_notes", "warehouse")
+
+
+def get_guest_cart_key(session_id):
+    return f"{GUEST_CART_PREFIX}:{session_id}"
+
+
+def get_guest_cart_ttl():
+    return cint(frappe.conf.get("keno_guest_cart_ttl")) or GUEST_CART_TTL
+
+
+def get_ephemeral_cart(session_id):
+    """
+    Return the Redis cart of a guest session as {"items": [lines], "snapshot": cart snapshot},
+    None when the session has no cart.
+    """
+    if not session_id:
+        return None
+
+    return frappe.cache().get_value(get_guest_cart_key(session_id))
+
+
+def update_ephemeral_cart(session_id, changes):
+    """
+    Apply validated line changes, {"item_code", "qty", "additional_notes", "warehouse"},
+    to the Redis cart of a guest session, a qty of 0 removes the line.
+
+    The cart is priced on an unsaved Quotation and stored with its snapshot,
+    refreshing its expiry. Returns the cart, None when it is empty.
+    """
+    cart = get_ephemeral_cart(session_id)
+    lines = {line["item_code"]: line for line in (cart["items"] if cart else [])}
+
+    for change in changes:
+        if flt(change.get("qty")):
+            lines[change["item_code"]] = {
+                field: change.get(field) for field in GUEST_CART_LINE_FIELDS
+            }
+        else:
+            lines.pop(change["item_code"], None)
+
+    return save_ephemeral_cart(session_id, list(lines.values()))
+
+
+def save_ephemeral_cart(session_id, lines):
+    cache = frappe.cache()
+    if not lines:
+        cache.delete_value(get_guest_cart_key(session_id))
+        return None
+
+    cart = {
+        "items": lines,
+        "snapshot": build_cart_snapshot(build_guest_quotation(session_id, lines)),
+    }
+    cache.set_value(get_guest_cart_key(session_id), cart, expires_in_sec=get_guest_cart_ttl())
+
+    return cart
+
+
+def build_guest_quotation(session_id, lines):
+    """Unsaved, priced guest cart Quotation of the given lines."""
+    from keno_store.cart_api import apply_cart_settings, new_guest_cart
+
+    quotation = new_guest_cart(session_id)
+    for line in lines:
+        quotation.append("items", {"doctype": "Quotation Item", **line})
+
+    quotation.flags.ignore_permissions = True
+    quotation.run_method("set_missing_values")
+    apply_cart_settings(quotation=quotation)
+    quotation.run_method("set_total_in_words")
+
+    return quotation
+
+
+def materialize_guest_cart(session_id):
+    """
+    Save the Redis cart of a guest session as a cart Quotation, for the steps
+    that need one (addresses, delivery, coupons and checkout).
+
+    Returns the Quotation, None when the session has no cart.
+    """
+    cart = get_ephemeral_cart(session_id)
+    if not cart:
+        return None
+
+    quotation = build_guest_quotation(session_id, cart["items"])
+    quotation.payment_schedule = []
+    quotation.insert()
+    frappe.cache().delete_value(get_guest_cart_key(session_id))
+
+    return quotation
+
+
+def merge_guest_cart(session_id):
+    """
+    Move the cart of a guest session into the cart of the logged in user,
+    guest lines replace the lines of the same items.
+
+    Both the Redis cart and a guest Quotation already saved for the session
+    (see materialize_guest_cart) are merged, the guest Quotation is then deleted.
+    """
+    from keno_store.cart_api import _get_cart_quotation, apply_cart_settings, set_cart_count
+
+    cart = get_ephemeral_cart(session_id)
+    guest_quotation = get_guest_cart(session_id)
+
+    # Redis lines are the most recent ones
+    lines = {}
+    if guest_quotation:
+        for item in guest_quotation.get("items"):
+            lines[item.item_code] = {field: item.get(field) for field in GUEST_CART_LINE_FIELDS}
+    for line in cart["items"] if cart else []:
+        lines[line["item_code"]] = line
+
+    quotation = None
+    if lines:
+        quotation = _get_cart_quotation()
+        for line in lines.values():
+            quotation_items = quotation.get("items", {"item_code": line["item_code"]})
+            if quotation_items:
+                quotation_items[0].update(line)
+            else:
+                quotation.append("items", {"doctype": "Quotation Item", **line})
+
+        apply_cart_settings(quotation=quotation, changed_items=list(lines))
+        quotation.flags.ignore_permissions = True
+        quotation.payment_schedule = []
+        quotation.save()
+
+        set_cart_count(quotation)
+
+    if guest_quotation:
+        guest_quotation.delete(ignore_permissions=True)
+    frappe.cache().delete_value(get_guest_cart_key(session_id))
+
+    return quotation
@@ -0,0 +1,327 @@
+import html
+import pickle
+import re
+
+import frappe
+from bs4 import BeautifulSoup
+from frappe.utils import flt
+
+from keno_store.keno_store.catalog import get_price_map, get_qty_limits_map
+from keno_store.keno_store.item_review import STAR_FIELDS
+
+ITEM_DETAIL_KEY = "keno_store:item_detail"
+# Plain text of the specification value, set when the Website Item is saved
+SPEC_VALUE_FIELD = "custom_value_text"
+
+P_TAG_PATTERN = re.compile(r"<p\b[^>]*>(.*?)(?:</p\s*>|$)", re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+
+# Fields of the details computed on every request
+STOCK_FIELDS = ("is_in_stock", "stock_qty")
+PRICE_FIELDS = (
+    "currency",
+    "formatted_mrp",
+    "formatted_price",
+    "price_list_rate",
+    "discount_percent",
+    "discount",
+)
+
+
+def get_item_details(item_code):
+    """
+    Return the product page details of an item.
+
+    Raises DoesNotExistError when the item has no Website Item.
+    """
+    item_details = get_items_details([item_code]).get(item_code)
+    if not item_details:
+        raise frappe.DoesNotExistError(f"Website Item with code {item_code} does not exist.")
+
+    return item_details
+
+
+def get_items_details(item_codes, fields=None):
+    """
+    Return {item_code: product page details} for the given items, skipping
+    items without a Website Item.
+
+    The static part is cached per item and built in bulk for the items missing
+    from the cache, stock and price are fetched in bulk on every call.
+
+    Args:
+        item_codes (list): Item codes to fetch.
+        fields (list, optional): Only return these fields, stock and price are
+            not computed when none of their fields is requested.
+    """
+    item_codes = list(dict.fromkeys(item_code for item_code in item_codes if item_code))
+    if not item_codes:
+        return {}
+
+    items_details = get_static_items_details(item_codes)
+    item_codes = list(items_details)
+    if not item_codes:
+        return items_details
+
+    if not fields or set(fields).intersection(STOCK_FIELDS):
+        stock = get_stock_details_map(item_codes)
+        for item_code, item_details in items_details.items():
+            item_details.update(stock.get(item_code, {"is_in_stock": False, "stock_qty": 0}))
+
+    if not fields or set(fields).intersection(PRICE_FIELDS):
+        prices = get_price_map(item_codes)
+        for item_code, item_details in items_details.items():
+            item_details.update(prices.get(item_code) or {})
+
+    if fields:
+        items_details = {
+            item_code: {field: item_details.get(field) for field in ["item_code", *fields]}
+            for item_code, item_details in items_details.items()
+        }
+
+    return items_details
+
+
+def get_static_items_details(item_codes):
+    """Read the cached static details of the given items, building the missing ones."""
+    cache = frappe.cache()
+    values = cache.hmget(cache.make_key(ITEM_DETAIL_KEY), item_codes)
+    items_details = {
+        item_code: pickle.loads(value)
+        for item_code, value in zip(item_codes, values)
+        if value is not None
+    }
+
+    missing = [item_code for item_code in item_codes if item_code not in items_details]
+    if missing:
+        for item_code, item_details in build_static_items_details(missing).items():
+            cache.hset(ITEM_DETAIL_KEY, item_code, item_details)
+            items_details[item_code] = item_details
+
+    # Keep the requested order
+    return {
+        item_code: items_details[item_code].copy()
+        for item_code in item_codes
+        if item_code in items_details
+    }
+
+
+def build_static_items_details(item_codes):
+    """
+    Details of the product page that only change when the item is edited or
+    reviewed, for all the given items with one query per source.
+    """
+    website_items = frappe.get_all(
+        "Website Item",
+        filters={"item_code": ["in", item_codes]},
+        fields=[
+            "name",
+            "item_code",
+            "item_name",
+            "short_description",
+            "item_group",
+            "web_long_description",
+            "stock_uom",
+            "brand",
+            "slideshow",
+            "website_image",
+        ],
+    )
+    if not website_items:
+        return {}
+
+    item_codes = [website_item.item_code for website_item in website_items]
+    qty_limits = get_qty_limits_map(item_codes)
+    rating_summaries = get_rating_summary_map(item_codes)
+    reviews = group_by(
+        frappe.get_all(
+            "Item Review",
+            filters={"item": ["in", item_codes]},
+            fields=["item", "customer", "rating", "review_title", "comment", "published_on"],
+            order_by="published_on desc",
+        ),
+        "item",
+    )
+    specifications = group_by(
+        frappe.get_all(
+            "Item Website Specification",
+            filters={
+                "parent": ["in", [website_item.name for website_item in website_items]],
+                "parenttype": "Website Item",
+            },
+            fields=["parent", "label", "description", SPEC_VALUE_FIELD],
+            order_by="idx asc",
+        ),
+        "parent",
+    )
+
+    slideshow_images = {}
+    slideshows = {website_item.slideshow for website_item in website_items if website_item.slideshow}
+    if slideshows:
+        slideshow_images = group_by(
+            frappe.get_all(
+                "Website Slideshow Item",
+                filters={"parent": ["in", list(slideshows)], "parenttype": "Website Slideshow"},
+                fields=["parent", "image"],
+                order_by="idx asc",
+            ),
+            "parent",
+        )
+
+    items_details = {}
+    for website_item in website_items:
+        item_code = website_item.item_code
+        limits = qty_limits.get(item_code, {})
+        rating_summary = rating_summaries.get(item_code, {})
+
+        items_details[item_code] = {
+            "item_code": item_code,
+            "item_name": website_item.item_name,
+            "description": website_item.short_description,
+            "item_group": website_item.item_group,
+            "web_long_description": website_item.web_long_description,
+            "uom": website_item.stock_uom,
+            "brand": website_item.brand,
+            "minimum_qty": limits.get("minimum_qty") or 0,
+            "maximum_qty": limits.get("maximum_qty") or 0,
+            "reviews": reviews.get(item_code, []),
+            "average_rating": round(flt(rating_summary.get("average_rating")), 1),
+            "rating_count": rating_summary.get("rating_count") or 0,
+            "rating_histogram": {
+                star: rating_summary.get(f"stars_{star}") or 0 for star in range(1, 6)
+            },
+            # Multiple images from the Website Slideshow, the website image otherwise
+            "image_list": (
+                slideshow_images.get(website_item.slideshow, [])
+                if website_item.slideshow
+                else [{"image": website_item.website_image}]
+            ),
+            "specifications": [
+                {"label": spec.label, "value": get_specification_value(spec)}
+                for spec in specifications.get(website_item.name, [])
+            ],
+        }
+
+    return items_details
+
+
+def get_rating_summary_map(item_codes):
+    rows = frappe.get_all(
+        "Item Rating Summary",
+        filters={"item": ["in", item_codes]},
+        fields=["item", "rating_count", "average_rating", *STAR_FIELDS],
+    )
+    return {row.item: row for row in rows}
+
+
+def group_by(rows, key):
+    """Group rows by the value of `key`, which is removed from the rows."""
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row.pop(key), []).append(row)
+
+    return grouped
+
+
+def get_specification_value(spec):
+    """Stored plain text of a specification row, extracted on the fly for rows not backfilled yet."""
+    value = spec.get(SPEC_VALUE_FIELD)
+    return value if value is not None else extract_value(spec.description)
+
+
+def extract_value(content):
+    """
+    Lightweight extraction of the specification value, the text of the first
+    <p> tag of HTML content, or the content itself when it is not HTML.
+    """
+    content = content or ""
+    if "<" in content and ">" in content:
+        match = P_TAG_PATTERN.search(content)
+        return html.unescape(TAG_PATTERN.sub("", match.group(1))) if match else None
+
+    return content
+
+
+def get_specification_text(content):
+    """
+    Exact specification value using an HTML parser, only used when the value
+    is stored. None for HTML without a <p> tag, like extract_value.
+    """
+    content = content or ""
+    if "<" in content and ">" in content:
+        p_tag = BeautifulSoup(content, "html.parser").find("p")
+        return p_tag.text if p_tag else None
+
+    return content
+
+
+def set_specification_values(doc, method=None):
+    """Website Item validate hook, stores the plain text of each specification."""
+    for spec in doc.get("website_specifications"):
+        spec.set(SPEC_VALUE_FIELD, get_specification_text(spec.description))
+
+
+def backfill_specification_values():
+    """
+    Store the plain text value of every existing specification row.
+
+    Usage: bench --site <site> execute keno_store.keno_store.item_detail.backfill_specification_values
+    """
+    specifications = frappe.get_all(
+        "Item Website Specification",
+        filters={"parenttype": "Website Item"},
+        fields=["name", "description"],
+    )
+
+    frappe.db.bulk_update(
+        "Item Website Specification",
+        {
+            spec.name: {SPEC_VALUE_FIELD: get_specification_text(spec.description)}
+            for spec in specifications
+        },
+        update_modified=False,
+    )
+    frappe.cache().delete_key(ITEM_DETAIL_KEY)
+
+
+def get_stock_details_map(item_codes):
+    """Return {item_code: {"is_in_stock", "stock_qty"}} in the Website Item warehouse of each item."""
+    if not item_codes:
+        return {}
+
+    rows = frappe.db.sql(
+        """
+        SELECT wi.item_code, bin.actual_qty, bin.projected_qty
+        FROM `tabWebsite Item` wi
+        INNER JOIN `tabBin` bin
+            ON bin.item_code = wi.item_code AND bin.warehouse = wi.website_warehouse
+        WHERE wi.item_code IN %(item_codes)s
+        """,
+        {"item_codes": list(item_codes)},
+        as_dict=True,
+    )
+    return {
+        row.item_code: {
+            "is_in_stock": flt(row.actual_qty) > 0,
+            "stock_qty": flt(row.projected_qty),
+        }
+        for row in rows
+    }
+
+
+def clear_item_details(item_codes):
+    item_codes = [item_code for item_code in item_codes if item_code]
+    if item_codes:
+        frappe.cache().hdel(ITEM_DETAIL_KEY, item_codes)
+
+
+def on_item_update(doc, method=None):
+    """Item, Website Item and Item Review hook."""
+    clear_item_details([doc.get("item_code") or doc.get("item")])
+
+
+def on_website_slideshow_update(doc, method=None):
+    clear_item_details(
+        frappe.get_all("Website Item", filters={"slideshow": doc.name}, pluck="item_code")
+    )
@@ -0,0 +1,81 @@
+import frappe
+from frappe.utils import cint
+
+from keno_store.keno_store.response_cache import get_tag_generation
+
+ITEM_GROUP_TREE_KEY = "keno_store:item_group_tree"
+ITEM_GROUP_FIELDS = ("name", "parent_item_group", "image", "is_group")
+
+# Sections of the app dashboard, override with `keno_dashboard_categories` in site_config.json.
+# A section without parent lists the top groups of the whole tree.
+DEFAULT_DASHBOARD_SECTIONS = [
+    {"key": "cooking_item_groups", "parent": "Cooking", "limit": 8},
+    {"key": "beverages_item_groups", "parent": "Beverages", "limit": 8},
+    {"key": "pcare_item_groups", "parent": "Personal Care", "limit": 8},
+    {"key": "best_item_groups", "parent": None, "limit": 8},
+]
+
+# Tree of the current generation, kept per worker
+_tree = {}
+
+
+def get_item_group_tree():
+    """
+    Return the website Item Group tree as {"groups": [...], "children": {parent: [...]}},
+    groups sorted by weightage, highest first.
+
+    Kept in Redis and in worker memory for the current "Item Group" generation
+    of the response cache, so saving an Item Group rebuilds it.
+    """
+    generation = get_tag_generation("Item Group")
+    if _tree.get("generation") != generation:
+        _tree["tree"] = frappe.cache().get_value(
+            f"{ITEM_GROUP_TREE_KEY}:{generation}", generator=build_item_group_tree
+        )
+        _tree["generation"] = generation
+
+    return _tree["tree"]
+
+
+def build_item_group_tree():
+    item_groups = frappe.db.sql(
+        """
+        SELECT name, parent_item_group, image, is_group, weightage
+        FROM `tabItem Group`
+        WHERE show_in_website = 1
+        ORDER BY lft
+        """,
+        as_dict=True,
+    )
+
+    # Stable sort keeps tree order between groups of the same weightage
+    item_groups.sort(key=lambda group: cint(group.weightage), reverse=True)
+
+    groups, children = [], {}
+    for group in item_groups:
+        group = {field: group[field] for field in ITEM_GROUP_FIELDS}
+        groups.append(group)
+        children.setdefault(group["parent_item_group"], []).append(group)
+
+    return {"groups": groups, "children": children}
+
+
+def get_website_item_groups(parent=None, limit=None):
+    """Website item groups, children of `parent` when given, highest weightage first."""
+    tree = get_item_group_tree()
+    item_groups = tree["children"].get(parent, []) if parent else tree["groups"]
+
+    limit = cint(limit)
+    return [group.copy() for group in (item_groups[:limit] if limit else item_groups)]
+
+
+def get_dashboard_sections():
+    return frappe.conf.get("keno_dashboard_categories") or DEFAULT_DASHBOARD_SECTIONS
+
+
+def get_dashboard_category_sections():
+    """Return [{section key: item groups}] for the configured dashboard sections."""
+    return [
+        {section["key"]: get_website_item_groups(section.get("parent"), section.get("limit"))}
+        for section in get_dashboard_sections()
+    ]
@@ -0,0 +1,186 @@
+import frappe
+from frappe.utils import cint, flt, now
+
+
+STAR_FIELDS = ["stars_1", "stars_2", "stars_3", "stars_4", "stars_5"]
+
+
+def get_star_bucket(rating):
+    """Return the histogram bucket (1 to 5) a rating on the 0-5 scale falls into."""
+    # round half up, the same way MariaDB's ROUND() does in the rebuild query
+    return min(max(cint(flt(rating) + 0.5), 1), 5)
+
+
+def add_rating_to_summary(item_code, rating):
+    """
+    Count one new review in the item's rating summary.
+
+    The row is created on the first review and incremented in place after
+    that, so concurrent reviews never read-modify-write the same totals.
+    """
+    rating = flt(rating)
+    stars = {field: 0 for field in STAR_FIELDS}
+    stars[f"stars_{get_star_bucket(rating)}"] = 1
+    timestamp = now()
+
+    frappe.db.sql(
+        """
+        INSERT INTO `tabItem Rating Summary`
+            (name, item, rating_count, rating_sum, average_rating,
+            stars_1, stars_2, stars_3, stars_4, stars_5,
+            creation, modified, owner, modified_by, docstatus, idx)
+        VALUES
+            (%(item)s, %(item)s, 1, %(rating)s, %(rating)s,
+            %(stars_1)s, %(stars_2)s, %(stars_3)s, %(stars_4)s, %(stars_5)s,
+            %(timestamp)s, %(timestamp)s, 'Administrator', 'Administrator', 0, 0)
+        ON DUPLICATE KEY UPDATE
+            rating_count = rating_count + 1,
+            rating_sum = rating_sum + VALUES(rating_sum),
+            average_rating = rating_sum / rating_count,
+            stars_1 = stars_1 + VALUES(stars_1),
+            stars_2 = stars_2 + VALUES(stars_2),
+            stars_3 = stars_3 + VALUES(stars_3),
+            stars_4 = stars_4 + VALUES(stars_4),
+            stars_5 = stars_5 + VALUES(stars_5),
+            modified = VALUES(modified)
+        """,
+        {"item": item_code, "rating": rating, "timestamp": timestamp, **stars},
+    )
+
+
+def change_rating_in_summary(item_code, old_rating, new_rating):
+    """Move one review of the item from `old_rating` to `new_rating` in its rating summary."""
+    old_rating, new_rating = flt(old_rating), flt(new_rating)
+    if not frappe.db.exists("Item Rating Summary", item_code):
+        rebuild_item_rating_summaries([item_code])
+        return
+
+    # Bucket fields come from get_star_bucket, never from user input
+    old_stars = f"stars_{get_star_bucket(old_rating)}"
+    new_stars = f"stars_{get_star_bucket(new_rating)}"
+    stars = ""
+    if old_stars != new_stars:
+        stars = f"{old_stars} = GREATEST({old_stars} - 1, 0), {new_stars} = {new_stars} + 1,"
+
+    frappe.db.sql(
+        f"""
+        UPDATE `tabItem Rating Summary`
+        SET
+            rating_sum = rating_sum + %(difference)s,
+            average_rating = rating_sum / rating_count,
+            {stars}
+            modified = %(timestamp)s
+        WHERE name = %(item)s
+        """,
+        {"item": item_code, "difference": new_rating - old_rating, "timestamp": now()},
+    )
+
+
+def rebuild_item_rating_summaries(item_codes=None):
+    """
+    Recompute rating summaries from the Item Review table.
+
+    Used for backfills and whenever reviews are removed. Rebuilds every item
+    when `item_codes` is not given.
+
+    Usage: bench --site <site> execute keno_store.keno_store.item_review.rebuild_item_rating_summaries
+    """
+    conditions = ""
+    values = {}
+    if item_codes:
+        conditions = "WHERE item IN %(item_codes)s"
+        values["item_codes"] = tuple(item_codes)
+
+    summaries = frappe.db.sql(
+        f"""
+        SELECT
+            item,
+            COUNT(*) AS rating_count,
+            SUM(rating) AS rating_sum,
+            SUM(CASE WHEN ROUND(rating) <= 1 THEN 1 ELSE 0 END) AS stars_1,
+            SUM(CASE WHEN ROUND(rating) = 2 THEN 1 ELSE 0 END) AS stars_2,
+            SUM(CASE WHEN ROUND(rating) = 3 THEN 1 ELSE 0 END) AS stars_3,
+            SUM(CASE WHEN ROUND(rating) = 4 THEN 1 ELSE 0 END) AS stars_4,
+            SUM(CASE WHEN ROUND(rating) >= 5 THEN 1 ELSE 0 END) AS stars_5
+        FROM `tabItem Review`
+        {conditions}
+        GROUP BY item
+        """,
+        values,
+        as_dict=True,
+    )
+
+    if item_codes:
+        frappe.db.delete("Item Rating Summary", {"item": ["in", list(item_codes)]})
+    else:
+        frappe.db.delete("Item Rating Summary")
+
+    timestamp = now()
+    fields = [
+        "name",
+        "item",
+        "rating_count",
+        "rating_sum",
+        "average_rating",
+        *STAR_FIELDS,
+        "creation",
+        "modified",
+        "owner",
+        "modified_by",
+    ]
+    rows = [
+        (
+            summary.item,
+            summary.item,
+            summary.rating_count,
+            flt(summary.rating_sum),
+            flt(summary.rating_sum) / summary.rating_count,
+            *[cint(summary[field]) for field in STAR_FIELDS],
+            timestamp,
+            timestamp,
+            "Administrator",
+            "Administrator",
+        )
+        for summary in summaries
+        if summary.item
+    ]
+    if rows:
+        frappe.db.bulk_insert("Item Rating Summary", fields, rows)
+
+
+def get_rating_summary(item_code):
+    """Return the rating summary of an item, with zeroes when it has no reviews."""
+    summary = frappe.db.get_value(
+        "Item Rating Summary",
+        item_code,
+        ["rating_count", "average_rating", *STAR_FIELDS],
+        as_dict=True,
+    )
+    return summary or frappe._dict(
+        {"rating_count": 0, "average_rating": 0, **{field: 0 for field in STAR_FIELDS}}
+    )
+
+
+def on_item_review_insert(doc, method=None):
+    """Count a new review, however it was created (API, webshop, Desk or data import)."""
+    if doc.item:
+        add_rating_to_summary(doc.item, doc.rating)
+
+
+def on_item_review_delete(doc, method):
+    """Recompute the summary of the reviewed item once a review is deleted."""
+    if doc.item:
+        rebuild_item_rating_summaries([doc.item])
+
+
+def on_item_review_update(doc, method=None):
+    """Apply a rating change of an existing review to the rating summaries."""
+    previous = doc.get_doc_before_save()
+    if not previous:
+        # New reviews are counted by on_item_review_insert
+        return
+
+    if doc.has_value_changed("item"):
+        rebuild_item_rating_summaries([item for item in (previous.item, doc.item) if item])
+    elif doc.item and doc.has_value_changed("rating"):
+        change_rating_in_summary(doc.item, previous.rating, doc.rating)
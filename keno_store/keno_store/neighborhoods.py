@@ -0,0 +1,57 @@
+import hashlib
+import json
+import os
+
+from keno_store.keno_store.doctype.delivery_zone.delivery_zone import normalize_zip
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), "data", "shipping_neighborhoods.json")
+
+
+def get_neighborhood_dataset():
+    """
+    Return the shipping neighborhood dataset, loaded once per worker.
+
+    The dataset is {"version", "neighborhoods", "zip_index"} where
+    `neighborhoods` is {county: {neighborhood: [zip codes]}} and `zip_index`
+    maps each zip code to the counties and neighborhoods it covers.
+    """
+    if not hasattr(get_neighborhood_dataset, "dataset"):
+        with open(DATASET_PATH) as f:
+            neighborhoods = json.load(f)
+
+        get_neighborhood_dataset.dataset = {
+            "version": get_dataset_version(neighborhoods),
+            "neighborhoods": neighborhoods,
+            "zip_index": build_zip_index(neighborhoods),
+        }
+
+    return get_neighborhood_dataset.dataset
+
+
+def get_dataset_version(neighborhoods):
+    """Content hash of the dataset, changes whenever the data file does."""
+    content = json.dumps(neighborhoods, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def build_zip_index(neighborhoods):
+    """Return {zip: [{"county", "neighborhoods"}]} from the nested dataset."""
+    zip_index = {}
+    for county, county_neighborhoods in neighborhoods.items():
+        for neighborhood, zip_codes in county_neighborhoods.items():
+            for zip_code in zip_codes:
+                areas = zip_index.setdefault(normalize_zip(zip_code), {})
+                areas.setdefault(county, []).append(neighborhood)
+
+    return {
+        zip_code: [
+            {"county": county, "neighborhoods": sorted(names)}
+            for county, names in areas.items()
+        ]
+        for zip_code, areas in zip_index.items()
+    }
+
+
+def get_zip_areas(zip_code):
+    """Return the counties and neighborhoods served for a zip code, [] if none."""
+    return get_neighborhood_dataset()["zip_index"].get(normalize_zip(zip_code), [])
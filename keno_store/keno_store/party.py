@@ -0,0 +1,144 @@
+import frappe
+from frappe.contacts.doctype.contact.contact import get_contact_name
+
+PARTY_CACHE_KEY = "keno_store:party"
+CUSTOMER_PRICE_LIST_KEY = "keno_store:customer_price_list"
+GUEST_CUSTOMER = "Guest"
+
+
+def get_cached_party(user):
+    """
+    Return the party linked to the contact of a user as
+    {"doctype", "name", "contact", "customer_group", "debtors_account"},
+    None when the user has no linked party.
+
+    Cached per user, cleared when the Contact or Customer changes. The price
+    list of a customer is cached by get_customer_price_list.
+    """
+    cache = frappe.cache()
+    party = cache.hget(PARTY_CACHE_KEY, user)
+    if party is None:
+        party = build_party(user)
+        if party:
+            cache.hset(PARTY_CACHE_KEY, user, party)
+
+    return party
+
+
+def build_party(user):
+    contact_name = get_contact_name(user)
+    if not contact_name:
+        return None
+
+    links = frappe.get_all(
+        "Dynamic Link",
+        filters={"parenttype": "Contact", "parent": contact_name},
+        fields=["link_doctype", "link_name"],
+        order_by="idx asc",
+        limit=1,
+    )
+    if not links:
+        return None
+
+    party = frappe._dict(
+        {"doctype": links[0].link_doctype, "name": links[0].link_name, "contact": contact_name}
+    )
+
+    if party.doctype == "Customer":
+        party.customer_group = frappe.db.get_value("Customer", party.name, "customer_group")
+        party.debtors_account = frappe.db.get_value(
+            "Party Account",
+            {
+                "parenttype": "Customer",
+                "parent": party.name,
+                "company": frappe.db.get_single_value("Webshop Settings", "company"),
+            },
+            "account",
+        )
+
+    if party.doctype in ("Customer", "Supplier") and not frappe.db.exists(
+        "Portal User", {"parent": party.name, "user": user}
+    ):
+        frappe.enqueue(
+            "keno_store.keno_store.party.add_portal_user",
+            queue="short",
+            job_id=f"add_portal_user:{party.doctype}:{party.name}:{user}",
+            deduplicate=True,
+            enqueue_after_commit=True,
+            party_doctype=party.doctype,
+            party_name=party.name,
+            user=user,
+        )
+
+    return party
+
+
+def get_customer_price_list(customer):
+    """
+    Return the default selling price list of a customer, or of its customer
+    group, None when neither has one. Cached per customer.
+    """
+    cache = frappe.cache()
+    price_list = cache.hget(CUSTOMER_PRICE_LIST_KEY, customer)
+    if price_list is None:
+        values = frappe.db.get_value(
+            "Customer", customer, ["default_price_list", "customer_group"], as_dict=True
+        )
+        if not values:
+            return None
+
+        price_list = values.default_price_list
+        if not price_list and values.customer_group:
+            price_list = frappe.db.get_value(
+                "Customer Group", values.customer_group, "default_price_list"
+            )
+
+        # Empty string caches customers without a price list
+        price_list = price_list or ""
+        cache.hset(CUSTOMER_PRICE_LIST_KEY, customer, price_list)
+
+    return price_list or None
+
+
+def add_portal_user(party_doctype, party_name, user):
+    """Background job, gives the user portal access to the party of their contact."""
+    if frappe.db.exists("Portal User", {"parent": party_name, "user": user}):
+        return
+
+    doc = frappe.get_doc(party_doctype, party_name)
+    doc.append("portal_users", {"user": user})
+    doc.flags.ignore_permissions = True
+    doc.flags.ignore_mandatory = True
+    doc.save()
+
+
+def clear_party_cache(users):
+    users = [user for user in users if user]
+    if users:
+        frappe.cache().hdel(PARTY_CACHE_KEY, users)
+
+
+def on_contact_update(doc, method=None, *args):
+    """Contact hook, the users of its email addresses may resolve to another party."""
+    clear_party_cache({doc.user, doc.email_id, *(row.email_id for row in doc.get("email_ids"))})
+
+
+def on_customer_update(doc, method=None, *args):
+    """Customer hook, drops the cached party of its portal users and contacts."""
+    contact_users = frappe.db.sql_list(
+        """
+        SELECT ce.email_id
+        FROM `tabContact Email` ce
+        INNER JOIN `tabDynamic Link` dl
+            ON dl.parent = ce.parent AND dl.parenttype = 'Contact'
+        WHERE dl.link_doctype = %s AND dl.link_name = %s
+        """,
+        (doc.doctype, doc.name),
+    )
+    clear_party_cache({*contact_users, *(row.user for row in doc.get("portal_users"))})
+    frappe.cache().hdel(CUSTOMER_PRICE_LIST_KEY, doc.name)
+
+
+def on_customer_group_update(doc, method=None, *args):
+    """Customer Group hook, customers may inherit its price list."""
+    frappe.cache().delete_key(CUSTOMER_PRICE_LIST_KEY)
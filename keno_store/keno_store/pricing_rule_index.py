@@ -0,0 +1,266 @@
+import frappe
+from frappe.utils import cint, now, nowdate
+
+from keno_store.utils import decode_cursor
+
+
+MEMBERSHIP_FIELDS = [
+    "name",
+    "pricing_rule",
+    "rule_title",
+    "promotional_scheme",
+    "apply_on",
+    "item_code",
+    "valid_from",
+    "valid_upto",
+    "discount_percentage",
+    "creation",
+    "modified",
+    "owner",
+    "modified_by",
+]
+
+# Rule columns copied on every membership row
+RULE_COLUMNS = """
+    pr.name, pr.title, pr.promotional_scheme, pr.apply_on, {item_code},
+    pr.valid_from, pr.valid_upto, pr.discount_percentage
+"""
+
+
+def get_membership_query(conditions):
+    """
+    SELECT expanding enabled, unexpired pricing rules into one row per item.
+
+    Item Group rules cover the items of the group and of all its descendants,
+    the same way ERPNext applies them.
+    """
+    active = (
+        "pr.disable = 0 AND (pr.valid_upto IS NULL OR pr.valid_upto >= %(today)s) "
+        + conditions
+    )
+
+    return f"""
+        SELECT {RULE_COLUMNS.format(item_code="pic.item_code")}
+        FROM `tabPricing Rule` pr
+        INNER JOIN `tabPricing Rule Item Code` pic
+            ON pic.parent = pr.name AND pic.parenttype = 'Pricing Rule'
+        INNER JOIN `tabItem` i ON i.name = pic.item_code AND i.disabled = 0
+        WHERE pr.apply_on = 'Item Code' AND {active}
+
+        UNION
+
+        SELECT {RULE_COLUMNS.format(item_code="i.name")}
+        FROM `tabPricing Rule` pr
+        INNER JOIN `tabPricing Rule Item Group` pig
+            ON pig.parent = pr.name AND pig.parenttype = 'Pricing Rule'
+        INNER JOIN `tabItem Group` rule_group ON rule_group.name = pig.item_group
+        INNER JOIN `tabItem Group` item_group
+            ON item_group.lft >= rule_group.lft AND item_group.rgt <= rule_group.rgt
+        INNER JOIN `tabItem` i ON i.item_group = item_group.name AND i.disabled = 0
+        WHERE pr.apply_on = 'Item Group' AND {active}
+
+        UNION
+
+        SELECT {RULE_COLUMNS.format(item_code="i.name")}
+        FROM `tabPricing Rule` pr
+        INNER JOIN `tabPricing Rule Brand` prb
+            ON prb.parent = pr.name AND prb.parenttype = 'Pricing Rule'
+        INNER JOIN `tabItem` i ON i.brand = prb.brand AND i.disabled = 0
+        WHERE pr.apply_on = 'Brand' AND {active}
+    """
+
+
+def refresh_memberships(pricing_rules=None, item_codes=None):
+    """
+    Recompute the memberships of the given pricing rules and/or items,
+    or of everything when neither is given.
+    """
+    conditions, values, delete_filters = "", {"today": nowdate()}, {}
+    if pricing_rules:
+        conditions += " AND pr.name IN %(pricing_rules)s"
+        values["pricing_rules"] = tuple(pricing_rules)
+        delete_filters["pricing_rule"] = ["in", list(pricing_rules)]
+
+    if item_codes:
+        conditions += " AND i.name IN %(item_codes)s"
+        values["item_codes"] = tuple(item_codes)
+        delete_filters["item_code"] = ["in", list(item_codes)]
+
+    frappe.db.delete("Pricing Rule Membership", delete_filters or None)
+
+    timestamp = now()
+    rows = [
+        (
+            frappe.generate_hash(length=12),
+            *row,
+            timestamp,
+            timestamp,
+            "Administrator",
+            "Administrator",
+        )
+        for row in frappe.db.sql(get_membership_query(conditions), values)
+    ]
+    if rows:
+        frappe.db.bulk_insert("Pricing Rule Membership", MEMBERSHIP_FIELDS, rows)
+
+
+def rebuild_pricing_rule_memberships():
+    """
+    Rebuild the whole index, dropping rules that expired. Runs daily so rules
+    reaching their valid_upto date fall out of the index.
+
+    Usage: bench --site <site> execute keno_store.keno_store.pricing_rule_index.rebuild_pricing_rule_memberships
+    """
+    refresh_memberships()
+
+
+def has_cross_line_pricing_rules(item_codes):
+    """
+    Whether an active selling rule covering any of the items can change the
+    price of other cart lines: mixed conditions, cumulative and apply on other
+    rules, product discounts (free items) and rules applied on the transaction.
+    """
+    item_codes = [item_code for item_code in item_codes if item_code]
+    if not item_codes:
+        return False
+
+    return bool(
+        frappe.db.sql(
+            """
+            SELECT pr.name
+            FROM `tabPricing Rule Membership` m
+            INNER JOIN `tabPricing Rule` pr ON pr.name = m.pricing_rule
+            WHERE m.item_code IN %(item_codes)s
+                AND (m.valid_from IS NULL OR m.valid_from <= %(today)s)
+                AND (m.valid_upto IS NULL OR m.valid_upto >= %(today)s)
+                AND pr.selling = 1
+                AND (pr.mixed_conditions = 1 OR pr.is_cumulative = 1
+                    OR IFNULL(pr.apply_rule_on_other, '') != ''
+                    OR pr.price_or_product_discount = 'Product')
+
+            UNION ALL
+
+            SELECT pr.name
+            FROM `tabPricing Rule` pr
+            WHERE pr.apply_on = 'Transaction' AND pr.selling = 1 AND pr.disable = 0
+                AND (pr.valid_from IS NULL OR pr.valid_from <= %(today)s)
+                AND (pr.valid_upto IS NULL OR pr.valid_upto >= %(today)s)
+
+            LIMIT 1
+            """,
+            {"item_codes": item_codes, "today": nowdate()},
+        )
+    )
+
+
+def get_offer_website_items(
+    fields,
+    filters,
+    order_by="wi.ranking DESC, wi.name DESC",
+    start=0,
+    page_length=None,
+    with_total=False,
+    cursor=None,
+):
+    """
+    Published website items covered by active pricing rules, in one query.
+
+    Args:
+        fields (list): Website Item columns to return.
+        filters (dict): Any of pricing_rules, rule_title, promotional_scheme and
+            apply_on to restrict the rules, and min_discount for their discount.
+        order_by (str): ORDER BY clause on the `wi` (Website Item) alias.
+        start (int), page_length (int): Pagination, everything when page_length is empty.
+        with_total (bool): Also count the matching items.
+        cursor (str): `encode_cursor(ranking, name)` of the last item of the previous
+            page, continues after it in the default order instead of using `start`.
+
+    Returns:
+        tuple: (items with the earliest `valid_upto` of their rules, total or None)
+    """
+    conditions = [
+        "(m.valid_from IS NULL OR m.valid_from <= %(today)s)",
+        "(m.valid_upto IS NULL OR m.valid_upto >= %(today)s)",
+    ]
+    values = {"today": nowdate(), "start": cint(start), "page_length": cint(page_length)}
+
+    if filters.get("pricing_rules"):
+        conditions.append("m.pricing_rule IN %(pricing_rules)s")
+        values["pricing_rules"] = tuple(filters["pricing_rules"])
+    for field in ("rule_title", "promotional_scheme", "apply_on"):
+        if filters.get(field):
+            conditions.append(f"m.{field} = %({field})s")
+            values[field] = filters[field]
+    if filters.get("min_discount") is not None:
+        conditions.append("m.discount_percentage > %(min_discount)s")
+        values["min_discount"] = filters["min_discount"]
+
+    if cursor:
+        values["cursor_ranking"], values["cursor_name"] = decode_cursor(cursor)
+        values["start"] = 0
+        order_by = "wi.ranking DESC, wi.name DESC"
+        conditions.append(
+            """(wi.ranking < %(cursor_ranking)s
+            OR (wi.ranking = %(cursor_ranking)s AND wi.name < %(cursor_name)s))"""
+        )
+
+    conditions = " AND ".join(conditions)
+    limit = "LIMIT %(start)s, %(page_length)s" if page_length else ""
+
+    items = frappe.db.sql(
+        f"""
+        SELECT {", ".join(f"wi.{field}" for field in fields)}, MIN(m.valid_upto) AS valid_upto
+        FROM `tabPricing Rule Membership` m
+        INNER JOIN `tabWebsite Item` wi ON wi.item_code = m.item_code AND wi.published = 1
+        WHERE {conditions}
+        GROUP BY wi.name
+        ORDER BY {order_by}
+        {limit}
+        """,
+        values,
+        as_dict=True,
+    )
+
+    total = None
+    if with_total and not cursor:
+        total = frappe.db.sql(
+            f"""
+            SELECT COUNT(DISTINCT wi.name)
+            FROM `tabPricing Rule Membership` m
+            INNER JOIN `tabWebsite Item` wi ON wi.item_code = m.item_code AND wi.published = 1
+            WHERE {conditions}
+            """,
+            values,
+        )[0][0]
+
+    return items, total
+
+
+def on_pricing_rule_update(doc, method):
+    refresh_memberships(pricing_rules=[doc.name])
+
+
+def on_pricing_rule_trash(doc, method):
+    frappe.db.delete("Pricing Rule Membership", {"pricing_rule": doc.name})
+
+
+def on_promotional_scheme_update(doc, method):
+    pricing_rules = frappe.get_all(
+        "Pricing Rule", filters={"promotional_scheme": doc.name}, pluck="name"
+    )
+    if pricing_rules:
+        refresh_memberships(pricing_rules=pricing_rules)
+
+
+def on_promotional_scheme_trash(doc, method):
+    frappe.db.delete("Pricing Rule Membership", {"promotional_scheme": doc.name})
+
+
+def on_item_update(doc, method):
+    # Group and brand rules cover items through these fields
+    if any(doc.has_value_changed(field) for field in ("item_group", "brand", "disabled")):
+        refresh_memberships(item_codes=[doc.name])
+
+
+def on_item_trash(doc, method):
+    frappe.db.delete("Pricing Rule Membership", {"item_code": doc.name})
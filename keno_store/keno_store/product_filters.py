@@ -0,0 +1,239 @@
+import frappe
+from frappe.utils import cint, flt, nowdate
+from webshop.webshop.doctype.override_doctype.item_group import get_child_groups_for_website
+from webshop.webshop.product_data_engine.filters import ProductFiltersBuilder
+from webshop.webshop.product_data_engine.query import ProductQuery
+
+from keno_store.keno_store.catalog import enrich_items, get_selling_price_list
+from keno_store.keno_store.response_cache import get_cached_payload
+
+# Listings carry stock and prices, so they are only cached for a short while
+PRODUCT_FILTER_CACHE_TTL = 5 * 60
+PRODUCT_FILTER_CACHE_TAGS = ["Website Item", "Item Group"]
+DISCOUNT_BUCKET_SIZE = 10
+# Set per request on top of cached listings
+USER_FLAG_FIELDS = ("in_cart", "wished")
+
+
+def get_product_listing(
+    search=None, field_filters=None, attribute_filters=None, item_group=None, start=0
+):
+    """
+    Return the product listing of a filter query, cached per canonical query
+    and price list for `PRODUCT_FILTER_CACHE_TTL` seconds.
+
+    Raises the query engine's exception when the query fails, failed queries
+    are not cached.
+    """
+    args = {
+        "search": (search or "").strip() or None,
+        "field_filters": get_canonical_filters(field_filters),
+        "attribute_filters": get_canonical_filters(attribute_filters),
+        "item_group": item_group or None,
+        "start": cint(start),
+    }
+
+    payload = get_cached_payload(
+        "keno_store.keno_store.product_filters.get_product_listing",
+        PRODUCT_FILTER_CACHE_TAGS,
+        lambda: build_product_filter_data(**args),
+        kwargs={**args, "price_list": get_selling_price_list()},
+        ttl=PRODUCT_FILTER_CACHE_TTL,
+    )["payload"]
+
+    # Cached listings are shared by every user, cart and wishlist flags are set per request
+    items = [frappe._dict(item) for item in payload["items"]]
+    set_user_flags(items)
+
+    return {**payload, "items": items}
+
+
+def get_canonical_filters(filters):
+    """Drop empty filters and sort filter values, so equivalent queries share a cache entry."""
+    canonical = {}
+    for field, values in (filters or {}).items():
+        if isinstance(values, (list, tuple)):
+            values = sorted({str(value) for value in values if value not in (None, "")})
+        if values not in (None, "", []):
+            canonical[field] = values
+
+    return canonical
+
+
+def build_product_filter_data(search, field_filters, attribute_filters, item_group, start):
+    sub_categories = []
+    if item_group:
+        sub_categories = get_child_groups_for_website(item_group, immediate=True)
+
+    engine = ProductQuery()
+    result = engine.query(
+        attribute_filters,
+        field_filters,
+        search_term=search,
+        start=start,
+        item_group=item_group,
+    )
+
+    # The engine keeps the filters of the query, attribute matches included
+    facets = get_product_facets(get_scope_item_codes(engine))
+
+    # discount filter data, from the discounts of every matching item rather than the page
+    filters = {}
+    discount_range = facets.pop("discount_range")
+    if result["discounts"] and discount_range:
+        filter_engine = ProductFiltersBuilder()
+        filters["discount_filters"] = filter_engine.get_discount_filters(discount_range)
+
+    # Adding ratings and cart qty limits to each product, the query engine
+    # already takes care of price and stock
+    enrich_items(result["items"], price=False, stock=False)
+    for item in result["items"]:
+        for field in USER_FLAG_FIELDS:
+            item.pop(field, None)
+
+    return {
+        "items": result["items"] or [],
+        "filters": filters,
+        "facets": facets,
+        "settings": engine.settings,
+        "sub_categories": sub_categories,
+        "items_count": result["items_count"],
+    }
+
+
+def set_user_flags(items):
+    """Set `in_cart` and `wished` of listing items for the session user, in one query each."""
+    item_codes = [item.item_code for item in items]
+    user = frappe.session.user
+
+    in_cart, wished = set(), set()
+    if item_codes and user != "Guest":
+        # The latest open cart of the user, as the query engine picks it
+        in_cart = set(
+            frappe.db.sql_list(
+                """
+                SELECT DISTINCT qi.item_code
+                FROM `tabQuotation Item` qi
+                WHERE qi.parenttype = 'Quotation' AND qi.item_code IN %(item_codes)s
+                    AND qi.parent = (
+                        SELECT q.name FROM `tabQuotation` q
+                        WHERE q.contact_email = %(user)s AND q.order_type = 'Shopping Cart'
+                            AND q.docstatus = 0
+                        ORDER BY q.modified DESC
+                        LIMIT 1
+                    )
+                """,
+                {"item_codes": item_codes, "user": user},
+            )
+        )
+        wished = set(
+            frappe.get_all(
+                "Wishlist Item",
+                filters={"parent": user, "item_code": ["in", item_codes]},
+                pluck="item_code",
+            )
+        )
+
+    for item in items:
+        item.in_cart = item.item_code in in_cart
+        item.wished = item.item_code in wished
+
+
+def get_scope_item_codes(engine):
+    """
+    Item codes of all the items matching a filter query, from the filters the
+    query engine built for it, so facets count exactly what the listing pages through.
+    """
+    return frappe.get_all(
+        "Website Item",
+        filters=engine.filters,
+        or_filters=engine.or_filters,
+        pluck="item_code",
+        distinct=True,
+    )
+
+
+def get_product_facets(item_codes):
+    """
+    Brand, attribute value and discount bucket counts of the given items, in
+    one aggregate query.
+
+    Discounts are the best active pricing rule discount of each item, from the
+    pricing rule membership index.
+    """
+    facets = {"brands": [], "attributes": {}, "discounts": [], "discount_range": []}
+    if not item_codes:
+        return facets
+
+    values = {
+        "item_codes": item_codes,
+        "today": nowdate(),
+        "bucket_size": DISCOUNT_BUCKET_SIZE,
+    }
+
+    rows = frappe.db.sql(
+        """
+        WITH scope AS (
+            SELECT wi.item_code, wi.brand
+            FROM `tabWebsite Item` wi
+            WHERE wi.item_code IN %(item_codes)s
+        ),
+        item_discounts AS (
+            SELECT m.item_code, MAX(m.discount_percentage) AS discount
+            FROM `tabPricing Rule Membership` m
+            INNER JOIN scope ON scope.item_code = m.item_code
+            WHERE m.discount_percentage > 0
+                AND (m.valid_from IS NULL OR m.valid_from <= %(today)s)
+                AND (m.valid_upto IS NULL OR m.valid_upto >= %(today)s)
+            GROUP BY m.item_code
+        )
+        SELECT 'brand' AS facet, NULL AS attribute, brand AS value, COUNT(*) AS count,
+            NULL AS min_value, NULL AS max_value
+        FROM scope
+        WHERE IFNULL(brand, '') != ''
+        GROUP BY brand
+
+        UNION ALL
+
+        SELECT 'attribute', iva.attribute, iva.attribute_value, COUNT(DISTINCT scope.item_code),
+            NULL, NULL
+        FROM scope
+        INNER JOIN `tabItem Variant Attribute` iva ON iva.parent = scope.item_code
+        GROUP BY iva.attribute, iva.attribute_value
+
+        UNION ALL
+
+        SELECT 'discount', NULL, FLOOR(discount / %(bucket_size)s) * %(bucket_size)s, COUNT(*),
+            MIN(discount), MAX(discount)
+        FROM item_discounts
+        GROUP BY FLOOR(discount / %(bucket_size)s)
+        """,
+        values,
+        as_dict=True,
+    )
+
+    for row in rows:
+        if row.facet == "brand":
+            facets["brands"].append({"brand": row.value, "count": cint(row.count)})
+        elif row.facet == "attribute":
+            facets["attributes"].setdefault(row.attribute, []).append(
+                {"value": row.value, "count": cint(row.count)}
+            )
+        else:
+            bucket = cint(flt(row.value))
+            facets["discounts"].append(
+                {"from": bucket, "to": bucket + DISCOUNT_BUCKET_SIZE, "count": cint(row.count)}
+            )
+
+    facets["brands"].sort(key=lambda facet: (-facet["count"], facet["brand"]))
+    facets["discounts"].sort(key=lambda facet: facet["from"])
+
+    # [min, max] discount, in the format of the query engine's discounts
+    discounts = [row for row in rows if row.facet == "discount"]
+    if discounts:
+        facets["discount_range"] = [
+            min(flt(row.min_value) for row in discounts),
+            max(flt(row.max_value) for row in discounts),
+        ]
+
+    return facets
@@ -0,0 +1,223 @@
+import re
+
+import frappe
+from frappe.utils import cint, now, strip_html_tags
+
+from keno_store.utils import decode_cursor
+
+
+# Relevance of a token depending on the field it was found in
+FIELD_WEIGHTS = {
+    "item_name": 3,
+    "brand": 2,
+    "item_group": 1.5,
+    "description": 1,
+}
+
+# The last query term is matched as a prefix only once it is this long,
+# shorter prefixes would match a large part of the index
+MIN_PREFIX_LENGTH = 2
+
+STOP_WORDS = {"a", "an", "and", "for", "in", "of", "on", "or", "the", "to", "with"}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Split text into lowercase search tokens, ignoring HTML and stop words."""
+    if not text:
+        return []
+
+    text = strip_html_tags(str(text)).lower()
+    return [token for token in TOKEN_PATTERN.findall(text) if token not in STOP_WORDS]
+
+
+def get_item_tokens(item):
+    """Return {token: weight} for a website item, summing weights across fields."""
+    tokens = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in set(tokenize(item.get(field))):
+            tokens[token] = tokens.get(token, 0) + weight
+
+    return tokens
+
+
+def get_indexable_items(item_codes=None):
+    """Published website items of enabled items, with the fields being indexed."""
+    conditions = "AND wi.item_code IN %(item_codes)s" if item_codes else ""
+
+    return frappe.db.sql(
+        f"""
+        SELECT
+            wi.name AS website_item,
+            wi.item_code,
+            COALESCE(NULLIF(wi.web_item_name, ''), wi.item_name) AS item_name,
+            wi.brand,
+            wi.item_group,
+            CONCAT_WS(' ', wi.short_description, wi.description) AS description
+        FROM `tabWebsite Item` wi
+        INNER JOIN `tabItem` i ON i.name = wi.item_code
+        WHERE wi.published = 1 AND i.disabled = 0 {conditions}
+        """,
+        {"item_codes": tuple(item_codes or ())},
+        as_dict=True,
+    )
+
+
+def write_postings(items):
+    """Insert the index rows of the given website items."""
+    timestamp = now()
+    rows = []
+    for item in items:
+        for token, weight in get_item_tokens(item).items():
+            rows.append(
+                (
+                    frappe.generate_hash(length=12),
+                    token[:140],
+                    item.item_code,
+                    item.website_item,
+                    weight,
+                    timestamp,
+                    timestamp,
+                    "Administrator",
+                    "Administrator",
+                )
+            )
+
+    if rows:
+        frappe.db.bulk_insert(
+            "Item Search Token",
+            [
+                "name",
+                "token",
+                "item_code",
+                "website_item",
+                "weight",
+                "creation",
+                "modified",
+                "owner",
+                "modified_by",
+            ],
+            rows,
+        )
+
+
+def reindex_items(item_codes):
+    """Refresh the index rows of the given items."""
+    if not item_codes:
+        return
+
+    frappe.db.delete("Item Search Token", {"item_code": ["in", item_codes]})
+    write_postings(get_indexable_items(item_codes))
+
+
+def rebuild_search_index():
+    """
+    Rebuild the whole product search index.
+
+    Usage: bench --site <site> execute keno_store.keno_store.product_search.rebuild_search_index
+    """
+    frappe.db.delete("Item Search Token")
+    write_postings(get_indexable_items())
+
+
+def search_items(query, start=0, page_length=10, cursor=None):
+    """
+    Search published website items.
+
+    All query terms have to match (the last one as a prefix, to support
+    search-as-you-type) and results are ranked by the summed weight of the
+    matched tokens.
+
+    `cursor` (from `encode_cursor(score, item_code)` of the last result)
+    continues after that result instead of skipping `start` results, no total
+    is computed then.
+
+    Returns:
+        tuple: (list of {"item_code", "website_item", "score"}, total hits estimate or None)
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return [], 0
+
+    values = {}
+    postings = []
+    for idx, term in enumerate(terms):
+        values[f"term_{idx}"] = term
+        condition = f"token = %(term_{idx})s"
+        if idx == len(terms) - 1 and len(term) >= MIN_PREFIX_LENGTH:
+            values[f"term_{idx}"] = term + "%"
+            condition = f"token LIKE %(term_{idx})s"
+
+        postings.append(
+            f"""
+            SELECT item_code, website_item, {idx} AS term, MAX(weight) AS weight
+            FROM `tabItem Search Token`
+            WHERE {condition}
+            GROUP BY item_code, website_item
+            """
+        )
+
+    values.update(
+        {"term_count": len(terms), "start": cint(start), "page_length": cint(page_length)}
+    )
+    postings = " UNION ALL ".join(postings)
+
+    after_cursor = ""
+    if cursor:
+        values["cursor_score"], values["cursor_item_code"] = decode_cursor(cursor)
+        values["start"] = 0
+        after_cursor = """AND (score < %(cursor_score)s
+            OR (score = %(cursor_score)s AND item_code > %(cursor_item_code)s))"""
+
+    results = frappe.db.sql(
+        f"""
+        SELECT item_code, website_item, SUM(weight) AS score
+        FROM ({postings}) postings
+        GROUP BY item_code, website_item
+        HAVING COUNT(*) = %(term_count)s {after_cursor}
+        ORDER BY score DESC, item_code
+        LIMIT %(start)s, %(page_length)s
+        """,
+        values,
+        as_dict=True,
+    )
+
+    if cursor:
+        return results, None
+
+    if cint(start) == 0 and len(results) < cint(page_length):
+        # Everything fits in the first page, the count is exact
+        return results, len(results)
+
+    # The rarest term bounds the number of matches, which is good enough for
+    # pagination and only needs the per-term posting counts
+    counts = frappe.db.sql(
+        f"SELECT COUNT(*) FROM ({postings}) postings GROUP BY term",
+        values,
+    )
+    total = min(cint(count[0]) for count in counts) if counts else 0
+    return results, max(total, cint(start) + len(results))
+
+
+def on_website_item_update(doc, method):
+    reindex_items([doc.item_code])
+
+
+def on_website_item_trash(doc, method):
+    frappe.db.delete("Item Search Token", {"website_item": doc.name})
+
+
+def on_item_update(doc, method):
+    if not frappe.db.exists("Website Item", {"item_code": doc.name}):
+        return
+
+    if any(
+        doc.has_value_changed(field)
+        for field in ("item_name", "brand", "item_group", "description", "disabled")
+    ):
+        reindex_items([doc.name])
+
+
+def on_item_trash(doc, method):
+    frappe.db.delete("Item Search Token", {"item_code": doc.name})
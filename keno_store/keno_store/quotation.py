@@ -0,0 +1,279 @@
+import frappe
+
+CART_SNAPSHOT_KEY = "keno_store:cart_snapshot"
+# Snapshots of abandoned carts expire, a miss rebuilds the snapshot from the Quotation
+CART_SNAPSHOT_TTL = 24 * 60 * 60
+# Guest session id -> name of its open cart Quotation, one key per session. Guest
+# sessions are throwaway, a miss falls back to the indexed lookup
+GUEST_CART_KEY = "keno_store:guest_cart"
+GUEST_CART_KEY_TTL = 7 * 24 * 60 * 60
+
+CART_ITEM_FIELDS = (
+    "name",
+    "item_code",
+    "item_name",
+    "qty",
+    "price_list_rate",
+    "rate",
+    "discount_amount",
+    "amount",
+    "image",
+    "item_group",
+    "brand",
+    "warehouse",
+    "additional_notes",
+)
+ADDRESS_FIELDS = ("address_line1", "address_line2", "city", "state", "pincode", "country")
+
+
+def is_cart(doc):
+    return doc.order_type == "Shopping Cart" and doc.docstatus == 0
+
+
+def get_guest_cart_name_key(session_id):
+    return f"{GUEST_CART_KEY}:{session_id}"
+
+
+def set_guest_cart_name(session_id, quotation_name):
+    frappe.cache().set_value(
+        get_guest_cart_name_key(session_id), quotation_name, expires_in_sec=GUEST_CART_KEY_TTL
+    )
+
+
+def get_guest_cart_name(session_id):
+    """
+    Return the name of the open cart Quotation of a guest session, from the
+    session mapping, falling back to the indexed `custom_session_id` lookup.
+    """
+    if not session_id:
+        return None
+
+    quotation_name = frappe.cache().get_value(get_guest_cart_name_key(session_id))
+    if quotation_name is None:
+        quotation_name = frappe.db.get_value(
+            "Quotation", {"custom_session_id": session_id, "docstatus": 0}
+        )
+        if quotation_name:
+            set_guest_cart_name(session_id, quotation_name)
+
+    return quotation_name
+
+
+def get_guest_cart(session_id):
+    """Return the open cart Quotation of a guest session, None when there is no cart."""
+    quotation_name = get_guest_cart_name(session_id)
+    return frappe.get_doc("Quotation", quotation_name) if quotation_name else None
+
+
+def clear_guest_cart(session_id):
+    if session_id:
+        frappe.cache().delete_value(get_guest_cart_name_key(session_id))
+
+
+def get_cart_snapshot_key(quotation_name):
+    return f"{CART_SNAPSHOT_KEY}:{quotation_name}"
+
+
+def get_cart_snapshot(quotation_name):
+    """
+    Return the snapshot of a cart Quotation, everything cart reads need
+    without loading the document. Built from the document on a miss.
+    """
+    if not quotation_name:
+        return None
+
+    snapshot = frappe.cache().get_value(get_cart_snapshot_key(quotation_name))
+    if snapshot is None:
+        if not frappe.db.exists("Quotation", {"name": quotation_name, "docstatus": 0}):
+            return None
+
+        snapshot = save_cart_snapshot(frappe.get_doc("Quotation", quotation_name))
+
+    return snapshot
+
+
+def save_cart_snapshot(quotation):
+    snapshot = build_cart_snapshot(quotation)
+    if not quotation.is_new():
+        frappe.cache().set_value(
+            get_cart_snapshot_key(quotation.name), snapshot, expires_in_sec=CART_SNAPSHOT_TTL
+        )
+
+    return snapshot
+
+
+def build_cart_snapshot(quotation):
+    """Denormalized copy of a cart Quotation, with its coupon code and formatted addresses."""
+    addresses = get_formatted_addresses(
+        [quotation.customer_address, quotation.shipping_address_name]
+    )
+    billing_address = addresses.get(quotation.customer_address)
+    shipping_address = addresses.get(quotation.shipping_address_name)
+
+    coupon_code = None
+    if quotation.coupon_code:
+        coupon_code = frappe.db.get_value("Coupon Code", quotation.coupon_code, "coupon_code")
+
+    return frappe._dict(
+        {
+            "name": quotation.name,
+            "party_name": quotation.party_name,
+            "session_id": quotation.custom_session_id,
+            "contact_name": quotation.contact_display,
+            "contact_mobile": quotation.contact_mobile,
+            "contact_email": quotation.contact_email,
+            "customer_address": quotation.customer_address,
+            "shipping_address_name": quotation.shipping_address_name,
+            "total_qty": quotation.total_qty,
+            "net_total": quotation.net_total,
+            "total": quotation.total,
+            "discount_amount": quotation.discount_amount,
+            "taxes_and_charges": quotation.base_total_taxes_and_charges,
+            "grand_total": quotation.grand_total,
+            "rounding_adjustment": quotation.rounding_adjustment,
+            "rounded_total": quotation.rounded_total,
+            "in_words": quotation.in_words,
+            "coupon_code": coupon_code,
+            "is_coupon_applied": bool(quotation.coupon_code),
+            "is_ready_for_order": is_ready_for_order(quotation, billing_address, shipping_address),
+            "delivery_option": {
+                "delivery_method": quotation.custom_delivery_method,
+                "delivery_type": quotation.custom_delivery_type,
+                "delivery_slot": quotation.custom_delivery_slot,
+                "store": quotation.custom_pickup_store,
+                "store_pickup_time": quotation.custom_store_pickup_datetime,
+            },
+            "items": [
+                frappe._dict({field: item.get(field) for field in CART_ITEM_FIELDS})
+                for item in quotation.get("items")
+            ],
+            "taxes": [
+                {
+                    "tax_type": tax.description,
+                    "tax_rate": tax.rate,
+                    "tax_amount": tax.tax_amount,
+                }
+                for tax in quotation.get("taxes")
+            ],
+            "billing_address": billing_address,
+            "shipping_address": shipping_address,
+        }
+    )
+
+
+def get_formatted_addresses(address_names):
+    """Return {address name: formatted address} in one query."""
+    address_names = list({name for name in address_names if name})
+    if not address_names:
+        return {}
+
+    addresses = frappe.get_all(
+        "Address",
+        filters={"name": ["in", address_names]},
+        fields=["name", *ADDRESS_FIELDS],
+    )
+    return {
+        address.name: {field: address[field] for field in ADDRESS_FIELDS}
+        for address in addresses
+    }
+
+
+def is_ready_for_order(quotation, billing_address, shipping_address):
+    if quotation.custom_delivery_method == "Home Delivery":
+        return bool(
+            billing_address
+            and shipping_address
+            and quotation.custom_delivery_slot
+            and quotation.contact_display
+            and quotation.contact_mobile
+        )
+    elif quotation.custom_delivery_method == "Store Pickup":
+        return bool(quotation.custom_pickup_store and quotation.custom_store_pickup_datetime)
+
+    return False
+
+
+def clear_cart_snapshot(quotation_name):
+    frappe.cache().delete_value(get_cart_snapshot_key(quotation_name))
+
+
+def clear_cart_snapshots(filters):
+    """Drop the snapshots of the open carts matching any of the given filters."""
+    quotation_names = frappe.get_all(
+        "Quotation",
+        filters={"docstatus": 0, "order_type": "Shopping Cart"},
+        or_filters=filters,
+        pluck="name",
+    )
+    if quotation_names:
+        frappe.cache().delete_value([get_cart_snapshot_key(name) for name in quotation_names])
+
+
+def on_address_update(doc, method=None, *args):
+    """Address hook, snapshots hold the formatted addresses of their cart."""
+    clear_cart_snapshots({"customer_address": doc.name, "shipping_address_name": doc.name})
+
+
+def on_coupon_code_update(doc, method=None, *args):
+    """Coupon Code hook, snapshots hold the code text of their cart's coupon."""
+    clear_cart_snapshots({"coupon_code": doc.name})
+
+
+def on_quotation_insert(doc, method=None):
+    """Map the guest session to its new cart."""
+    if doc.custom_session_id and is_cart(doc):
+        set_guest_cart_name(doc.custom_session_id, doc.name)
+
+
+def on_quotation_update(doc, method=None):
+    """Refresh the snapshot whenever a cart is saved."""
+    if is_cart(doc):
+        save_cart_snapshot(doc)
+    else:
+        clear_cart_snapshot(doc.name)
+
+
+def on_quotation_close(doc, method=None):
+    """Submit, cancel and trash hook, the Quotation is no longer a cart."""
+    clear_cart_snapshot(doc.name)
+    clear_guest_cart(doc.custom_session_id)
+
+
+def get_cart_summary(snapshot):
+    """Cart summary returned by get_cart_quotation."""
+    return {
+        "session_id": snapshot.session_id,
+        "contact_name": snapshot.contact_name,
+        "contact_mobile": snapshot.contact_mobile,
+        "contact_email": snapshot.contact_email,
+        "net_total": snapshot.net_total,
+        "total": snapshot.total,
+        "discount_amount": snapshot.discount_amount,
+        "taxes_and_charges": snapshot.taxes_and_charges,
+        "grand_total": snapshot.grand_total,
+        "rounding_adjustment": snapshot.rounding_adjustment,
+        "rounded_total": snapshot.rounded_total,
+        "in_words": snapshot.in_words,
+        "coupon_code": snapshot.coupon_code,
+        "is_coupon_applied": snapshot.is_coupon_applied,
+        "is_ready_for_order": snapshot.is_ready_for_order,
+        "delivery_option": snapshot.delivery_option,
+        "items": [
+            {
+                "item_code": item.item_code,
+                "item_name": item.item_name,
+                "quantity": item.qty,
+                "base_price": item.price_list_rate,
+                "price": item.rate,
+                "discount_amount": item.discount_amount,
+                "amount": item.amount,
+                "image": item.image,
+                "item_category": item.item_group,
+                "item_brand": item.brand,
+            }
+            for item in snapshot["items"]
+        ],
+        "taxes": snapshot.taxes,
+        "billing_address": snapshot.billing_address,
+        "shipping_address": snapshot.shipping_address,
+    }
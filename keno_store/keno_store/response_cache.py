@@ -0,0 +1,137 @@
+import functools
+import hashlib
+import json
+
+import frappe
+
+from keno_store.utils import HTTPStatus, is_not_modified
+
+RESPONSE_CACHE_PREFIX = "keno_store:response_cache"
+RESPONSE_CACHE_TTL = 6 * 60 * 60
+
+
+def get_tag_key(tag):
+    return f"{RESPONSE_CACHE_PREFIX}:tag:{frappe.scrub(tag)}"
+
+
+def get_tag_generation(tag):
+    """Current generation of a tag, a new one is started whenever the tag is cleared."""
+    return frappe.cache().get_value(
+        get_tag_key(tag), generator=lambda: frappe.generate_hash(length=8)
+    )
+
+
+def get_response_cache_key(method, tags, args, kwargs):
+    """
+    Key of a cached response, built from the method, its normalized arguments
+    and the generation of each tag so a tag change misses every older entry.
+    """
+    normalized_args = json.dumps(
+        [
+            [normalize_arg(arg) for arg in args],
+            {key: normalize_arg(value) for key, value in sorted(kwargs.items()) if value is not None},
+        ],
+        separators=(",", ":"),
+    )
+    generations = ":".join(get_tag_generation(tag) for tag in tags)
+    args_hash = hashlib.sha256(normalized_args.encode()).hexdigest()[:16]
+
+    return f"{RESPONSE_CACHE_PREFIX}:{method}:{generations}:{args_hash}"
+
+
+def normalize_arg(value):
+    """Canonical form of an argument, dicts and lists are compared by content."""
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, sort_keys=True, default=str)
+
+    return str(value).strip()
+
+
+def get_cached_payload(method, tags, generator, args=(), kwargs=None, ttl=RESPONSE_CACHE_TTL):
+    """
+    Return the cached {"etag", "payload"} entry for a method and its arguments,
+    calling `generator` to build the payload on a miss.
+    """
+    key = get_response_cache_key(method, tags, args, kwargs or {})
+    cache = frappe.cache()
+
+    entry = cache.get_value(key)
+    if entry is None:
+        payload = generator()
+        entry = {"etag": get_payload_etag(payload), "payload": payload}
+        cache.set_value(key, entry, expires_in_sec=ttl)
+
+    return entry
+
+
+def get_payload_etag(payload):
+    content = frappe.as_json(payload, indent=None)
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def is_error_response():
+    status = frappe.local.response.get("http_status_code")
+    data = frappe.response.get("data")
+    return (status and status != HTTPStatus.OK) or (
+        isinstance(data, dict) and "error" in data
+    )
+
+
+def cached_response(tags=(), ttl=RESPONSE_CACHE_TTL, max_age=300):
+    """
+    Cache the response of a whitelisted GET method in Redis.
+
+    Both the return value and `frappe.response["data"]` are cached per method and
+    arguments, and dropped when any of `tags` (doctype names) is cleared. The
+    response carries an ETag, matching If-None-Match requests get an empty 304.
+    Error responses are never cached.
+
+    Usage:
+        @frappe.whitelist(allow_guest=True, methods=["GET"])
+        @cached_response(tags=["Item Group"])
+        def get_item_groups(limit=None):
+            ...
+    """
+
+    def decorator(fn):
+        method = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            request = getattr(frappe.local, "request", None)
+            if request and request.method != "GET":
+                return fn(*args, **kwargs)
+
+            key = get_response_cache_key(method, tags, args, kwargs)
+            cache = frappe.cache()
+
+            entry = cache.get_value(key)
+            if entry is None:
+                result = fn(*args, **kwargs)
+                if is_error_response():
+                    return result
+
+                payload = {"result": result, "data": frappe.response.get("data")}
+                entry = {"etag": get_payload_etag(payload), "payload": payload}
+                cache.set_value(key, entry, expires_in_sec=ttl)
+
+            if is_not_modified(entry["etag"], max_age=max_age):
+                frappe.response.pop("data", None)
+                return
+
+            if entry["payload"]["data"] is not None:
+                frappe.response["data"] = entry["payload"]["data"]
+            return entry["payload"]["result"]
+
+        return wrapper
+
+    return decorator
+
+
+def clear_response_cache_tag(tag):
+    frappe.cache().delete_value(get_tag_key(tag))
+
+
+def clear_doctype_tag(doc, method=None, *args):
+    """doc_events hook, drops the cached responses tagged with the doctype."""
+    clear_response_cache_tag(doc.doctype)
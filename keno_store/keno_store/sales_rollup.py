@@ -0,0 +1,205 @@
+import frappe
+from frappe.utils import add_days, add_months, cint, flt, getdate, now, nowdate
+
+from keno_store.utils import decode_cursor
+
+
+def get_item_qtys(doc):
+    """Return {item_code: qty} for the items of a Sales Invoice."""
+    qtys = {}
+    for item in doc.items:
+        if item.item_code:
+            qtys[item.item_code] = qtys.get(item.item_code, 0) + flt(item.qty)
+
+    return qtys
+
+
+def update_sales_rollups(item_qtys, sale_date):
+    """
+    Add the given quantities to the daily rollup of `sale_date` and to the
+    all-time summary. Negative quantities take sales back out.
+    """
+    if not item_qtys:
+        return
+
+    sale_date = getdate(sale_date)
+    timestamp = now()
+
+    rollup_rows, summary_rows, values = [], [], {
+        "sale_date": sale_date,
+        "timestamp": timestamp,
+    }
+    for idx, (item_code, qty) in enumerate(item_qtys.items()):
+        values[f"item_{idx}"] = item_code
+        values[f"qty_{idx}"] = qty
+        values[f"name_{idx}"] = f"{item_code}-{sale_date}"
+        rollup_rows.append(
+            f"""(%(name_{idx})s, %(item_{idx})s, %(sale_date)s, %(qty_{idx})s,
+            %(timestamp)s, %(timestamp)s, 'Administrator', 'Administrator', 0, 0)"""
+        )
+        summary_rows.append(
+            f"""(%(item_{idx})s, %(item_{idx})s, %(qty_{idx})s,
+            %(timestamp)s, %(timestamp)s, 'Administrator', 'Administrator', 0, 0)"""
+        )
+
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tabItem Sales Rollup`
+            (name, item_code, sale_date, qty,
+            creation, modified, owner, modified_by, docstatus, idx)
+        VALUES {", ".join(rollup_rows)}
+        ON DUPLICATE KEY UPDATE
+            qty = qty + VALUES(qty),
+            modified = VALUES(modified)
+        """,
+        values,
+    )
+
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tabItem Sales Summary`
+            (name, item_code, total_qty,
+            creation, modified, owner, modified_by, docstatus, idx)
+        VALUES {", ".join(summary_rows)}
+        ON DUPLICATE KEY UPDATE
+            total_qty = total_qty + VALUES(total_qty),
+            modified = VALUES(modified)
+        """,
+        values,
+    )
+
+
+def on_sales_invoice_submit(doc, method):
+    update_sales_rollups(get_item_qtys(doc), doc.posting_date)
+
+
+def on_sales_invoice_cancel(doc, method):
+    item_qtys = {item_code: -qty for item_code, qty in get_item_qtys(doc).items()}
+    update_sales_rollups(item_qtys, doc.posting_date)
+
+
+def rebuild_sales_rollups():
+    """
+    Rebuild the daily rollups and all-time summaries from submitted Sales Invoices.
+
+    Usage: bench --site <site> execute keno_store.keno_store.sales_rollup.rebuild_sales_rollups
+    """
+    timestamp = now()
+
+    frappe.db.delete("Item Sales Rollup")
+    frappe.db.sql(
+        """
+        INSERT INTO `tabItem Sales Rollup`
+            (name, item_code, sale_date, qty,
+            creation, modified, owner, modified_by, docstatus, idx)
+        SELECT
+            CONCAT(sii.item_code, '-', si.posting_date), sii.item_code,
+            si.posting_date, SUM(sii.qty),
+            %(timestamp)s, %(timestamp)s, 'Administrator', 'Administrator', 0, 0
+        FROM `tabSales Invoice Item` sii
+        INNER JOIN `tabSales Invoice` si ON si.name = sii.parent
+        WHERE si.docstatus = 1 AND IFNULL(sii.item_code, '') != ''
+        GROUP BY sii.item_code, si.posting_date
+        """,
+        {"timestamp": timestamp},
+    )
+
+    frappe.db.delete("Item Sales Summary")
+    frappe.db.sql(
+        """
+        INSERT INTO `tabItem Sales Summary`
+            (name, item_code, total_qty,
+            creation, modified, owner, modified_by, docstatus, idx)
+        SELECT
+            item_code, item_code, SUM(qty),
+            %(timestamp)s, %(timestamp)s, 'Administrator', 'Administrator', 0, 0
+        FROM `tabItem Sales Rollup`
+        GROUP BY item_code
+        """,
+        {"timestamp": timestamp},
+    )
+
+
+def get_period_start(period):
+    """Return the first sale date included in a period, None for all-time."""
+    if period == "last_month":
+        return add_months(nowdate(), -1)
+    elif period == "last_week":
+        return add_days(nowdate(), -7)
+
+    return None
+
+
+def get_top_selling_items(period=None, start=0, page_length=10, cursor=None):
+    """
+    Rank items by quantity sold in the given period.
+
+    `cursor` (from `encode_cursor(total_sold, item_code)` of the last item)
+    continues after that item instead of skipping `start` items, no total is
+    computed then.
+
+    Returns:
+        tuple: (list of {"item_code", "total_sold"}, number of items sold in the period or None)
+    """
+    start_date = get_period_start(period)
+    values = {
+        "start_date": start_date,
+        "start": cint(start),
+        "page_length": cint(page_length),
+    }
+
+    after_cursor = ""
+    if cursor:
+        values["cursor_qty"], values["cursor_item_code"] = decode_cursor(cursor)
+        values["start"] = 0
+        after_cursor = """AND ({qty} < %(cursor_qty)s
+            OR ({qty} = %(cursor_qty)s AND item_code > %(cursor_item_code)s))"""
+
+    if not start_date:
+        # All-time ranking straight from the per-item summary
+        top_items = frappe.db.sql(
+            f"""
+            SELECT item_code, total_qty AS total_sold
+            FROM `tabItem Sales Summary`
+            WHERE total_qty > 0 {after_cursor.format(qty="total_qty")}
+            ORDER BY total_qty DESC, item_code
+            LIMIT %(start)s, %(page_length)s
+            """,
+            values,
+            as_dict=True,
+        )
+        if cursor:
+            return top_items, None
+
+        total = frappe.db.count("Item Sales Summary", {"total_qty": [">", 0]})
+        return top_items, total
+
+    top_items = frappe.db.sql(
+        f"""
+        SELECT item_code, SUM(qty) AS total_sold
+        FROM `tabItem Sales Rollup`
+        WHERE sale_date >= %(start_date)s
+        GROUP BY item_code
+        HAVING total_sold > 0 {after_cursor.format(qty="total_sold")}
+        ORDER BY total_sold DESC, item_code
+        LIMIT %(start)s, %(page_length)s
+        """,
+        values,
+        as_dict=True,
+    )
+    if cursor:
+        return top_items, None
+
+    total = frappe.db.sql(
+        """
+        SELECT COUNT(*) FROM (
+            SELECT item_code
+            FROM `tabItem Sales Rollup`
+            WHERE sale_date >= %(start_date)s
+            GROUP BY item_code
+            HAVING SUM(qty) > 0
+        ) sold_items
+        """,
+        values,
+    )[0][0]
+    return top_items, cint(total)
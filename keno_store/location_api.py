@@ -2,6 +2,7 @@ from http import HTTPStatus
 import frappe
 from frappe import _
 from frappe.auth import validate_auth_via_api_keys
+from keno_store.utils import encode_cursor, get_cursor_filters
 
 
 @frappe.whitelist(allow_guest=True, methods=["POST"])
@@ -85,10 +86,13 @@ def insert_user_location(liveLocation, address=None):
 
 
 @frappe.whitelist(allow_guest=True, methods=["GET"])
-def get_own_location_history(page=1, page_size=10):
+def get_own_location_history(page=1, page_size=10, cursor=None):
     """
     API to fetch the location history of a user.
 
+    Pages are selected with `page`, or with `cursor` (the `next_cursor` of the
+    previous page) which skips counting the history.
+
     Returns:
         dict: List of user's location history.
     """
@@ -120,29 +124,48 @@ def get_own_location_history(page=1, page_size=10):
         offset = (page - 1) * page_size
         limit = page_size
 
-        # Fetch the location history for own self
+        filters, or_filters = [["user", "=", user]], None
+        if cursor:
+            # Continue after the last location of the previous page
+            cursor_filters, or_filters = get_cursor_filters(cursor, "location_timestamp")
+            filters += cursor_filters
+            offset = 0
+
+        # Fetch the location history for own self, with one extra to know whether there is a next page
         location_histories = frappe.get_all(
             "User Location",
-            filters={"user": user},
-            fields=["latitude", "longitude", "ip_address", "address", "location_timestamp"],
-            order_by="location_timestamp DESC",
+            filters=filters,
+            or_filters=or_filters,
+            fields=["name", "latitude", "longitude", "ip_address", "address", "location_timestamp"],
+            order_by="location_timestamp DESC, name DESC",
             limit_start=offset,
-            limit_page_length=limit
+            limit_page_length=limit + 1
         )
+        next_cursor = None
+        if len(location_histories) > limit:
+            location_histories = location_histories[:limit]
+            next_cursor = encode_cursor(
+                location_histories[-1].location_timestamp, location_histories[-1].name
+            )
+        for location in location_histories:
+            location.pop("name")
 
-        total_count = frappe.db.count(
-            "User Location", filters={"user": user}
-        )
-        total_pages = (total_count + page_size - 1) // page_size
+        total_count, total_pages = None, None
+        if not cursor:
+            total_count = frappe.db.count(
+                "User Location", filters={"user": user}
+            )
+            total_pages = (total_count + page_size - 1) // page_size
     
         frappe.response["data"] = {
             "status": "success",
             "location_history": location_histories,
             "pagination": {
-                "current_page": page,
+                "current_page": None if cursor else page,
                 "page_size": page_size,
                 "total_orders": total_count,
                 "total_pages": total_pages,
+                "next_cursor": next_cursor,
             }
         }
 
@@ -0,0 +1,6 @@
+import frappe
+
+
+def execute():
+    # Guest carts are looked up by session id
+    frappe.db.add_index("Quotation", ["custom_session_id"])
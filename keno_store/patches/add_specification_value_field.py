@@ -0,0 +1,8 @@
+from keno_store.install import make_custom_fields
+from keno_store.keno_store.item_detail import backfill_specification_values
+
+
+def execute():
+    # Patches run before after_migrate, the field must exist for the backfill
+    make_custom_fields()
+    backfill_specification_values()
@@ -0,0 +1,6 @@
+import frappe
+
+
+def execute():
+    # Snapshots moved from one hash to a key per cart with an expiry
+    frappe.cache().delete_key("keno_store:cart_snapshot")
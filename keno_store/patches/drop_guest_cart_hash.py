@@ -0,0 +1,6 @@
+import frappe
+
+
+def execute():
+    # Guest cart names moved from one hash to a key per session with an expiry
+    frappe.cache().delete_key("keno_store:guest_cart")
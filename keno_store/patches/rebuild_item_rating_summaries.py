@@ -0,0 +1,6 @@
+from keno_store.keno_store.item_review import rebuild_item_rating_summaries
+
+
+def execute():
+    # Backfill the rating summary of every reviewed item
+    rebuild_item_rating_summaries()
@@ -0,0 +1,6 @@
+from keno_store.keno_store.sales_rollup import rebuild_sales_rollups
+
+
+def execute():
+    # Backfill the daily sales rollups from the invoice history
+    rebuild_sales_rollups()
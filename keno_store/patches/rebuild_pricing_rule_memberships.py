@@ -0,0 +1,6 @@
+from keno_store.keno_store.pricing_rule_index import rebuild_pricing_rule_memberships
+
+
+def execute():
+    # Build the pricing rule -> item index used by the offer APIs
+    rebuild_pricing_rule_memberships()
@@ -0,0 +1,6 @@
+from keno_store.keno_store.product_search import rebuild_search_index
+
+
+def execute():
+    # Index every published website item for the search API
+    rebuild_search_index()
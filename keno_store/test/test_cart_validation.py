@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+import frappe
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.doctype.warehouse.test_warehouse import create_warehouse
+from frappe.tests.utils import FrappeTestCase
+from webshop.webshop.doctype.website_item.website_item import make_website_item
+
+from keno_store.keno_store.cart_validation import (
+    get_cart_item_limits,
+    get_cart_line_error,
+    validate_cart_changes,
+    validate_cart_line,
+)
+
+test_dependencies = ["Item", "Warehouse"]
+
+TEST_ITEM = "_Test Cart Limits Item"
+
+
+class TestCartValidation(FrappeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website_warehouse = create_warehouse("_Test Cart Website Warehouse")
+        cls.other_warehouse = create_warehouse("_Test Cart Other Warehouse")
+
+        item = make_item(
+            TEST_ITEM,
+            {"is_stock_item": 1, "custom_minimum_cart_qty": 2, "custom_maximum_cart_qty": 8},
+        )
+        if not frappe.db.exists("Website Item", {"item_code": TEST_ITEM}):
+            make_website_item(item, save=True)
+        frappe.db.set_value(
+            "Website Item", {"item_code": TEST_ITEM}, "website_warehouse", cls.website_warehouse
+        )
+
+        make_stock_entry(item_code=TEST_ITEM, target=cls.website_warehouse, qty=5, basic_rate=10)
+        make_stock_entry(item_code=TEST_ITEM, target=cls.other_warehouse, qty=20, basic_rate=10)
+
+    def test_limits_read_the_website_warehouse(self):
+        limits = get_cart_item_limits([TEST_ITEM, None])[TEST_ITEM]
+
+        self.assertEqual(limits.warehouse, self.website_warehouse)
+        # Stock of other warehouses cannot be sold from the cart
+        self.assertEqual(limits.projected_qty, 5)
+        self.assertEqual(limits.minimum_qty, 2)
+        self.assertEqual(limits.maximum_qty, 8)
+
+    def test_cart_line_error(self):
+        limits = frappe._dict(
+            item_name="Test",
+            stock_uom="Nos",
+            disabled=0,
+            is_stock_item=1,
+            minimum_qty=2,
+            maximum_qty=8,
+            projected_qty=5,
+        )
+
+        self.assertIsNone(get_cart_line_error("Test", 3, limits))
+        self.assertIn("Minimum", get_cart_line_error("Test", 1, limits))
+        self.assertIn("Maximum", get_cart_line_error("Test", 9, limits))
+        self.assertIn("available", get_cart_line_error("Test", 6, limits))
+        self.assertIsNone(get_cart_line_error("Test", 6, limits, check_stock=False))
+        self.assertIn("not found", get_cart_line_error("Test", 1, None))
+
+        limits.disabled = 1
+        self.assertIn("disabled", get_cart_line_error("Test", 3, limits))
+
+        limits.update(disabled=0, is_stock_item=0)
+        self.assertIsNone(get_cart_line_error("Test", 6, limits))
+
+    @patch("keno_store.keno_store.cart_validation.is_stock_checked", return_value=True)
+    def test_validate_cart_line(self, is_stock_checked):
+        self.assertEqual(validate_cart_line(TEST_ITEM, 4).warehouse, self.website_warehouse)
+        self.assertRaises(frappe.ValidationError, validate_cart_line, TEST_ITEM, 6)
+        self.assertRaises(frappe.DoesNotExistError, validate_cart_line, "_Test Missing Item", 1)
+
+    @patch("keno_store.keno_store.cart_validation.is_stock_checked", return_value=True)
+    def test_validate_cart_changes(self, is_stock_checked):
+        changes, errors = validate_cart_changes(
+            [
+                {"item_code": TEST_ITEM, "qty": 9},
+                # The last change of an item wins
+                {"item_code": TEST_ITEM, "qty": 3, "additional_notes": "gift"},
+                {"item_code": "_Test Missing Item", "qty": 0},
+                {"item_code": "_Test Negative Item", "qty": -1},
+                {"qty": 1},
+            ]
+        )
+
+        self.assertEqual(
+            [(change.item_code, change.qty) for change in changes],
+            [(TEST_ITEM, 3), ("_Test Missing Item", 0)],
+        )
+        self.assertEqual(changes[0].warehouse, self.website_warehouse)
+        self.assertEqual(changes[0].additional_notes, "gift")
+        # Removals need no validation
+        self.assertIsNone(changes[1].warehouse)
+        self.assertEqual(
+            sorted(error["item_code"] or "" for error in errors), ["", "_Test Negative Item"]
+        )
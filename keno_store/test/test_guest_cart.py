@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from keno_store.cart_api import new_guest_cart
+from keno_store.keno_store.guest_cart import (
+    get_ephemeral_cart,
+    materialize_guest_cart,
+    merge_guest_cart,
+    update_ephemeral_cart,
+)
+from keno_store.keno_store.party import GUEST_CUSTOMER
+from keno_store.keno_store.quotation import get_guest_cart_name
+
+test_dependencies = ["Item", "Customer"]
+
+
+def make_line(item_code, qty, **kwargs):
+    return {"item_code": item_code, "qty": qty, "additional_notes": None, "warehouse": None, **kwargs}
+
+
+# Cart pricing is covered by the cart API, these tests are about the guest cart lines
+@patch("keno_store.cart_api.apply_cart_settings")
+class TestGuestCart(FrappeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        frappe.db.set_single_value("Webshop Settings", "company", "_Test Company")
+        if not frappe.db.exists("Customer", GUEST_CUSTOMER):
+            frappe.get_doc(
+                {
+                    "doctype": "Customer",
+                    "customer_name": GUEST_CUSTOMER,
+                    "customer_group": "_Test Customer Group",
+                    "territory": "_Test Territory",
+                }
+            ).insert()
+
+    def setUp(self):
+        # Guest carts are found by session, each test gets its own
+        self.session_id = frappe.generate_hash()
+
+    def test_update_ephemeral_cart(self, apply_cart_settings):
+        cart = update_ephemeral_cart(
+            self.session_id, [make_line("_Test Item", 2), make_line("_Test Item 2", 1)]
+        )
+        self.assertEqual(len(cart["items"]), 2)
+        self.assertEqual(cart["snapshot"].session_id, self.session_id)
+
+        # Changes replace lines of the same item, a qty of 0 removes the line
+        cart = update_ephemeral_cart(
+            self.session_id,
+            [make_line("_Test Item", 5, additional_notes="ripe"), make_line("_Test Item 2", 0)],
+        )
+        self.assertEqual(cart["items"], [make_line("_Test Item", 5, additional_notes="ripe")])
+        self.assertEqual(get_ephemeral_cart(self.session_id)["items"], cart["items"])
+
+        self.assertIsNone(update_ephemeral_cart(self.session_id, [make_line("_Test Item", 0)]))
+        self.assertIsNone(get_ephemeral_cart(self.session_id))
+
+    def test_materialize_guest_cart(self, apply_cart_settings):
+        self.assertIsNone(materialize_guest_cart(self.session_id))
+
+        update_ephemeral_cart(self.session_id, [make_line("_Test Item", 2)])
+        quotation = materialize_guest_cart(self.session_id)
+
+        self.assertEqual(quotation.custom_session_id, self.session_id)
+        self.assertEqual([(item.item_code, item.qty) for item in quotation.items], [("_Test Item", 2)])
+        self.assertEqual(get_guest_cart_name(self.session_id), quotation.name)
+        self.assertIsNone(get_ephemeral_cart(self.session_id))
+
+    def test_merge_guest_cart(self, apply_cart_settings):
+        user_cart = new_guest_cart(None, "_Test Customer")
+        user_cart.append("items", make_line("_Test Item", 1))
+        user_cart.insert()
+
+        # A saved guest cart, then lines added to the Redis cart afterwards
+        update_ephemeral_cart(
+            self.session_id, [make_line("_Test Item", 3), make_line("_Test Item 2", 1)]
+        )
+        guest_quotation = materialize_guest_cart(self.session_id)
+        update_ephemeral_cart(self.session_id, [make_line("_Test Item 2", 4)])
+
+        with patch(
+            "keno_store.cart_api._get_cart_quotation",
+            side_effect=lambda: frappe.get_doc("Quotation", user_cart.name),
+        ):
+            quotation = merge_guest_cart(self.session_id)
+
+        self.assertEqual(quotation.name, user_cart.name)
+        self.assertEqual(
+            sorted((item.item_code, item.qty) for item in quotation.items),
+            [("_Test Item", 3), ("_Test Item 2", 4)],
+        )
+        self.assertFalse(frappe.db.exists("Quotation", guest_quotation.name))
+        self.assertIsNone(get_guest_cart_name(self.session_id))
+        self.assertIsNone(get_ephemeral_cart(self.session_id))
+
+        self.assertIsNone(merge_guest_cart(self.session_id))
@@ -1,3 +1,6 @@
+import base64
+import json
+
 import frappe
 from frappe import _
 # your_custom_app/your_custom_app/utils.py
@@ -7,6 +10,7 @@ class HTTPStatus:
     OK = 200
     CREATED = 201
     NO_CONTENT = 204
+    NOT_MODIFIED = 304
     BAD_REQUEST = 400
     UNAUTHORIZED = 401
     FORBIDDEN = 403
@@ -55,3 +59,76 @@ def validate_coupon_against_cart(quotation, coupon_name):
         frappe.throw(
             f"Coupon code '{coupon_details.get('coupon_code')}' requires a minimum amount of {frappe.format_value(pricing_rule.min_amt, 'Currency')}."
         )
+
+
+def set_response_headers(headers):
+    """Add headers to the response of the current API request."""
+    response_headers = getattr(frappe.local, "response_headers", None)
+    if response_headers is None:
+        return
+
+    for key, value in headers.items():
+        response_headers[key] = value
+
+
+def is_not_modified(etag, max_age=0):
+    """
+    Set the ETag of the current response and check it against the request's
+    If-None-Match header.
+
+    Returns True (and sets the 304 status) when the client copy is still
+    current, in which case the caller should skip building the response body.
+    """
+    etag = f'"{etag}"'
+    headers = {"ETag": etag}
+    if max_age:
+        headers["Cache-Control"] = f"public, max-age={max_age}"
+    set_response_headers(headers)
+
+    if_none_match = frappe.get_request_header("If-None-Match") or ""
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        frappe.local.response["http_status_code"] = HTTPStatus.NOT_MODIFIED
+        return True
+
+    return False
+
+
+def encode_cursor(*values):
+    """Opaque pagination cursor holding the sort key of the last row of a page."""
+    content = json.dumps(values, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(content.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size=2):
+    """Return the sort key values of a cursor made by `encode_cursor`."""
+    try:
+        content = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(content)
+    except Exception:
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        frappe.throw(_("Invalid pagination cursor"), frappe.ValidationError)
+
+    return values
+
+
+def get_cursor_filters(cursor, sort_field, descending=True):
+    """
+    Filters for `frappe.get_all` selecting the rows after the cursor, for
+    results ordered by (`sort_field`, name).
+
+    `(sort_field, name) < (value, name)` is written as
+    `sort_field <= value AND (sort_field < value OR name < name)`, so it fits in
+    filters and or_filters and can use an index on `sort_field`.
+
+    Returns:
+        tuple: (filters, or_filters)
+    """
+    value, name = decode_cursor(cursor)
+    operator = "<" if descending else ">"
+
+    return (
+        [[sort_field, f"{operator}=", value]],
+        [[sort_field, operator, value], ["name", operator, name]],
+    )